@@ -24,8 +24,17 @@ class Config(BaseSettings):
         frozen=True,
     )
 
+    DATABASE_CONN_HEALTH_CHECKS: bool = True
+    DATABASE_CONN_MAX_AGE: int = 600
+    DATABASE_POOL_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_POOL_TIMEOUT: float = 30.0
     MODE_DEBUG: bool = False
     PRIMARY_DATABASE_URL: StrictStr
+    REPLICA_DATABASE_URLS: list[StrictStr] = []
+    REPLICA_MAX_STALENESS: float = 5.0
     SECRET_KEY: StrictStr
     TEST_URL: StrictStr
 
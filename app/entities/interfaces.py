@@ -12,7 +12,11 @@ from typing import Self
 
 from app.entities.models import ID
 from app.entities.models import Author
+from app.entities.models import AuthorPatch
 from app.entities.models import Book
+from app.entities.models import BookPatch
+from app.entities.models import NewAuthor
+from app.entities.models import NewBook
 
 
 class AuthorRepo(Protocol):
@@ -32,6 +36,18 @@ class AuthorRepo(Protocol):
         """
         ...
 
+    def create_many(
+        self: Self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        """
+        Use this to create many new Author objects at once.
+        Authors are returned in the order of the given ones.
+        Either all of them are created or, on error, none.
+        """
+        ...
+
     def delete(self: Self, author_id: ID, /) -> None:
         """
         Use this to delete Author object using its ID.
@@ -56,6 +72,17 @@ class AuthorRepo(Protocol):
         """
         ...
 
+    def get_many_by_ids(
+        self: Self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        """
+        Use this to get many Author objects by IDs at once.
+        Results follow the order of the given IDs, None for a missing one.
+        """
+        ...
+
     def update(
         self: Self,
         author_id: ID,
@@ -69,6 +96,19 @@ class AuthorRepo(Protocol):
         """
         ...
 
+    def update_many(
+        self: Self,
+        patches: Collection[AuthorPatch],
+        /,
+    ) -> list[Author]:
+        """
+        Use this to update many Author objects at once.
+        Authors are returned in the order of the given patches.
+        Either all patches are applied or, on error, none.
+        Names must be unique after the batch, so authors may swap them.
+        """
+        ...
+
 
 class BookRepo(Protocol):
     """
@@ -86,6 +126,18 @@ class BookRepo(Protocol):
         """
         ...
 
+    def create_many(
+        self: Self,
+        new_books: Collection[NewBook],
+        /,
+    ) -> list[Book]:
+        """
+        Use this to create many new Book objects at once.
+        Books are returned in the order of the given ones.
+        Either all of them are created or, on error, none.
+        """
+        ...
+
     def delete(self: Self, book_id: ID, /) -> None:
         """
         Use this to delete Book object using its ID.
@@ -110,6 +162,17 @@ class BookRepo(Protocol):
         """
         ...
 
+    def get_many_by_ids(
+        self: Self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        """
+        Use this to get many Book objects by IDs at once.
+        Results follow the order of the given IDs, None for a missing one.
+        """
+        ...
+
     def update(
         self: Self,
         book_id: ID,
@@ -123,8 +186,140 @@ class BookRepo(Protocol):
         """
         ...
 
+    def update_many(
+        self: Self,
+        patches: Collection[BookPatch],
+        /,
+    ) -> list[Book]:
+        """
+        Use this to update many Book objects at once.
+        Books are returned in the order of the given patches.
+        Either all patches are applied or, on error, none.
+        Titles must be unique after the batch, so books may swap them.
+        """
+        ...
+
+
+class AsyncAuthorRepo(Protocol):
+    """
+    This is how any async Author repo MUST act.
+    Every method acts as the one of `AuthorRepo` with the same name.
+    """
+
+    async def create(
+        self: Self,
+        /,
+        *,
+        book_ids: Collection[ID],
+        name: str,
+    ) -> Author:
+        ...
+
+    async def create_many(
+        self: Self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        ...
+
+    async def delete(self: Self, author_id: ID, /) -> None:
+        ...
+
+    async def get_all(self: Self, /) -> list[Author]:
+        ...
+
+    async def get_by_id(self: Self, author_id: ID, /) -> Author | None:
+        ...
+
+    async def get_by_name(self: Self, name: str, /) -> Author | None:
+        ...
+
+    async def get_many_by_ids(
+        self: Self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        ...
+
+    async def update(
+        self: Self,
+        author_id: ID,
+        /,
+        *,
+        book_ids: Collection[ID] | None = None,
+        name: str | None = None,
+    ) -> Author:
+        ...
+
+    async def update_many(
+        self: Self,
+        patches: Collection[AuthorPatch],
+        /,
+    ) -> list[Author]:
+        ...
+
+
+class AsyncBookRepo(Protocol):
+    """
+    This is how any async Book repo MUST act.
+    Every method acts as the one of `BookRepo` with the same name.
+    """
+
+    async def create(
+        self: Self,
+        /,
+        *,
+        title: str,
+    ) -> Book:
+        ...
+
+    async def create_many(
+        self: Self,
+        new_books: Collection[NewBook],
+        /,
+    ) -> list[Book]:
+        ...
+
+    async def delete(self: Self, book_id: ID, /) -> None:
+        ...
+
+    async def get_all(self: Self, /) -> list[Book]:
+        ...
+
+    async def get_by_id(self: Self, book_id: ID, /) -> Book | None:
+        ...
+
+    async def get_by_title(self: Self, title: str, /) -> Book | None:
+        ...
+
+    async def get_many_by_ids(
+        self: Self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        ...
+
+    async def update(
+        self: Self,
+        book_id: ID,
+        /,
+        *,
+        author_ids: Collection[ID] | None = None,
+        title: str | None = None,
+    ) -> Book:
+        ...
+
+    async def update_many(
+        self: Self,
+        patches: Collection[BookPatch],
+        /,
+    ) -> list[Book]:
+        ...
+
 
 __all__ = (
+    "AsyncAuthorRepo",
+    "AsyncBookRepo",
     "AuthorRepo",
     "BookRepo",
 )
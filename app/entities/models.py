@@ -50,7 +50,36 @@ class Book(Model):
     title: str
 
 
+@final
+class AuthorPatch(Model):
+    author_id: ID
+    book_ids: list[ID] | None = None
+    name: str | None = None
+
+
+@final
+class BookPatch(Model):
+    author_ids: list[ID] | None = None
+    book_id: ID
+    title: str | None = None
+
+
+@final
+class NewAuthor(Model):
+    book_ids: list[ID]
+    name: str
+
+
+@final
+class NewBook(Model):
+    title: str
+
+
 __all__ = (
     "Author",
+    "AuthorPatch",
     "Book",
+    "BookPatch",
+    "NewAuthor",
+    "NewBook",
 )
@@ -0,0 +1,6 @@
+"""
+This package contains repos which cache the reads of other repos.
+
+The cache of a worker drops exactly the entities which the change feed
+reports as changed, so entries live until they are stale, not for a TTL.
+"""
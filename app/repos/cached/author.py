@@ -0,0 +1,125 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities import interfaces
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import AuthorPatch
+from app.entities.models import NewAuthor
+from app.repos.cached.cache import CatalogCache
+from app.repos.changes import Change
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AuthorRepo:
+    """
+    Serves the reads of the repo from the cache.
+    Writes go to the repo and are published to the caches of the worker.
+    """
+
+    cache: CatalogCache
+    repo: interfaces.AuthorRepo
+
+    def create(self, /, *, book_ids: Collection[ID], name: str) -> Author:
+        author = self.repo.create(book_ids=book_ids, name=name)
+        self._publish([author])
+        return author
+
+    def create_many(
+        self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        authors = self.repo.create_many(new_authors)
+        self._publish(authors)
+        return authors
+
+    def delete(self, author_id: ID, /) -> None:
+        self.repo.delete(author_id)
+        self.cache.publish(Change(author_ids=[author_id]))
+
+    def get_all(self, /) -> list[Author]:
+        authors = self.cache.authors.listing
+        if authors is None:
+            version = self.cache.version
+            authors = self.repo.get_all()
+            self.cache.put(
+                self.cache.authors,
+                authors,
+                listing=True,
+                version=version,
+            )
+
+        return list(authors)
+
+    def get_by_id(self, author_id: ID, /) -> Author | None:
+        author = self.cache.authors.by_id.get(author_id)
+        if author is None:
+            version = self.cache.version
+            author = self.repo.get_by_id(author_id)
+            if author is not None:
+                self.cache.put(self.cache.authors, [author], version=version)
+
+        return author
+
+    def get_by_name(self, name: str, /) -> Author | None:
+        author = self.cache.authors.find(name)
+        if author is None:
+            version = self.cache.version
+            author = self.repo.get_by_name(name)
+            if author is not None:
+                self.cache.put(self.cache.authors, [author], version=version)
+
+        return author
+
+    def get_many_by_ids(
+        self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        cached = self.cache.authors.by_id
+        found = {i: author for i in author_ids if (author := cached.get(i))}
+
+        missing = [i for i in author_ids if i not in found]
+        if missing:
+            version = self.cache.version
+            loaded = [i for i in self.repo.get_many_by_ids(missing) if i]
+            self.cache.put(self.cache.authors, loaded, version=version)
+            found.update((i.author_id, i) for i in loaded)
+
+        authors = [found.get(i) for i in author_ids]
+        return authors
+
+    def update(
+        self,
+        author_id: ID,
+        /,
+        *,
+        book_ids: Collection[ID] | None = None,
+        name: str | None = None,
+    ) -> Author:
+        author = self.repo.update(author_id, book_ids=book_ids, name=name)
+        self._publish([author])
+        return author
+
+    def update_many(
+        self,
+        patches: Collection[AuthorPatch],
+        /,
+    ) -> list[Author]:
+        authors = self.repo.update_many(patches)
+        self._publish(authors)
+        return authors
+
+    def _publish(self, authors: Collection[Author], /) -> None:
+        change = Change(
+            author_ids={i.author_id for i in authors},
+            book_ids={i for author in authors for i in author.book_ids},
+        )
+        self.cache.publish(change)
+
+
+__all__ = ("AuthorRepo",)
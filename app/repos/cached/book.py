@@ -0,0 +1,125 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities import interfaces
+from app.entities.models import ID
+from app.entities.models import Book
+from app.entities.models import BookPatch
+from app.entities.models import NewBook
+from app.repos.cached.cache import CatalogCache
+from app.repos.changes import Change
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class BookRepo:
+    """
+    Serves the reads of the repo from the cache.
+    Writes go to the repo and are published to the caches of the worker.
+    """
+
+    cache: CatalogCache
+    repo: interfaces.BookRepo
+
+    def create(self, /, *, title: str) -> Book:
+        book = self.repo.create(title=title)
+        self._publish([book])
+        return book
+
+    def create_many(
+        self,
+        new_books: Collection[NewBook],
+        /,
+    ) -> list[Book]:
+        books = self.repo.create_many(new_books)
+        self._publish(books)
+        return books
+
+    def delete(self, book_id: ID, /) -> None:
+        self.repo.delete(book_id)
+        self.cache.publish(Change(book_ids=[book_id]))
+
+    def get_all(self, /) -> list[Book]:
+        books = self.cache.books.listing
+        if books is None:
+            version = self.cache.version
+            books = self.repo.get_all()
+            self.cache.put(
+                self.cache.books,
+                books,
+                listing=True,
+                version=version,
+            )
+
+        return list(books)
+
+    def get_by_id(self, book_id: ID, /) -> Book | None:
+        book = self.cache.books.by_id.get(book_id)
+        if book is None:
+            version = self.cache.version
+            book = self.repo.get_by_id(book_id)
+            if book is not None:
+                self.cache.put(self.cache.books, [book], version=version)
+
+        return book
+
+    def get_by_title(self, title: str, /) -> Book | None:
+        book = self.cache.books.find(title)
+        if book is None:
+            version = self.cache.version
+            book = self.repo.get_by_title(title)
+            if book is not None:
+                self.cache.put(self.cache.books, [book], version=version)
+
+        return book
+
+    def get_many_by_ids(
+        self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        cached = self.cache.books.by_id
+        found = {i: book for i in book_ids if (book := cached.get(i))}
+
+        missing = [i for i in book_ids if i not in found]
+        if missing:
+            version = self.cache.version
+            loaded = [i for i in self.repo.get_many_by_ids(missing) if i]
+            self.cache.put(self.cache.books, loaded, version=version)
+            found.update((i.book_id, i) for i in loaded)
+
+        books = [found.get(i) for i in book_ids]
+        return books
+
+    def update(
+        self,
+        book_id: ID,
+        /,
+        *,
+        author_ids: Collection[ID] | None = None,
+        title: str | None = None,
+    ) -> Book:
+        book = self.repo.update(book_id, author_ids=author_ids, title=title)
+        self._publish([book])
+        return book
+
+    def update_many(
+        self,
+        patches: Collection[BookPatch],
+        /,
+    ) -> list[Book]:
+        books = self.repo.update_many(patches)
+        self._publish(books)
+        return books
+
+    def _publish(self, books: Collection[Book], /) -> None:
+        change = Change(
+            author_ids={i for book in books for i in book.author_ids},
+            book_ids={i.book_id for i in books},
+        )
+        self.cache.publish(change)
+
+
+__all__ = ("BookRepo",)
@@ -0,0 +1,210 @@
+import threading
+from typing import AbstractSet
+from typing import Callable
+from typing import Collection
+from typing import Generic
+from typing import Iterable
+from typing import Self
+from typing import TypeVar
+from typing import final
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import Book
+from app.entities.models import Model
+from app.repos.changes import Change
+from app.repos.changes import ChangeFeed
+
+ModelT = TypeVar("ModelT", bound=Model)
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class Entries(Generic[ModelT]):
+    """
+    Cached models of one kind: by id, by the unique key, and the listing.
+
+    referrers maps an id to the ids of the cached models which list it,
+    so the models referring to a change are found without a scan.
+    """
+
+    by_id: dict[ID, ModelT] = attrs.field(factory=dict)
+    by_key: dict[str, ID] = attrs.field(factory=dict)
+    ident: Callable[[ModelT], ID]
+    key: Callable[[ModelT], str]
+    listing: list[ModelT] | None = None
+    referrers: dict[ID, set[ID]] = attrs.field(factory=dict)
+    relations: Callable[[ModelT], list[ID]]
+
+    def add(self, models: Iterable[ModelT], /) -> None:
+        for model in models:
+            model_id = self.ident(model)
+            cached = self.by_id.get(model_id)
+            if cached is not None:
+                self._unrefer(model_id, cached)
+
+            self.by_id[model_id] = model
+            self.by_key[self.key(model)] = model_id
+            for related_id in self.relations(model):
+                self.referrers.setdefault(related_id, set()).add(model_id)
+
+    def clear(self, /) -> None:
+        self.by_id.clear()
+        self.by_key.clear()
+        self.listing = None
+        self.referrers.clear()
+
+    def drop(self, ids: AbstractSet[ID], /) -> None:
+        if not ids:
+            return
+
+        for model_id in ids:
+            model = self.by_id.pop(model_id, None)
+            if model is not None:
+                self.by_key.pop(self.key(model), None)
+                self._unrefer(model_id, model)
+
+        self.listing = None
+
+    def find(self, key: str, /) -> ModelT | None:
+        model_id = self.by_key.get(key)
+        model = None if model_id is None else self.by_id.get(model_id)
+        if model is None or self.key(model) != key:
+            return None
+
+        return model
+
+    def referring(self, ids: AbstractSet[ID], /) -> set[ID]:
+        """
+        Returns the ids of the cached models which list any of the ids.
+        """
+
+        referring: set[ID] = set()
+        for related_id in ids:
+            referring.update(self.referrers.get(related_id, ()))
+
+        return referring
+
+    def related(self, ids: Collection[ID], /) -> set[ID]:
+        """
+        Returns the ids listed by the cached models with the ids.
+        """
+
+        related: set[ID] = set()
+        for model_id in ids:
+            if (model := self.by_id.get(model_id)) is not None:
+                related.update(self.relations(model))
+
+        return related
+
+    def _unrefer(self, model_id: ID, model: ModelT, /) -> None:
+        for related_id in self.relations(model):
+            referrers = self.referrers.get(related_id)
+            if referrers is None:
+                continue
+
+            referrers.discard(model_id)
+            if not referrers:
+                del self.referrers[related_id]
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class CatalogCache:
+    """
+    Authors and books read through the repos of a worker.
+
+    A change drops the changed entities and the cached ones linked to them
+    on either side, as the relation lists of both may change.
+    Every change bumps the version: models read before it are not cached.
+    """
+
+    authors: Entries[Author] = attrs.field(
+        factory=lambda: Entries(
+            ident=lambda i: i.author_id,
+            key=lambda i: i.name,
+            relations=lambda i: i.book_ids,
+        ),
+    )
+    books: Entries[Book] = attrs.field(
+        factory=lambda: Entries(
+            ident=lambda i: i.book_id,
+            key=lambda i: i.title,
+            relations=lambda i: i.author_ids,
+        ),
+    )
+    feed: ChangeFeed
+    lock: threading.Lock = attrs.field(factory=threading.Lock)
+    version: int = 0
+
+    @classmethod
+    def watch(cls, feed: ChangeFeed, /) -> Self:
+        """
+        Builds the cache which drops what the feed reports as changed.
+        """
+
+        cache = cls(feed=feed)
+        feed.subscribe(cache.apply)
+        return cache
+
+    def apply(self, change: Change, /) -> None:
+        with self.lock:
+            self.version += 1
+
+            if change.everything:
+                self.authors.clear()
+                self.books.clear()
+                return
+
+            author_ids = (
+                change.author_ids
+                | self.authors.referring(change.book_ids)
+                | self.books.related(change.book_ids)
+            )
+            book_ids = (
+                change.book_ids
+                | self.authors.related(change.author_ids)
+                | self.books.referring(change.author_ids)
+            )
+
+            self.authors.drop(author_ids)
+            self.books.drop(book_ids)
+
+    def publish(self, change: Change, /) -> None:
+        """
+        Tells the caches of the worker about a change made by the worker.
+        """
+
+        self.feed.publish(change)
+
+    def put(
+        self,
+        entries: Entries[ModelT],
+        models: Collection[ModelT],
+        /,
+        *,
+        listing: bool = False,
+        version: int,
+    ) -> None:
+        """
+        Caches the models read at the version, unless anything changed since.
+        """
+
+        with self.lock:
+            if version != self.version:
+                return
+
+            entries.add(models)
+            if listing:
+                entries.listing = list(models)
+
+    def unwatch(self, /) -> None:
+        self.feed.unsubscribe(self.apply)
+
+
+__all__ = (
+    "CatalogCache",
+    "Entries",
+)
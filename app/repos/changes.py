@@ -0,0 +1,233 @@
+"""
+Change notifications for the caches in front of the database-backed repos.
+
+On commit, triggers notify the channel with the ids of changed
+authors and books. A listener thread per worker receives them
+and publishes them to the feed of the worker, which caches subscribe to.
+Whenever notifications could have been missed, that is, before the channel
+is (re)listened, everything is published as changed.
+"""
+
+import json
+import threading
+from contextlib import suppress
+from queue import Empty
+from queue import Queue
+from typing import Callable
+from typing import Final
+from typing import Iterable
+from typing import Protocol
+from typing import Self
+from typing import final
+from uuid import UUID
+
+import attrs
+
+from app.entities.models import ID
+
+CHANNEL: Final = "catalog_changes"
+
+
+def _to_ids(ids: Iterable[ID], /) -> frozenset[ID]:
+    return frozenset(ids)
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class Change:
+    """
+    The ids of changed authors and books.
+    Any entity may have changed if `everything` is set.
+    """
+
+    author_ids: frozenset[ID] = attrs.field(
+        converter=_to_ids,
+        factory=frozenset,
+    )
+    book_ids: frozenset[ID] = attrs.field(
+        converter=_to_ids,
+        factory=frozenset,
+    )
+    everything: bool = False
+
+    @classmethod
+    def from_payload(cls, payload: str, /) -> Self:
+        data = json.loads(payload)
+        change = cls(
+            author_ids=map(UUID, data.get("author_ids", [])),
+            book_ids=map(UUID, data.get("book_ids", [])),
+        )
+
+        return change
+
+    def to_payload(self, /) -> str:
+        data = {
+            "author_ids": sorted(map(str, self.author_ids)),
+            "book_ids": sorted(map(str, self.book_ids)),
+        }
+        payload = json.dumps(data)
+
+        return payload
+
+
+Subscriber = Callable[[Change], None]
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class ChangeFeed:
+    """
+    Delivers changes to the subscribers within a worker.
+    """
+
+    lock: threading.Lock = attrs.field(factory=threading.Lock)
+    subscribers: list[Subscriber] = attrs.field(factory=list)
+
+    def publish(self, change: Change, /) -> None:
+        with self.lock:
+            subscribers = list(self.subscribers)
+
+        for subscriber in subscribers:
+            subscriber(change)
+
+    def subscribe(self, subscriber: Subscriber, /) -> None:
+        with self.lock:
+            self.subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber, /) -> None:
+        with self.lock, suppress(ValueError):
+            self.subscribers.remove(subscriber)
+
+
+class Channel(Protocol):
+    """
+    This is how a source of change notifications MUST act.
+    """
+
+    def close(self, /) -> None:
+        """
+        Use this to stop receiving the notifications.
+        """
+        ...
+
+    def listen(self, /) -> None:
+        """
+        Use this to start receiving the notifications, reconnecting if needed.
+        """
+        ...
+
+    def receive(self, /, *, timeout: float) -> list[str]:
+        """
+        Use this to wait up to `timeout` seconds for payloads.
+        Raises if the channel is broken.
+        """
+        ...
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class LocalChannel:
+    """
+    The in-process stand-in for the database channel:
+    `notify` acts as the triggers do on commit.
+    """
+
+    queue: Queue[str] = attrs.field(factory=Queue)
+
+    def close(self, /) -> None:
+        pass
+
+    def listen(self, /) -> None:
+        pass
+
+    def notify(self, change: Change, /) -> None:
+        self.queue.put(change.to_payload())
+
+    def receive(self, /, *, timeout: float) -> list[str]:
+        try:
+            payloads = [self.queue.get(timeout=timeout)]
+        except Empty:
+            return []
+
+        with suppress(Empty):
+            while True:
+                payloads.append(self.queue.get_nowait())
+
+        return payloads
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class ChangeListener:
+    """
+    Receives the changes from the channel in a daemon thread
+    and publishes them to the feed.
+    A broken channel is listened again after `retry_after` seconds.
+    """
+
+    channel: Channel
+    feed: ChangeFeed
+    receive_timeout: float = 1.0
+    retry_after: float = 1.0
+    stopped: threading.Event = attrs.field(factory=threading.Event)
+    thread: threading.Thread | None = None
+
+    def start(self, /) -> None:
+        self.stopped.clear()
+        self.thread = threading.Thread(
+            daemon=True,
+            name="change-listener",
+            target=self._run,
+        )
+        self.thread.start()
+
+    def stop(self, /, *, timeout: float | None = None) -> None:
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+
+    def _close(self, /) -> None:
+        with suppress(Exception):
+            self.channel.close()
+
+    def _parse(self, payload: str, /) -> Change:
+        try:
+            change = Change.from_payload(payload)
+        except (TypeError, ValueError):
+            change = Change(everything=True)
+
+        return change
+
+    def _run(self, /) -> None:
+        listening = False
+
+        while not self.stopped.is_set():
+            try:
+                if not listening:
+                    self.channel.listen()
+                    listening = True
+                    # anything could change while nobody was listening
+                    self.feed.publish(Change(everything=True))
+
+                payloads = self.channel.receive(timeout=self.receive_timeout)
+                for payload in payloads:
+                    self.feed.publish(self._parse(payload))
+            except Exception:
+                # a change could be lost: listening again publishes everything
+                listening = False
+                self._close()
+                self.stopped.wait(self.retry_after)
+
+        self._close()
+
+
+__all__ = (
+    "CHANNEL",
+    "Change",
+    "ChangeFeed",
+    "ChangeListener",
+    "Channel",
+    "LocalChannel",
+    "Subscriber",
+)
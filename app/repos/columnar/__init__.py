@@ -0,0 +1,7 @@
+"""
+This package contains compact in-memory repos for large catalogs.
+
+Entities are rows with dense integer ids: UUIDs are packed into
+16-byte arrays and relations are int32 adjacency arrays.
+Models are built only when they leave the repo.
+"""
@@ -0,0 +1,169 @@
+from typing import Collection
+from typing import final
+from uuid import uuid4
+
+import attrs
+
+from app.entities.errors import DegenerateAuthorsError
+from app.entities.errors import DuplicateAuthorNameError
+from app.entities.errors import LostAuthorsError
+from app.entities.errors import LostBooksError
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import AuthorPatch
+from app.entities.models import NewAuthor
+from app.repos.columnar.storage import Storage
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AuthorRepo:
+    storage: Storage
+
+    def create(self, /, *, book_ids: Collection[ID], name: str) -> Author:
+        self._raise_on_duplicate_name(name)
+        book_rows = self._clean_book_rows(book_ids)
+        if not book_rows:
+            raise DegenerateAuthorsError(authors={name: None})
+
+        row = self.storage.authors.add(uuid4(), name)
+        self.storage.link_author(row, book_rows)
+
+        author = self.storage.author(row)
+        return author
+
+    def create_many(
+        self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        with self.storage.all_or_nothing():
+            authors = [
+                self.create(book_ids=i.book_ids, name=i.name)
+                for i in new_authors
+            ]
+
+        return authors
+
+    def delete(self, author_id: ID, /) -> None:
+        row = self.storage.authors.find(author_id)
+        if row is None:
+            return
+
+        self.storage.link_author(row, [])
+        self.storage.authors.remove(row)
+
+    def get_all(self, /) -> list[Author]:
+        authors = [
+            self.storage.author(row) for row in self.storage.authors.ordered()
+        ]
+        return authors
+
+    def get_by_id(self, author_id: ID, /) -> Author | None:
+        row = self.storage.authors.find(author_id)
+        if row is None:
+            return None
+
+        author = self.storage.author(row)
+        return author
+
+    def get_by_name(self, name: str, /) -> Author | None:
+        row = self.storage.authors.find_text(name)
+        if row is None:
+            return None
+
+        author = self.storage.author(row)
+        return author
+
+    def get_many_by_ids(
+        self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        rows = [self.storage.authors.find(i) for i in author_ids]
+        authors = [
+            None if row is None else self.storage.author(row) for row in rows
+        ]
+        return authors
+
+    def update(
+        self,
+        author_id: ID,
+        /,
+        *,
+        book_ids: Collection[ID] | None = None,
+        name: str | None = None,
+    ) -> Author:
+        row = self.storage.authors.find(author_id)
+        if row is None:
+            raise LostAuthorsError(author_ids=[author_id])
+
+        author = self.storage.author(row)
+        if book_ids is None and name is None:
+            return author
+
+        book_rows = self._clean_book_rows(book_ids or [])
+        current_book_rows = set(self.storage.authors.links.get(row))
+        if current_book_rows == book_rows and author.name == name:
+            return author
+
+        if name is not None:
+            self._raise_on_duplicate_name(name)
+        if book_ids is not None and not book_rows:
+            authors = {name or author.name: author_id}
+            raise DegenerateAuthorsError(authors=authors)
+
+        if name is not None:
+            self.storage.authors.rename(row, name)
+        if book_ids is not None:
+            self.storage.link_author(row, book_rows)
+
+        author = self.storage.author(row)
+        return author
+
+    def update_many(self, patches: Collection[AuthorPatch], /) -> list[Author]:
+        with self.storage.all_or_nothing():
+            # names are unique after the batch: the ones to change are freed
+            for row in self._rows_to_rename(patches):
+                self.storage.authors.unindex_text(row)
+
+            for patch in patches:
+                self.update(
+                    patch.author_id,
+                    book_ids=patch.book_ids,
+                    name=patch.name,
+                )
+
+        rows = [self.storage.authors.find(i.author_id) for i in patches]
+        authors = [self.storage.author(row) for row in rows if row is not None]
+        return authors
+
+    def _clean_book_rows(self, book_ids: Collection[ID], /) -> set[int]:
+        books = self.storage.books
+        book_rows = {i: books.find(i) for i in set(book_ids)}
+
+        lost_book_ids = {i for i, row in book_rows.items() if row is None}
+        if lost_book_ids:
+            raise LostBooksError(book_ids=lost_book_ids)
+
+        return {row for row in book_rows.values() if row is not None}
+
+    def _rows_to_rename(self, patches: Collection[AuthorPatch], /) -> set[int]:
+        authors = self.storage.authors
+        rows = set()
+        for patch in patches:
+            row = authors.find(patch.author_id)
+            if row is not None and patch.name not in (
+                None,
+                authors.texts[row],
+            ):
+                rows.add(row)
+
+        return rows
+
+    def _raise_on_duplicate_name(self, name: str, /) -> None:
+        if self.storage.authors.find_text(name) is not None:
+            raise DuplicateAuthorNameError(name=name)
+
+
+__all__ = ("AuthorRepo",)
@@ -0,0 +1,171 @@
+from typing import Collection
+from typing import final
+from uuid import uuid4
+
+import attrs
+
+from app.entities.errors import DegenerateAuthorsError
+from app.entities.errors import DuplicateBookTitleError
+from app.entities.errors import LostAuthorsError
+from app.entities.errors import LostBooksError
+from app.entities.models import ID
+from app.entities.models import Book
+from app.entities.models import BookPatch
+from app.entities.models import NewBook
+from app.repos.columnar.storage import Storage
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class BookRepo:
+    storage: Storage
+
+    def create(self, /, *, title: str) -> Book:
+        self._raise_on_duplicate_title(title)
+
+        row = self.storage.books.add(uuid4(), title)
+
+        book = self.storage.book(row)
+        return book
+
+    def create_many(self, new_books: Collection[NewBook], /) -> list[Book]:
+        with self.storage.all_or_nothing():
+            books = [self.create(title=i.title) for i in new_books]
+
+        return books
+
+    def delete(self, book_id: ID, /) -> None:
+        row = self.storage.books.find(book_id)
+        if row is None:
+            return
+
+        self._raise_on_degenerate_authors(self.storage.books.links.get(row))
+        self.storage.link_book(row, [])
+        self.storage.books.remove(row)
+
+    def get_all(self, /) -> list[Book]:
+        books = [
+            self.storage.book(row) for row in self.storage.books.ordered()
+        ]
+        return books
+
+    def get_by_id(self, book_id: ID, /) -> Book | None:
+        row = self.storage.books.find(book_id)
+        if row is None:
+            return None
+
+        book = self.storage.book(row)
+        return book
+
+    def get_by_title(self, title: str, /) -> Book | None:
+        row = self.storage.books.find_text(title)
+        if row is None:
+            return None
+
+        book = self.storage.book(row)
+        return book
+
+    def get_many_by_ids(
+        self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        rows = [self.storage.books.find(i) for i in book_ids]
+        books = [
+            None if row is None else self.storage.book(row) for row in rows
+        ]
+        return books
+
+    def update(
+        self,
+        book_id: ID,
+        /,
+        *,
+        author_ids: Collection[ID] | None = None,
+        title: str | None = None,
+    ) -> Book:
+        row = self.storage.books.find(book_id)
+        if row is None:
+            raise LostBooksError(book_ids=[book_id])
+
+        book = self.storage.book(row)
+        if author_ids is None and title is None:
+            return book
+
+        author_rows = self._clean_author_rows(author_ids or [])
+        current_author_rows = set(self.storage.books.links.get(row))
+        if current_author_rows == author_rows and book.title == title:
+            return book
+
+        if author_ids is not None:
+            discarded_author_rows = current_author_rows - author_rows
+            self._raise_on_degenerate_authors(discarded_author_rows)
+        if title is not None:
+            self._raise_on_duplicate_title(title)
+
+        if title is not None:
+            self.storage.books.rename(row, title)
+        if author_ids is not None:
+            self.storage.link_book(row, author_rows)
+
+        book = self.storage.book(row)
+        return book
+
+    def update_many(self, patches: Collection[BookPatch], /) -> list[Book]:
+        with self.storage.all_or_nothing():
+            # titles are unique after the batch: the ones to change are freed
+            for row in self._rows_to_retitle(patches):
+                self.storage.books.unindex_text(row)
+
+            for patch in patches:
+                self.update(
+                    patch.book_id,
+                    author_ids=patch.author_ids,
+                    title=patch.title,
+                )
+
+        rows = [self.storage.books.find(i.book_id) for i in patches]
+        books = [self.storage.book(row) for row in rows if row is not None]
+        return books
+
+    def _clean_author_rows(self, author_ids: Collection[ID], /) -> set[int]:
+        authors = self.storage.authors
+        author_rows = {i: authors.find(i) for i in set(author_ids)}
+
+        lost_author_ids = {i for i, row in author_rows.items() if row is None}
+        if lost_author_ids:
+            raise LostAuthorsError(author_ids=lost_author_ids)
+
+        return {row for row in author_rows.values() if row is not None}
+
+    def _raise_on_degenerate_authors(
+        self,
+        author_rows: Collection[int],
+        /,
+    ) -> None:
+        authors = self.storage.authors
+        degenerate = {
+            authors.texts[row]: authors.uuid(row)
+            for row in author_rows
+            if authors.links.count(row) <= 1
+        }
+
+        if degenerate:
+            raise DegenerateAuthorsError(authors=degenerate)
+
+    def _rows_to_retitle(self, patches: Collection[BookPatch], /) -> set[int]:
+        books = self.storage.books
+        rows = set()
+        for patch in patches:
+            row = books.find(patch.book_id)
+            if row is not None and patch.title not in (None, books.texts[row]):
+                rows.add(row)
+
+        return rows
+
+    def _raise_on_duplicate_title(self, title: str, /) -> None:
+        if self.storage.books.find_text(title) is not None:
+            raise DuplicateBookTitleError(title=title)
+
+
+__all__ = ("BookRepo",)
@@ -0,0 +1,257 @@
+import bisect
+from array import array
+from contextlib import contextmanager
+from typing import Collection
+from typing import Final
+from typing import Iterable
+from typing import Iterator
+from typing import Self
+from typing import final
+from uuid import UUID
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import Book
+
+_UUID_SIZE: Final = 16
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class Links:
+    """
+    Relations of one side to the other one, as int32 rows.
+
+    The bulk lives in a CSR structure: row r links to
+    `indices[indptr[r]:indptr[r + 1]]`. Rows changed since the last
+    compaction live in the overlay, which takes precedence.
+    When the overlay grows beyond a quarter of the rows
+    (but at least `compact_every`), it is folded back into the CSR,
+    so a compaction is amortized over many changes.
+    """
+
+    compact_every: int = 4096
+    indices: array[int] = attrs.field(factory=lambda: array("i"))
+    indptr: array[int] = attrs.field(factory=lambda: array("i", [0]))
+    overlay: dict[int, array[int]] = attrs.field(factory=dict)
+
+    def compact(self, /) -> None:
+        nr_rows = max(len(self.indptr) - 1, max(self.overlay, default=-1) + 1)
+
+        indices = array("i")
+        indptr = array("i", [0])
+        for row in range(nr_rows):
+            indices.extend(self.get(row))
+            indptr.append(len(indices))
+
+        self.indices = indices
+        self.indptr = indptr
+        self.overlay = {}
+
+    def copy(self, /) -> Self:
+        # the arrays are replaced on change, never changed in place
+        links = attrs.evolve(self, overlay=dict(self.overlay))
+        return links
+
+    def count(self, row: int, /) -> int:
+        return len(self.get(row))
+
+    def get(self, row: int, /) -> array[int]:
+        targets = self.overlay.get(row)
+        if targets is not None:
+            return targets
+
+        if row + 1 >= len(self.indptr):
+            return array("i")
+
+        start, stop = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:stop]
+
+    def set(self, row: int, targets: Iterable[int], /) -> None:  # noqa: A003
+        self.overlay[row] = array("i", targets)
+        threshold = max(self.compact_every, (len(self.indptr) - 1) // 4)
+        if len(self.overlay) >= threshold:
+            self.compact()
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class Column:
+    """
+    One side of the catalog: authors or books.
+
+    A row holds the UUID (16 bytes in `uuids`), the text (name or title)
+    and the links to the rows of the other side.
+    Rows of deleted entities are reused by new ones.
+    """
+
+    free: list[int] = attrs.field(factory=list)
+    links: Links = attrs.field(factory=Links)
+    rows: dict[bytes, int] = attrs.field(factory=dict)
+    sorted_texts: list[str] = attrs.field(factory=list)
+    text_rows: dict[str, int] = attrs.field(factory=dict)
+    texts: list[str] = attrs.field(factory=list)
+    uuids: bytearray = attrs.field(factory=bytearray)
+
+    def add(self, uuid: UUID, text: str, /) -> int:
+        if self.free:
+            row = self.free.pop()
+            start = _UUID_SIZE * row
+            stop = start + _UUID_SIZE
+            self.uuids[start:stop] = uuid.bytes
+            self.texts[row] = text
+        else:
+            row = len(self.texts)
+            self.uuids += uuid.bytes
+            self.texts.append(text)
+
+        self.rows[uuid.bytes] = row
+        self._index_text(row, text)
+
+        return row
+
+    def copy(self, /) -> Self:
+        column = attrs.evolve(
+            self,
+            free=list(self.free),
+            links=self.links.copy(),
+            rows=dict(self.rows),
+            sorted_texts=list(self.sorted_texts),
+            text_rows=dict(self.text_rows),
+            texts=list(self.texts),
+            uuids=bytearray(self.uuids),
+        )
+        return column
+
+    def find(self, uuid: UUID, /) -> int | None:
+        row = self.rows.get(uuid.bytes)
+        return row
+
+    def find_text(self, text: str, /) -> int | None:
+        row = self.text_rows.get(text)
+        return row
+
+    def ordered(self, /) -> list[int]:
+        rows = [self.text_rows[text] for text in self.sorted_texts]
+        return rows
+
+    def remove(self, row: int, /) -> None:
+        self.rows.pop(self.uuid(row).bytes, ...)
+        self.unindex_text(row)
+        self.links.set(row, [])
+        self.texts[row] = ""
+        self.free.append(row)
+
+    def rename(self, row: int, text: str, /) -> None:
+        self.unindex_text(row)
+        self.texts[row] = text
+        self._index_text(row, text)
+
+    def unindex_text(self, row: int, /) -> None:
+        """
+        Frees the text of the row for other rows, keeping the row as is.
+        A text taken over by another row stays indexed for that row.
+        """
+
+        text = self.texts[row]
+        if self.text_rows.get(text) != row:
+            return
+
+        self.text_rows.pop(text)
+        texts = self.sorted_texts
+        position = bisect.bisect_left(texts, text)
+        if position < len(texts) and texts[position] == text:
+            del texts[position]
+
+    def uuid(self, row: int, /) -> UUID:
+        start = _UUID_SIZE * row
+        stop = start + _UUID_SIZE
+        return UUID(bytes=bytes(self.uuids[start:stop]))
+
+    def _index_text(self, row: int, text: str, /) -> None:
+        self.text_rows[text] = row
+        bisect.insort(self.sorted_texts, text)
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class Storage:
+    """
+    The compact catalog: authors and books linked in both directions.
+    Both directions are kept consistent by `link_author` / `link_book`.
+    """
+
+    authors: Column = attrs.field(factory=Column)
+    books: Column = attrs.field(factory=Column)
+
+    def author(self, row: int, /) -> Author:
+        author = Author(
+            author_id=self.authors.uuid(row),
+            book_ids=_sorted_ids(self.books, self.authors.links.get(row)),
+            name=self.authors.texts[row],
+        )
+        return author
+
+    def book(self, row: int, /) -> Book:
+        book = Book(
+            author_ids=_sorted_ids(self.authors, self.books.links.get(row)),
+            book_id=self.books.uuid(row),
+            title=self.books.texts[row],
+        )
+        return book
+
+    @contextmanager
+    def all_or_nothing(self, /) -> Iterator[None]:
+        """
+        Restores the storage if the block raises,
+        so a batch applies either all of its changes or none.
+        """
+
+        authors, books = self.authors.copy(), self.books.copy()
+        try:
+            yield
+        except BaseException:
+            self.authors, self.books = authors, books
+            raise
+
+    def link_author(self, row: int, book_rows: Collection[int], /) -> None:
+        _link(self.authors, self.books, row, book_rows)
+
+    def link_book(self, row: int, author_rows: Collection[int], /) -> None:
+        _link(self.books, self.authors, row, author_rows)
+
+
+def _link(
+    source: Column,
+    target: Column,
+    row: int,
+    target_rows: Collection[int],
+    /,
+) -> None:
+    new_rows = set(target_rows)
+    current_rows = set(source.links.get(row))
+
+    for target_row in current_rows - new_rows:
+        refs = target.links.get(target_row)
+        target.links.set(target_row, (i for i in refs if i != row))
+
+    for target_row in new_rows - current_rows:
+        refs = target.links.get(target_row)
+        target.links.set(target_row, [*refs, row])
+
+    source.links.set(row, sorted(new_rows))
+
+
+def _sorted_ids(column: Column, rows: Iterable[int], /) -> list[ID]:
+    sorted_rows = sorted(rows, key=column.texts.__getitem__)
+    ids = [column.uuid(row) for row in sorted_rows]
+    return ids
+
+
+__all__ = (
+    "Column",
+    "Links",
+    "Storage",
+)
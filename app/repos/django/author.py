@@ -4,6 +4,8 @@ from uuid import uuid4
 
 import attrs
 from django.db import transaction
+from django.db.models import TextField
+from django.db.models.functions import Cast
 
 from app.entities.errors import DegenerateAuthorsError
 from app.entities.errors import DuplicateAuthorNameError
@@ -11,6 +13,10 @@ from app.entities.errors import LostAuthorsError
 from app.entities.errors import LostBooksError
 from app.entities.models import ID
 from app.entities.models import Author
+from app.entities.models import AuthorPatch
+from app.entities.models import NewAuthor
+from app.repos.replicas import pin_primary
+from app.repos.rows import author_from_row
 from app_api_v1.models import Author as OrmAuthor
 from app_api_v3.models import Book as OrmBook
 
@@ -18,7 +24,10 @@ from app_api_v3.models import Book as OrmBook
 @final
 @attrs.frozen(kw_only=True, slots=True)
 class AuthorRepo:
+    validate_rows: bool = False
+
     def create(self, /, *, book_ids: Collection[ID], name: str) -> Author:
+        pin_primary()
         self._raise_on_duplicate_name(name)
         clean_book_ids = self._clean_book_ids(book_ids)
         self._raise_on_degenerate_author(clean_book_ids, name=name)
@@ -28,7 +37,22 @@ class AuthorRepo:
         author = Author.model_validate(orm_author)
         return author
 
+    def create_many(
+        self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        pin_primary()
+        with transaction.atomic():
+            authors = [
+                self.create(book_ids=i.book_ids, name=i.name)
+                for i in new_authors
+            ]
+
+        return authors
+
     def delete(self, author_id: ID, /) -> None:
+        pin_primary()
         try:
             record = OrmAuthor.objects.get(pk=author_id)
             record.delete()
@@ -37,14 +61,14 @@ class AuthorRepo:
 
     def get_all(self, /) -> list[Author]:
         orm_authors = OrmAuthor.objects.prefetch_related("books").all()
-        authors = [Author.model_validate(i) for i in orm_authors]
+        authors = [self._from_orm(i) for i in orm_authors]
         return authors
 
     def get_by_name(self, name: str, /) -> Author | None:
         author: Author | None
         try:
             orm_author = OrmAuthor.objects.get(name=name)
-            author = Author.model_validate(orm_author)
+            author = self._from_orm(orm_author)
         except OrmAuthor.DoesNotExist:
             author = None
 
@@ -54,12 +78,24 @@ class AuthorRepo:
         author: Author | None
         try:
             orm_author = OrmAuthor.objects.get(pk=author_id)
-            author = Author.model_validate(orm_author)
+            author = self._from_orm(orm_author)
         except OrmAuthor.DoesNotExist:
             author = None
 
         return author
 
+    def get_many_by_ids(
+        self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        orm_authors = OrmAuthor.objects.prefetch_related("books").filter(
+            pk__in=set(author_ids),
+        )
+        found = {i.pk: self._from_orm(i) for i in orm_authors}
+        authors = [found.get(i) for i in author_ids]
+        return authors
+
     def update(
         self,
         author_id: ID,
@@ -68,6 +104,7 @@ class AuthorRepo:
         book_ids: Collection[ID] | None = None,
         name: str | None = None,
     ) -> Author:
+        pin_primary()
         current = OrmAuthor.objects.filter(pk=author_id).first()
         if not current:
             raise LostAuthorsError(author_ids=[author_id])
@@ -77,7 +114,7 @@ class AuthorRepo:
             self._raise_on_degenerate_author(
                 new_book_ids,
                 author_id=current.pk,
-                name=current.name,
+                name=name or current.name,
             )
 
         with transaction.atomic():
@@ -87,13 +124,24 @@ class AuthorRepo:
                 current.save()
 
             if book_ids is not None:
-                current.books.clear()
-                current.books.add(*new_book_ids)  # type: ignore
+                # set() deletes and inserts only the links which differ
+                current.books.set(new_book_ids)  # type: ignore
 
         author = Author.model_validate(current)
 
         return author
 
+    def update_many(self, patches: Collection[AuthorPatch], /) -> list[Author]:
+        pin_primary()
+        with transaction.atomic():
+            self._free_names(patches)
+            authors = [
+                self.update(i.author_id, book_ids=i.book_ids, name=i.name)
+                for i in patches
+            ]
+
+        return authors
+
     def _clean_book_ids(self, book_ids: Collection[ID], /) -> list[ID]:
         raw_book_ids = sorted(set(book_ids))
         books = OrmBook.objects.filter(pk__in=raw_book_ids).all()
@@ -111,6 +159,32 @@ class AuthorRepo:
         orm_author.save()
         return orm_author
 
+    def _free_names(self, patches: Collection[AuthorPatch], /) -> None:
+        """
+        Names are unique after the batch, but the database checks them
+        row by row: the names to change are replaced with the ids first.
+        """
+
+        names = dict(
+            OrmAuthor.objects.filter(
+                pk__in={i.author_id for i in patches},
+            ).values_list("pk", "name")
+        )
+        author_ids = {
+            i.author_id
+            for i in patches
+            if i.author_id in names
+            and i.name not in (None, names[i.author_id])
+        }
+        if author_ids:
+            OrmAuthor.objects.filter(pk__in=author_ids).update(
+                name=Cast("pk", output_field=TextField()),
+            )
+
+    def _from_orm(self, orm_author: OrmAuthor, /) -> Author:
+        author = author_from_row(orm_author, validate=self.validate_rows)
+        return author
+
     def _raise_on_degenerate_author(
         self,
         book_ids: Collection[ID],
@@ -4,6 +4,8 @@ from uuid import uuid4
 
 import attrs
 from django.db import transaction
+from django.db.models import TextField
+from django.db.models.functions import Cast
 
 from app.entities.errors import DegenerateAuthorsError
 from app.entities.errors import DuplicateBookTitleError
@@ -11,6 +13,10 @@ from app.entities.errors import LostAuthorsError
 from app.entities.errors import LostBooksError
 from app.entities.models import ID
 from app.entities.models import Book
+from app.entities.models import BookPatch
+from app.entities.models import NewBook
+from app.repos.replicas import pin_primary
+from app.repos.rows import book_from_row
 from app_api_v1.models import Author as OrmAuthor
 from app_api_v3.models import Book as OrmBook
 
@@ -18,7 +24,10 @@ from app_api_v3.models import Book as OrmBook
 @final
 @attrs.frozen(kw_only=True, slots=True)
 class BookRepo:
+    validate_rows: bool = False
+
     def create(self, /, *, title: str) -> Book:
+        pin_primary()
         self._raise_on_duplicate_title(title)
         book_id = uuid4()
         orm_book = OrmBook(pk=book_id, title=title)
@@ -26,7 +35,15 @@ class BookRepo:
         book = Book.model_validate(orm_book)
         return book
 
+    def create_many(self, new_books: Collection[NewBook], /) -> list[Book]:
+        pin_primary()
+        with transaction.atomic():
+            books = [self.create(title=i.title) for i in new_books]
+
+        return books
+
     def delete(self, book_id: ID, /) -> None:
+        pin_primary()
         try:
             record = OrmBook.objects.get(pk=book_id)
             self._raise_on_degenerate_authors(record, [])
@@ -36,7 +53,7 @@ class BookRepo:
 
     def get_all(self, /) -> list[Book]:
         orm_books = OrmBook.objects.prefetch_related("authors").all()
-        books = [Book.model_validate(i) for i in orm_books]
+        books = [self._from_orm(i) for i in orm_books]
         return books
 
     def get_by_id(self, book_id: ID, /) -> Book | None:
@@ -45,7 +62,7 @@ class BookRepo:
         try:
             orm_books = OrmBook.objects.prefetch_related("authors")
             orm_book = orm_books.get(pk=book_id)
-            book = Book.model_validate(orm_book)
+            book = self._from_orm(orm_book)
         except OrmBook.DoesNotExist:
             book = None
 
@@ -57,12 +74,24 @@ class BookRepo:
         try:
             orm_books = OrmBook.objects.prefetch_related("authors")
             orm_book = orm_books.get(title=title)
-            book = Book.model_validate(orm_book)
+            book = self._from_orm(orm_book)
         except OrmBook.DoesNotExist:
             book = None
 
         return book
 
+    def get_many_by_ids(
+        self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        orm_books = OrmBook.objects.prefetch_related("authors").filter(
+            pk__in=set(book_ids),
+        )
+        found = {i.pk: self._from_orm(i) for i in orm_books}
+        books = [found.get(i) for i in book_ids]
+        return books
+
     def update(
         self,
         book_id: ID,
@@ -71,6 +100,7 @@ class BookRepo:
         author_ids: Collection[ID] | None = None,
         title: str | None = None,
     ) -> Book:
+        pin_primary()
         try:
             current = OrmBook.objects.get(pk=book_id)
         except OrmBook.DoesNotExist as err:
@@ -87,13 +117,24 @@ class BookRepo:
                 current.save()
 
             if author_ids is not None:
-                current.authors.clear()
-                current.authors.add(*new_author_ids)  # type: ignore
+                # set() deletes and inserts only the links which differ
+                current.authors.set(new_author_ids)  # type: ignore
 
         book = Book.model_validate(current)
 
         return book
 
+    def update_many(self, patches: Collection[BookPatch], /) -> list[Book]:
+        pin_primary()
+        with transaction.atomic():
+            self._free_titles(patches)
+            books = [
+                self.update(i.book_id, author_ids=i.author_ids, title=i.title)
+                for i in patches
+            ]
+
+        return books
+
     def _clean_author_ids(
         self,
         author_ids: Collection[ID],
@@ -111,6 +152,31 @@ class BookRepo:
 
         return clean_author_ids
 
+    def _free_titles(self, patches: Collection[BookPatch], /) -> None:
+        """
+        Titles are unique after the batch, but the database checks them
+        row by row: the titles to change are replaced with the ids first.
+        """
+
+        titles = dict(
+            OrmBook.objects.filter(
+                pk__in={i.book_id for i in patches},
+            ).values_list("pk", "title")
+        )
+        book_ids = {
+            i.book_id
+            for i in patches
+            if i.book_id in titles and i.title not in (None, titles[i.book_id])
+        }
+        if book_ids:
+            OrmBook.objects.filter(pk__in=book_ids).update(
+                title=Cast("pk", output_field=TextField()),
+            )
+
+    def _from_orm(self, orm_book: OrmBook, /) -> Book:
+        book = book_from_row(orm_book, validate=self.validate_rows)
+        return book
+
     def _raise_on_degenerate_authors(
         self,
         orm_book: OrmBook,
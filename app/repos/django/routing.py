@@ -0,0 +1,96 @@
+from functools import partial
+from typing import Any
+from typing import Callable
+from typing import Final
+from typing import final
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import connections
+from django.db.models import Model
+from django.http import HttpRequest
+from django.http import HttpResponse
+
+from app.repos.replicas import LAG_SQL
+from app.repos.replicas import Replica
+from app.repos.replicas import ReplicaSet
+from app.repos.replicas import pin_primary
+from app.repos.replicas import request_scope
+
+ROUTED_APPS: Final = frozenset({"app_api_v1", "app_api_v3"})
+
+
+@final
+class ReplicaRouter:
+    """
+    Routes reads of the repo models to fresh replicas,
+    which are all the databases but the default one.
+    Writes go to the default database and pin the context to it.
+    """
+
+    def __init__(self) -> None:
+        self.replicas = ReplicaSet(
+            max_staleness=settings.REPLICA_MAX_STALENESS,
+            replicas=[
+                Replica(probe=partial(_probe, alias), target=alias)
+                for alias in settings.DATABASES
+                if alias != DEFAULT_DB_ALIAS
+            ],
+        )
+
+    def allow_migrate(
+        self,
+        db: str,
+        app_label: str,
+        model_name: str | None = None,
+        **hints: Any,
+    ) -> bool | None:
+        return db == DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool:
+        return True
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        if model._meta.app_label not in ROUTED_APPS:
+            return None
+
+        alias = self.replicas.pick() or DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        pin_primary()
+        return DEFAULT_DB_ALIAS
+
+
+def replica_routing_middleware(
+    get_response: Callable[[HttpRequest], HttpResponse],
+) -> Callable[[HttpRequest], HttpResponse]:
+    """
+    Makes every request a scope of pinning to the primary:
+    a request which writes reads its own writes.
+    """
+
+    def middleware(request: HttpRequest) -> HttpResponse:
+        with request_scope():
+            response = get_response(request)
+
+        return response
+
+    return middleware
+
+
+def _probe(alias: str, /) -> float:
+    # the connection of the prober thread outlives the failed probes
+    connections[alias].close_if_unusable_or_obsolete()
+    with connections[alias].cursor() as cursor:
+        cursor.execute(LAG_SQL)
+        (lag,) = cursor.fetchone()
+
+    return float(lag)
+
+
+__all__ = (
+    "ROUTED_APPS",
+    "ReplicaRouter",
+    "replica_routing_middleware",
+)
@@ -0,0 +1,6 @@
+"""
+This package contains durable in-memory repos.
+
+The catalog lives in memory, like with local repos,
+and every change is journaled to disk to survive restarts.
+"""
@@ -0,0 +1,102 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import AuthorPatch
+from app.entities.models import NewAuthor
+from app.repos.durable.journal import Journal
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AuthorRepo:
+    journal: Journal
+
+    def create(self, /, *, book_ids: Collection[ID], name: str) -> Author:
+        with self.journal.writing() as catalog:
+            repo = catalog.author_repo()
+            author = repo.create(book_ids=book_ids, name=name)
+            self.journal.save_author(author)
+
+        return author
+
+    def create_many(
+        self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        with self.journal.writing() as catalog:
+            repo = catalog.author_repo()
+            authors = repo.create_many(new_authors)
+            self.journal.save_authors(authors)
+
+        return authors
+
+    def delete(self, author_id: ID, /) -> None:
+        with self.journal.writing() as catalog:
+            repo = catalog.author_repo()
+            if repo.get_by_id(author_id) is None:
+                return
+            repo.delete(author_id)
+            self.journal.drop_author(author_id)
+
+    def get_all(self, /) -> list[Author]:
+        repo = self.journal.catalog.author_repo()
+        authors = repo.get_all()
+        return authors
+
+    def get_by_id(self, author_id: ID, /) -> Author | None:
+        repo = self.journal.catalog.author_repo()
+        author = repo.get_by_id(author_id)
+        return author
+
+    def get_by_name(self, name: str, /) -> Author | None:
+        repo = self.journal.catalog.author_repo()
+        author = repo.get_by_name(name)
+        return author
+
+    def get_many_by_ids(
+        self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        repo = self.journal.catalog.author_repo()
+        authors = repo.get_many_by_ids(author_ids)
+        return authors
+
+    def update(
+        self,
+        author_id: ID,
+        /,
+        *,
+        book_ids: Collection[ID] | None = None,
+        name: str | None = None,
+    ) -> Author:
+        with self.journal.writing() as catalog:
+            repo = catalog.author_repo()
+            current = repo.get_by_id(author_id)
+            author = repo.update(author_id, book_ids=book_ids, name=name)
+            if author != current:
+                self.journal.save_author(author)
+
+        return author
+
+    def update_many(self, patches: Collection[AuthorPatch], /) -> list[Author]:
+        with self.journal.writing() as catalog:
+            repo = catalog.author_repo()
+            currents = repo.get_many_by_ids([i.author_id for i in patches])
+            authors = repo.update_many(patches)
+            changed = {
+                i.author_id: i
+                for i, current in zip(authors, currents)
+                if i != current
+            }
+            self.journal.save_authors(list(changed.values()))
+
+        return authors
+
+
+__all__ = ("AuthorRepo",)
@@ -0,0 +1,98 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Book
+from app.entities.models import BookPatch
+from app.entities.models import NewBook
+from app.repos.durable.journal import Journal
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class BookRepo:
+    journal: Journal
+
+    def create(self, /, *, title: str) -> Book:
+        with self.journal.writing() as catalog:
+            repo = catalog.book_repo()
+            book = repo.create(title=title)
+            self.journal.save_book(book)
+
+        return book
+
+    def create_many(self, new_books: Collection[NewBook], /) -> list[Book]:
+        with self.journal.writing() as catalog:
+            repo = catalog.book_repo()
+            books = repo.create_many(new_books)
+            self.journal.save_books(books)
+
+        return books
+
+    def delete(self, book_id: ID, /) -> None:
+        with self.journal.writing() as catalog:
+            repo = catalog.book_repo()
+            if repo.get_by_id(book_id) is None:
+                return
+            repo.delete(book_id)
+            self.journal.drop_book(book_id)
+
+    def get_all(self, /) -> list[Book]:
+        repo = self.journal.catalog.book_repo()
+        books = repo.get_all()
+        return books
+
+    def get_by_id(self, book_id: ID, /) -> Book | None:
+        repo = self.journal.catalog.book_repo()
+        book = repo.get_by_id(book_id)
+        return book
+
+    def get_by_title(self, title: str, /) -> Book | None:
+        repo = self.journal.catalog.book_repo()
+        book = repo.get_by_title(title)
+        return book
+
+    def get_many_by_ids(
+        self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        repo = self.journal.catalog.book_repo()
+        books = repo.get_many_by_ids(book_ids)
+        return books
+
+    def update(
+        self,
+        book_id: ID,
+        /,
+        *,
+        author_ids: Collection[ID] | None = None,
+        title: str | None = None,
+    ) -> Book:
+        with self.journal.writing() as catalog:
+            repo = catalog.book_repo()
+            current = repo.get_by_id(book_id)
+            book = repo.update(book_id, author_ids=author_ids, title=title)
+            if book != current:
+                self.journal.save_book(book)
+
+        return book
+
+    def update_many(self, patches: Collection[BookPatch], /) -> list[Book]:
+        with self.journal.writing() as catalog:
+            repo = catalog.book_repo()
+            currents = repo.get_many_by_ids([i.book_id for i in patches])
+            books = repo.update_many(patches)
+            changed = {
+                i.book_id: i
+                for i, current in zip(books, currents)
+                if i != current
+            }
+            self.journal.save_books(list(changed.values()))
+
+        return books
+
+
+__all__ = ("BookRepo",)
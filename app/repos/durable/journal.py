@@ -0,0 +1,387 @@
+import gc
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+from contextlib import suppress
+from pathlib import Path
+from typing import Any
+from typing import BinaryIO
+from typing import Collection
+from typing import Final
+from typing import Iterator
+from typing import Mapping
+from typing import Self
+from typing import final
+
+import attrs
+import orjson
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import Book
+from app.entities.models import to_uuid
+from app.repos.durable.pending import PendingCatalog
+from app.repos.local.catalog import Catalog
+
+NAME_LOG: Final = "journal.log"
+NAME_SNAPSHOT: Final = "journal.snapshot"
+
+Record = dict[str, Any]
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class Journal:
+    """
+    Makes a local catalog durable.
+
+    Every change is appended to a write-ahead log as one JSON line,
+    and so is every batch of changes: a torn batch is dropped as a whole.
+    A change reaches the catalog only once it is in the log,
+    see `writing`.
+    Every `snapshot_every` records the whole catalog is written
+    into a compact snapshot, and the log starts over.
+
+    On open, the snapshot is memory-mapped and loaded,
+    then the log is replayed on top of it.
+    Records are idempotent, so replaying a log which is older
+    than the snapshot (crash during compaction) is harmless.
+    """
+
+    catalog: Catalog
+    dir_journal: Path
+    fsync: bool = True
+    lock: threading.Lock = attrs.field(factory=threading.Lock)
+    log: BinaryIO | None = None
+    nr_records: int = 0
+    snapshot_every: int = 100_000
+
+    @classmethod
+    def open(  # noqa: A003
+        cls,
+        dir_journal: Path,
+        /,
+        *,
+        fsync: bool = True,
+        snapshot_every: int = 100_000,
+    ) -> Self:
+        dir_journal.mkdir(exist_ok=True, parents=True)
+
+        with _gc_paused():
+            replay = _Replay()
+            snapshot = _read_snapshot(dir_journal / NAME_SNAPSHOT)
+            if snapshot is not None:
+                replay.apply_snapshot(snapshot)
+
+            path_log = dir_journal / NAME_LOG
+            end_valid = 0
+            for record, end in _read_log(path_log):
+                replay.apply(record)
+                end_valid = end
+            _truncate(path_log, end_valid)
+
+            catalog = Catalog.build_linked(
+                authors_books=_links(
+                    replay.authors_books,
+                    owners=replay.names,
+                    targets=replay.titles,
+                ),
+                books_authors=_links(
+                    replay.books_authors,
+                    owners=replay.titles,
+                    targets=replay.names,
+                ),
+                names=replay.names,
+                titles=replay.titles,
+            )
+
+        journal = cls(
+            catalog=catalog,
+            dir_journal=dir_journal,
+            fsync=fsync,
+            nr_records=replay.nr_records,
+            snapshot_every=snapshot_every,
+        )
+
+        return journal
+
+    def close(self, /) -> None:
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+    def compact(self, /) -> None:
+        catalog = self.catalog
+        snapshot = {
+            "authors": [
+                [i.author_id, i.name] for i in catalog.index_authors.values()
+            ],
+            "books": [
+                [i.book_id, i.title] for i in catalog.index_books.values()
+            ],
+            "relations": [
+                [author_id, book_id]
+                for author_id, book_ids in catalog.index_authors_books.items()
+                for book_id in book_ids
+            ],
+        }
+
+        path_snapshot = self.dir_journal / NAME_SNAPSHOT
+        path_tmp = path_snapshot.with_suffix(".tmp")
+        with path_tmp.open("wb") as dst:
+            dst.write(orjson.dumps(snapshot))
+            self._sync(dst)
+        path_tmp.replace(path_snapshot)
+
+        self.close()
+        (self.dir_journal / NAME_LOG).unlink(missing_ok=True)
+        self.nr_records = 0
+
+    def drop_author(self, author_id: ID, /) -> None:
+        self._append({"op": "drop_author", "author_id": author_id})
+
+    def drop_book(self, book_id: ID, /) -> None:
+        self._append({"op": "drop_book", "book_id": book_id})
+
+    def save_author(self, author: Author, /) -> None:
+        self._append({"op": "save_author", **author.model_dump()})
+
+    def save_authors(self, authors: Collection[Author], /) -> None:
+        self._append_batch(
+            [{"op": "save_author", **i.model_dump()} for i in authors]
+        )
+
+    def save_book(self, book: Book, /) -> None:
+        self._append({"op": "save_book", **book.model_dump()})
+
+    def save_books(self, books: Collection[Book], /) -> None:
+        self._append_batch(
+            [{"op": "save_book", **i.model_dump()} for i in books]
+        )
+
+    @contextmanager
+    def writing(self, /) -> Iterator[Catalog]:
+        """
+        Yields the catalog to change, under the lock.
+
+        The changes are kept apart from the catalog until the block
+        appends them to the log and exits: only then they are applied.
+        If the block raises, say the append fails, the catalog is intact.
+        """
+
+        with self.lock:
+            pending = PendingCatalog.over(self.catalog)
+            yield pending.catalog
+            pending.apply()
+
+            if self.nr_records >= self.snapshot_every:
+                self.compact()
+
+    def _append(self, record: Record, /, *, nr_records: int = 1) -> None:
+        if self.log is None:
+            self.log = (self.dir_journal / NAME_LOG).open("ab")
+
+        line = orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+        end = self.log.tell()
+        try:
+            self.log.write(line)
+            self._sync(self.log)
+        except BaseException:
+            self._rewind(end)
+            raise
+
+        self.nr_records += nr_records
+
+    def _append_batch(self, records: list[Record], /) -> None:
+        if len(records) > 1:
+            batch = {"op": "batch", "records": records}
+            self._append(batch, nr_records=len(records))
+        elif records:
+            self._append(records[0])
+
+    def _rewind(self, end: int, /) -> None:
+        """
+        Cuts a failed append off the log,
+        so the following appends do not land after a torn line.
+        """
+
+        log, self.log = self.log, None
+        with suppress(OSError):
+            if log is not None:
+                log.close()
+        _truncate(self.dir_journal / NAME_LOG, end)
+
+    def _sync(self, file: BinaryIO, /) -> None:
+        file.flush()
+        if self.fsync:
+            os.fsync(file.fileno())
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class _Replay:
+    authors_books: dict[ID, set[ID]] = attrs.field(factory=dict)
+    books_authors: dict[ID, set[ID]] = attrs.field(factory=dict)
+    names: dict[ID, str] = attrs.field(factory=dict)
+    nr_records: int = 0
+    titles: dict[ID, str] = attrs.field(factory=dict)
+
+    def apply(self, record: Record, /) -> None:
+        if record["op"] == "batch":
+            for i in record["records"]:
+                self.apply(i)
+            return
+
+        self.nr_records += 1
+
+        match record["op"]:
+            case "drop_author":
+                author_id = to_uuid(record["author_id"])
+                self.names.pop(author_id, None)
+                self._link_author(author_id, [])
+            case "drop_book":
+                book_id = to_uuid(record["book_id"])
+                self.titles.pop(book_id, None)
+                self._link_book(book_id, [])
+            case "save_author":
+                author_id = to_uuid(record["author_id"])
+                self.names[author_id] = record["name"]
+                book_ids = [to_uuid(i) for i in record["book_ids"]]
+                self._link_author(author_id, book_ids)
+            case "save_book":
+                book_id = to_uuid(record["book_id"])
+                self.titles[book_id] = record["title"]
+                author_ids = [to_uuid(i) for i in record["author_ids"]]
+                self._link_book(book_id, author_ids)
+
+    def apply_snapshot(self, snapshot: dict[str, Any], /) -> None:
+        # every id is parsed once: the relations refer to the parsed ones
+        ids: dict[str, ID] = {}
+
+        for author_id_raw, name in snapshot["authors"]:
+            author_id = ids[author_id_raw] = to_uuid(author_id_raw)
+            self.names[author_id] = name
+
+        for book_id_raw, title in snapshot["books"]:
+            book_id = ids[book_id_raw] = to_uuid(book_id_raw)
+            self.titles[book_id] = title
+
+        authors_books = self.authors_books
+        books_authors = self.books_authors
+        for author_id_raw, book_id_raw in snapshot["relations"]:
+            author_id = ids.get(author_id_raw) or to_uuid(author_id_raw)
+            book_id = ids.get(book_id_raw) or to_uuid(book_id_raw)
+            authors_books.setdefault(author_id, set()).add(book_id)
+            books_authors.setdefault(book_id, set()).add(author_id)
+
+    def _link_author(self, author_id: ID, book_ids: list[ID], /) -> None:
+        for book_id in self.authors_books.pop(author_id, set()):
+            self.books_authors.get(book_id, set()).discard(author_id)
+
+        for book_id in book_ids:
+            self.authors_books.setdefault(author_id, set()).add(book_id)
+            self.books_authors.setdefault(book_id, set()).add(author_id)
+
+    def _link_book(self, book_id: ID, author_ids: list[ID], /) -> None:
+        for author_id in self.books_authors.pop(book_id, set()):
+            self.authors_books.get(author_id, set()).discard(book_id)
+
+        for author_id in author_ids:
+            self.authors_books.setdefault(author_id, set()).add(book_id)
+            self.books_authors.setdefault(book_id, set()).add(author_id)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Loading creates millions of objects but no cycles:
+    the collections it triggers would only rescan the growing heap.
+    """
+
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _links(
+    links: dict[ID, set[ID]],
+    /,
+    *,
+    owners: Mapping[ID, str],
+    targets: Mapping[ID, str],
+) -> dict[ID, set[ID]]:
+    """
+    Drops the links of the missing owners and to the missing targets,
+    then the empty ones: a log older than the snapshot may leave them.
+    """
+
+    kept = {}
+    for owner_id, target_ids in links.items():
+        if owner_id not in owners:
+            continue
+        if not targets.keys() >= target_ids:
+            target_ids = {i for i in target_ids if i in targets}
+        if target_ids:
+            kept[owner_id] = target_ids
+
+    return kept
+
+
+def _read_log(path: Path, /) -> Iterator[tuple[Record, int]]:
+    """
+    Yields the valid records of the log with the offsets of their ends.
+    """
+
+    if not path.is_file() or not path.stat().st_size:
+        return
+
+    with (
+        path.open("rb") as src,
+        mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        for line in iter(mapped.readline, b""):
+            if not line.endswith(b"\n"):
+                # a torn tail: the process died in the middle of a write
+                break
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                break
+            yield record, mapped.tell()
+
+
+def _truncate(path: Path, size: int, /) -> None:
+    """
+    Cuts a torn tail off the log,
+    so the following appends do not land after it.
+    """
+
+    if not path.is_file() or path.stat().st_size <= size:
+        return
+
+    with path.open("r+b") as log:
+        log.truncate(size)
+        log.flush()
+        os.fsync(log.fileno())
+
+
+def _read_snapshot(path: Path, /) -> dict[str, Any] | None:
+    if not path.is_file() or not path.stat().st_size:
+        return None
+
+    with (
+        path.open("rb") as src,
+        mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        memoryview(mapped) as view,
+    ):
+        snapshot: dict[str, Any] = orjson.loads(view)
+
+    return snapshot
+
+
+__all__ = ("Journal",)
@@ -0,0 +1,209 @@
+import bisect
+from typing import Any
+from typing import Final
+from typing import Generic
+from typing import Iterator
+from typing import MutableMapping
+from typing import MutableSequence
+from typing import Self
+from typing import TypeVar
+from typing import final
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import Book
+from app.repos.local.catalog import Catalog
+
+KeyT = TypeVar("KeyT")
+ValueT = TypeVar("ValueT")
+
+_DROPPED: Final[Any] = object()
+
+
+@final
+class PendingMapping(MutableMapping[KeyT, ValueT], Generic[KeyT, ValueT]):
+    """
+    A mapping over another one which keeps its own changes apart
+    until they are applied.
+    """
+
+    __slots__ = ("changes", "mapping")
+
+    def __init__(self, mapping: MutableMapping[KeyT, ValueT], /) -> None:
+        self.changes: dict[KeyT, ValueT] = {}
+        self.mapping = mapping
+
+    def __contains__(self, key: object) -> bool:
+        if key in self.changes:
+            return self.changes[key] is not _DROPPED
+
+        return key in self.mapping
+
+    def __copy__(self) -> dict[KeyT, ValueT]:
+        return dict(self)
+
+    def __delitem__(self, key: KeyT) -> None:
+        if key not in self:
+            raise KeyError(key)
+
+        self.changes[key] = _DROPPED
+
+    def __getitem__(self, key: KeyT) -> ValueT:
+        try:
+            value = self.changes[key]
+        except KeyError:
+            value = self.mapping[key]
+
+        if value is _DROPPED:
+            raise KeyError(key)
+
+        return value
+
+    def __iter__(self) -> Iterator[KeyT]:
+        for key in self.mapping:
+            if self.changes.get(key) is not _DROPPED:
+                yield key
+
+        for key, value in self.changes.items():
+            if value is not _DROPPED and key not in self.mapping:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setitem__(self, key: KeyT, value: ValueT) -> None:
+        self.changes[key] = value
+
+    def apply(self, /) -> None:
+        for key, value in self.changes.items():
+            if value is _DROPPED:
+                self.mapping.pop(key, None)
+            else:
+                self.mapping[key] = value
+
+        self.changes.clear()
+
+    def sort_keys_into(self, keys: MutableSequence[Any], /) -> None:
+        """
+        Brings the sorted keys of the mapping in line with the changes.
+        Call this before applying them.
+        """
+
+        for key, value in self.changes.items():
+            kept = value is not _DROPPED
+            if kept == (key in self.mapping):
+                continue
+
+            position = bisect.bisect_left(keys, key)
+            if kept:
+                keys.insert(position, key)
+            elif position < len(keys) and keys[position] == key:
+                del keys[position]
+
+
+@final
+class SortedKeys(MutableSequence[str]):
+    """
+    Stands in for the sorted keys of a pending mapping.
+
+    The sorted keys follow from the keys of the mapping,
+    see `PendingMapping.sort_keys_into`, so the changes made
+    through this are dropped and the reads see the applied keys.
+    """
+
+    __slots__ = ("keys",)
+
+    def __init__(self, keys: MutableSequence[str], /) -> None:
+        self.keys = keys
+
+    def __delitem__(self, index: Any) -> None:
+        pass
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.keys[index]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        pass
+
+    def insert(self, index: int, value: str) -> None:
+        pass
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class PendingCatalog:
+    """
+    Changes of a catalog which are not applied yet.
+
+    The repos of `catalog` change it as usual,
+    but the changes land in pending mappings over the indices
+    and reach the indices of `origin` only when applied.
+    """
+
+    authors: PendingMapping[ID, Author]
+    authors_books: PendingMapping[ID, set[ID]]
+    books: PendingMapping[ID, Book]
+    books_authors: PendingMapping[ID, set[ID]]
+    catalog: Catalog
+    names: PendingMapping[str, ID]
+    origin: Catalog
+    titles: PendingMapping[str, ID]
+
+    @classmethod
+    def over(cls, origin: Catalog, /) -> Self:
+        authors = PendingMapping(origin.index_authors)
+        authors_books = PendingMapping(origin.index_authors_books)
+        books = PendingMapping(origin.index_books)
+        books_authors = PendingMapping(origin.index_books_authors)
+        names = PendingMapping(origin.index_names)
+        titles = PendingMapping(origin.index_titles)
+
+        catalog = Catalog(
+            index_authors=authors,
+            index_authors_books=authors_books,
+            index_books_authors=books_authors,
+            index_books=books,
+            index_names=names,
+            index_sorted_names=SortedKeys(origin.index_sorted_names),
+            index_sorted_titles=SortedKeys(origin.index_sorted_titles),
+            index_titles=titles,
+        )
+
+        pending = cls(
+            authors=authors,
+            authors_books=authors_books,
+            books=books,
+            books_authors=books_authors,
+            catalog=catalog,
+            names=names,
+            origin=origin,
+            titles=titles,
+        )
+
+        return pending
+
+    def apply(self, /) -> None:
+        self.names.sort_keys_into(self.origin.index_sorted_names)
+        self.titles.sort_keys_into(self.origin.index_sorted_titles)
+
+        for mapping in (
+            self.authors,
+            self.authors_books,
+            self.books,
+            self.books_authors,
+            self.names,
+            self.titles,
+        ):
+            mapping.apply()
+
+
+__all__ = (
+    "PendingCatalog",
+    "PendingMapping",
+    "SortedKeys",
+)
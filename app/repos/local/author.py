@@ -1,6 +1,7 @@
+import bisect
 from typing import Collection
-from typing import Mapping
 from typing import MutableMapping
+from typing import MutableSequence
 from typing import final
 from uuid import uuid4
 
@@ -12,15 +13,22 @@ from app.entities.errors import LostAuthorsError
 from app.entities.errors import LostBooksError
 from app.entities.models import ID
 from app.entities.models import Author
+from app.entities.models import AuthorPatch
 from app.entities.models import Book
+from app.entities.models import NewAuthor
+from app.repos.local.batch import Index
+from app.repos.local.batch import all_or_nothing
 
 
 @final
 @attrs.frozen(kw_only=True, slots=True)
 class AuthorRepo:
     index_authors: MutableMapping[ID, Author]
+    index_authors_books: MutableMapping[ID, set[ID]]
     index_books_authors: MutableMapping[ID, set[ID]]
-    index_books: Mapping[ID, Book]
+    index_books: MutableMapping[ID, Book]
+    index_names: MutableMapping[str, ID]
+    index_sorted_names: MutableSequence[str]
 
     def create(self, /, *, book_ids: Collection[ID], name: str) -> Author:
         self._raise_on_duplicate_name(name)
@@ -30,7 +38,9 @@ class AuthorRepo:
         author = Author(author_id=author_id, book_ids=new_book_ids, name=name)
         self._raise_on_degenerate_author(author, indexed=False)
         self.index_authors[author_id] = author
-        self._update_references(author)
+        self._index_name(author_id, name)
+        self._update_references(author_id, author.book_ids)
+        self._refresh_books(author.book_ids)
 
         author = self.get_by_id(author_id)
         if author is None:
@@ -38,53 +48,62 @@ class AuthorRepo:
 
         return author
 
+    def create_many(
+        self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        with all_or_nothing(*self._indices()):
+            authors = [
+                self.create(book_ids=i.book_ids, name=i.name)
+                for i in new_authors
+            ]
+
+        return authors
+
     def delete(self, author_id: ID, /) -> None:
         author = self.index_authors.pop(author_id, None)
-        self._update_references(author)
+        if author is None:
+            return
+
+        self._unindex_name(author_id, author.name)
+        self._update_references(author_id, [])
+        self._refresh_books(author.book_ids)
 
     def get_all(self, /) -> list[Author]:
-        raw_authors = map(self.get_by_id, self.index_authors)
-        existing_authors = filter(lambda i: i is not None, raw_authors)
-        sorted_authors = sorted(existing_authors, key=lambda i: i.name)
+        sorted_authors = [
+            self.index_authors[self.index_names[name]]
+            for name in self.index_sorted_names
+        ]
         return sorted_authors
 
     def get_by_id(self, author_id: ID, /) -> Author | None:
         author = self.index_authors.get(author_id)
-        if author is None:
-            return None
-
-        book_ids = {
-            book_id
-            for book_id, refs in self.index_books_authors.items()
-            if author_id in refs
-        }
-        book_ids = self._clean_book_ids(book_ids)
-
-        author = author.model_copy(update={"book_ids": book_ids})
-        self.index_authors[author_id] = author
-
         return author
 
     def get_by_name(self, name: str, /) -> Author | None:
-        for author in self.index_authors.values():
-            if author.name == name:
-                break
-        else:
-            author = None
-
-        if author is None:
+        author_id = self.index_names.get(name)
+        if author_id is None:
             return None
 
-        author = self.get_by_id(author.author_id)
+        author = self.get_by_id(author_id)
         return author
 
+    def get_many_by_ids(
+        self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        authors = [self.index_authors.get(i) for i in author_ids]
+        return authors
+
     def update(
         self,
         author_id: ID,
         /,
         *,
         book_ids: Collection[ID] | None = None,
-        name: str | None,
+        name: str | None = None,
     ) -> Author:
         author = self.get_by_id(author_id)
         if author is None:
@@ -104,27 +123,46 @@ class AuthorRepo:
             self._raise_on_duplicate_name(name)
             update["name"] = name
 
+        current = author
         author = author.model_copy(update=update)
         self._raise_on_degenerate_author(author)
         self.index_authors[author.author_id] = author
-        self._update_references(author)
+        if author.name != current.name:
+            self._unindex_name(author_id, current.name)
+            self._index_name(author_id, author.name)
+        self._update_references(author_id, author.book_ids)
+        self._refresh_books({*current.book_ids, *author.book_ids})
         author = self.get_by_id(author_id)
         if author is None:
             raise LostAuthorsError(author_ids=[author_id])
 
         return author
 
+    def update_many(self, patches: Collection[AuthorPatch], /) -> list[Author]:
+        with all_or_nothing(*self._indices()):
+            # names are unique after the batch: the ones to change are freed
+            for author_id, name in self._names_to_change(patches).items():
+                self._unindex_name(author_id, name)
+
+            for patch in patches:
+                self.update(
+                    patch.author_id,
+                    book_ids=patch.book_ids,
+                    name=patch.name,
+                )
+
+        authors = [self.index_authors[i.author_id] for i in patches]
+        return authors
+
     def _clean_book_ids(self, book_ids: Collection[ID], /) -> list[ID]:
         book_ids = set(book_ids or [])
         if not book_ids:
             return []
 
-        existing_book_ids = set(self.index_books.keys())
-        lost_book_ids = book_ids - existing_book_ids
+        lost_book_ids = {i for i in book_ids if i not in self.index_books}
         if lost_book_ids:
             raise LostBooksError(book_ids=lost_book_ids)
 
-        book_ids &= existing_book_ids
         sorted_book_ids = sorted(
             book_ids,
             key=lambda i: self.index_books[i].title,
@@ -132,6 +170,34 @@ class AuthorRepo:
 
         return sorted_book_ids
 
+    def _index_name(self, author_id: ID, name: str, /) -> None:
+        self.index_names[name] = author_id
+        bisect.insort(self.index_sorted_names, name)
+
+    def _indices(self, /) -> list[Index]:
+        indices: list[Index] = [
+            self.index_authors,
+            self.index_authors_books,
+            self.index_books_authors,
+            self.index_books,
+            self.index_names,
+            self.index_sorted_names,
+        ]
+        return indices
+
+    def _names_to_change(
+        self,
+        patches: Collection[AuthorPatch],
+        /,
+    ) -> dict[ID, str]:
+        names = {}
+        for patch in patches:
+            author = self.index_authors.get(patch.author_id)
+            if author is not None and patch.name not in (None, author.name):
+                names[author.author_id] = author.name
+
+        return names
+
     def _raise_on_degenerate_author(
         self,
         author: Author,
@@ -145,35 +211,57 @@ class AuthorRepo:
             raise DegenerateAuthorsError(authors=authors)
 
     def _raise_on_duplicate_name(self, name: str, /) -> None:
-        for author in self.index_authors.values():
-            if author.name == name:
-                raise DuplicateAuthorNameError(name=name)
-
-    def _update_references(self, author: Author | None, /) -> None:
-        book_ids_to_discard = (
-            self.index_books_authors.keys() - self.index_books.keys()
-        )
-        for book_id in book_ids_to_discard:
-            self.index_books_authors.pop(book_id, ...)
+        if name in self.index_names:
+            raise DuplicateAuthorNameError(name=name)
 
-        for refs in self.index_books_authors.values():
-            refs &= self.index_authors.keys()
-
-        if author is None:
+    def _refresh_books(self, book_ids: Collection[ID], /) -> None:
+        for book_id in book_ids:
+            book = self.index_books.get(book_id)
+            if book is None:
+                continue
+
+            author_ids = sorted(
+                self.index_books_authors.get(book_id, set()),
+                key=lambda i: self.index_authors[i].name,
+            )
+            book = book.model_copy(update={"author_ids": author_ids})
+            self.index_books[book_id] = book
+
+    def _unindex_name(self, author_id: ID, name: str, /) -> None:
+        if self.index_names.get(name) != author_id:
             return
 
-        book_ids = set(author.book_ids)
-        book_ids = self._clean_book_ids(book_ids)
-        if not book_ids:
-            authors = {author.name: author.author_id}
-            raise DegenerateAuthorsError(authors=authors)
+        self.index_names.pop(name)
+        names = self.index_sorted_names
+        position = bisect.bisect_left(names, name)
+        if position < len(names) and names[position] == name:
+            del names[position]
 
-        for refs in self.index_books_authors.values():
-            refs.discard(author.author_id)
-
-        for book_id in book_ids:
-            refs = self.index_books_authors.setdefault(book_id, set())
-            refs.add(author.author_id)
+    def _update_references(
+        self,
+        author_id: ID,
+        book_ids: Collection[ID],
+        /,
+    ) -> None:
+        new_book_ids = set(book_ids)
+        current_book_ids = self.index_authors_books.get(author_id, set())
+
+        for book_id in current_book_ids - new_book_ids:
+            refs = self.index_books_authors.get(book_id, set())
+            refs = refs - {author_id}
+            if refs:
+                self.index_books_authors[book_id] = refs
+            else:
+                self.index_books_authors.pop(book_id, ...)
+
+        for book_id in new_book_ids - current_book_ids:
+            refs = self.index_books_authors.get(book_id, set())
+            self.index_books_authors[book_id] = refs | {author_id}
+
+        if new_book_ids:
+            self.index_authors_books[author_id] = new_book_ids
+        else:
+            self.index_authors_books.pop(author_id, ...)
 
 
 __all__ = ("AuthorRepo",)
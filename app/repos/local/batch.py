@@ -0,0 +1,38 @@
+import copy
+from contextlib import contextmanager
+from typing import Any
+from typing import Iterator
+from typing import MutableMapping
+from typing import MutableSequence
+
+Index = MutableMapping[Any, Any] | MutableSequence[Any]
+
+
+@contextmanager
+def all_or_nothing(*indices: Index) -> Iterator[None]:
+    """
+    Restores the indices in place if the block raises,
+    so a batch changes either all of them or none.
+
+    Shallow copies are enough, as the repos never mutate
+    a stored value in place, see `Catalog`.
+    """
+
+    saved = [copy.copy(index) for index in indices]
+    try:
+        yield
+    except BaseException:
+        for index, content in zip(indices, saved):
+            _restore(index, content)
+        raise
+
+
+def _restore(index: Index, content: Index, /) -> None:
+    if isinstance(index, MutableMapping):
+        index.clear()
+        index.update(content)
+    else:
+        index[:] = content
+
+
+__all__ = ("all_or_nothing",)
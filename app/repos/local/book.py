@@ -1,6 +1,7 @@
+import bisect
 from typing import Collection
-from typing import Mapping
 from typing import MutableMapping
+from typing import MutableSequence
 from typing import final
 from uuid import uuid4
 
@@ -13,14 +14,21 @@ from app.entities.errors import LostBooksError
 from app.entities.models import ID
 from app.entities.models import Author
 from app.entities.models import Book
+from app.entities.models import BookPatch
+from app.entities.models import NewBook
+from app.repos.local.batch import Index
+from app.repos.local.batch import all_or_nothing
 
 
 @final
 @attrs.frozen(kw_only=True, slots=True)
 class BookRepo:
-    index_authors: Mapping[ID, Author]
+    index_authors: MutableMapping[ID, Author]
+    index_authors_books: MutableMapping[ID, set[ID]]
     index_books_authors: MutableMapping[ID, set[ID]]
     index_books: MutableMapping[ID, Book]
+    index_sorted_titles: MutableSequence[str]
+    index_titles: MutableMapping[str, ID]
 
     def create(self, /, *, title: str) -> Book:
         self._raise_on_duplicate_title(title)
@@ -28,6 +36,7 @@ class BookRepo:
         book_id = uuid4()
         book = Book(author_ids=[], book_id=book_id, title=title)
         self.index_books[book_id] = book
+        self._index_title(book_id, title)
 
         book = self.get_by_id(book_id)
         if book is None:
@@ -35,6 +44,12 @@ class BookRepo:
 
         return book
 
+    def create_many(self, new_books: Collection[NewBook], /) -> list[Book]:
+        with all_or_nothing(*self._indices()):
+            books = [self.create(title=i.title) for i in new_books]
+
+        return books
+
     def delete(self, book_id: ID, /) -> None:
         book = self.get_by_id(book_id)
         if book is None:
@@ -42,38 +57,40 @@ class BookRepo:
 
         self._raise_on_degenerate_authors(book.author_ids)
         self.index_books.pop(book_id, ...)
-        self.index_books_authors.pop(book_id, ...)
+        self._unindex_title(book_id, book.title)
+        author_ids = self.index_books_authors.pop(book_id, set())
+        for author_id in author_ids:
+            refs = self.index_authors_books.get(author_id, set())
+            self.index_authors_books[author_id] = refs - {book_id}
+        self._refresh_authors(author_ids)
 
     def get_all(self, /) -> list[Book]:
-        raw_books = map(self.get_by_id, self.index_books)
-        existing_books = filter(lambda i: i is not None, raw_books)
-        sorted_books = sorted(existing_books, key=lambda i: i.title)
+        sorted_books = [
+            self.index_books[self.index_titles[title]]
+            for title in self.index_sorted_titles
+        ]
         return sorted_books
 
     def get_by_id(self, book_id: ID, /) -> Book | None:
         book = self.index_books.get(book_id)
-        if book is None:
-            return None
-
-        author_ids = set(self.index_books_authors.get(book_id, []))
-        author_ids = self._clean_author_ids(author_ids)
-        book = book.model_copy(update={"author_ids": author_ids})
-        self.index_books[book_id] = book
         return book
 
     def get_by_title(self, title: str, /) -> Book | None:
-        for book in self.index_books.values():
-            if book.title == title:
-                break
-        else:
-            book = None
-
-        if book is None:
+        book_id = self.index_titles.get(title)
+        if book_id is None:
             return None
 
-        book = self.get_by_id(book.book_id)
+        book = self.get_by_id(book_id)
         return book
 
+    def get_many_by_ids(
+        self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        books = [self.index_books.get(i) for i in book_ids]
+        return books
+
     def update(
         self,
         book_id: ID,
@@ -104,15 +121,36 @@ class BookRepo:
             self._raise_on_duplicate_title(title)
             update["title"] = title
 
+        current = book
         book = book.model_copy(update=update)
         self.index_books[book_id] = book
+        if book.title != current.title:
+            self._unindex_title(book_id, current.title)
+            self._index_title(book_id, book.title)
         self._update_references(book)
+        self._refresh_authors({*current.author_ids, *book.author_ids})
         book = self.get_by_id(book_id)
         if book is None:
             raise LostBooksError(book_id=book_id, title=title)
 
         return book
 
+    def update_many(self, patches: Collection[BookPatch], /) -> list[Book]:
+        with all_or_nothing(*self._indices()):
+            # titles are unique after the batch: the ones to change are freed
+            for book_id, title in self._titles_to_change(patches).items():
+                self._unindex_title(book_id, title)
+
+            for patch in patches:
+                self.update(
+                    patch.book_id,
+                    author_ids=patch.author_ids,
+                    title=patch.title,
+                )
+
+        books = [self.index_books[i.book_id] for i in patches]
+        return books
+
     def _clean_author_ids(
         self,
         author_ids: Collection[ID],
@@ -122,12 +160,12 @@ class BookRepo:
         if not author_ids:
             return []
 
-        existing_author_ids = set(self.index_authors.keys())
-        lost_author_ids = author_ids - existing_author_ids
+        lost_author_ids = {
+            i for i in author_ids if i not in self.index_authors
+        }
         if lost_author_ids:
             raise LostAuthorsError(author_ids=lost_author_ids)
 
-        author_ids &= existing_author_ids
         sorted_author_ids = sorted(
             author_ids,
             key=lambda i: self.index_authors[i].name,
@@ -135,6 +173,21 @@ class BookRepo:
 
         return sorted_author_ids
 
+    def _index_title(self, book_id: ID, title: str, /) -> None:
+        self.index_titles[title] = book_id
+        bisect.insort(self.index_sorted_titles, title)
+
+    def _indices(self, /) -> list[Index]:
+        indices: list[Index] = [
+            self.index_authors,
+            self.index_authors_books,
+            self.index_books_authors,
+            self.index_books,
+            self.index_sorted_titles,
+            self.index_titles,
+        ]
+        return indices
+
     def _raise_on_degenerate_authors(
         self,
         author_ids: Collection[ID],
@@ -142,10 +195,8 @@ class BookRepo:
     ) -> None:
         degenerate = {}
         for author_id in author_ids:
-            refs = (
-                author_id in refs for refs in self.index_books_authors.values()
-            )
-            number_of_refs = sum(refs)
+            refs = self.index_authors_books.get(author_id, set())
+            number_of_refs = len(refs)
             if number_of_refs > 1:
                 continue
             author = self.index_authors[author_id]
@@ -155,13 +206,61 @@ class BookRepo:
             raise DegenerateAuthorsError(authors=degenerate)
 
     def _raise_on_duplicate_title(self, title: str, /) -> None:
-        for book in self.index_books.values():
-            if book.title == title:
-                raise DuplicateBookTitleError(title=title)
+        if title in self.index_titles:
+            raise DuplicateBookTitleError(title=title)
+
+    def _refresh_authors(self, author_ids: Collection[ID], /) -> None:
+        for author_id in author_ids:
+            author = self.index_authors.get(author_id)
+            if author is None:
+                continue
+
+            book_ids = sorted(
+                self.index_authors_books.get(author_id, set()),
+                key=lambda i: self.index_books[i].title,
+            )
+            author = author.model_copy(update={"book_ids": book_ids})
+            self.index_authors[author_id] = author
+
+    def _titles_to_change(
+        self,
+        patches: Collection[BookPatch],
+        /,
+    ) -> dict[ID, str]:
+        titles = {}
+        for patch in patches:
+            book = self.index_books.get(patch.book_id)
+            if book is not None and patch.title not in (None, book.title):
+                titles[book.book_id] = book.title
+
+        return titles
+
+    def _unindex_title(self, book_id: ID, title: str, /) -> None:
+        if self.index_titles.get(title) != book_id:
+            return
+
+        self.index_titles.pop(title)
+        titles = self.index_sorted_titles
+        position = bisect.bisect_left(titles, title)
+        if position < len(titles) and titles[position] == title:
+            del titles[position]
 
     def _update_references(self, book: Book, /) -> None:
-        author_ids = self._clean_author_ids(book.author_ids)
-        self.index_books_authors[book.book_id] = author_ids
+        author_ids = set(book.author_ids)
+        current_author_ids = self.index_books_authors.get(book.book_id, set())
+
+        for author_id in current_author_ids - author_ids:
+            refs = self.index_authors_books.get(author_id, set())
+            self.index_authors_books[author_id] = refs - {book.book_id}
+
+        for author_id in author_ids - current_author_ids:
+            refs = self.index_authors_books.get(author_id, set())
+            self.index_authors_books[author_id] = refs | {book.book_id}
+
+        if author_ids:
+            self.index_books_authors[book.book_id] = author_ids
+        else:
+            self.index_books_authors.pop(book.book_id, ...)
 
 
 __all__ = ("BookRepo",)
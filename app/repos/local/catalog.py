@@ -0,0 +1,165 @@
+from typing import Iterable
+from typing import Mapping
+from typing import MutableMapping
+from typing import MutableSequence
+from typing import Self
+from typing import final
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import Book
+from app.repos.local.author import AuthorRepo
+from app.repos.local.book import BookRepo
+from app.repos.rows import construct
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class Catalog:
+    """
+    All indices shared by the local repos, kept in one place.
+
+    The local repos never mutate a stored value in place:
+    models are frozen and reference sets are replaced on change.
+    So a copy of the containers is a consistent, independent snapshot.
+    """
+
+    index_authors: MutableMapping[ID, Author] = attrs.field(factory=dict)
+    index_authors_books: MutableMapping[ID, set[ID]] = attrs.field(
+        factory=dict
+    )
+    index_books_authors: MutableMapping[ID, set[ID]] = attrs.field(
+        factory=dict
+    )
+    index_books: MutableMapping[ID, Book] = attrs.field(factory=dict)
+    index_names: MutableMapping[str, ID] = attrs.field(factory=dict)
+    index_sorted_names: MutableSequence[str] = attrs.field(factory=list)
+    index_sorted_titles: MutableSequence[str] = attrs.field(factory=list)
+    index_titles: MutableMapping[str, ID] = attrs.field(factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        /,
+        *,
+        names: Mapping[ID, str],
+        relations: Iterable[tuple[ID, ID]],
+        titles: Mapping[ID, str],
+    ) -> Self:
+        """
+        Builds all indices in one pass from raw data:
+        author names, book titles and (author_id, book_id) pairs.
+        The data is trusted: no invariants are checked here,
+        and the models are not validated, see `construct`.
+        """
+
+        index_authors_books: dict[ID, set[ID]] = {}
+        index_books_authors: dict[ID, set[ID]] = {}
+        for author_id, book_id in relations:
+            index_authors_books.setdefault(author_id, set()).add(book_id)
+            index_books_authors.setdefault(book_id, set()).add(author_id)
+
+        catalog = cls.build_linked(
+            authors_books=index_authors_books,
+            books_authors=index_books_authors,
+            names=names,
+            titles=titles,
+        )
+
+        return catalog
+
+    @classmethod
+    def build_linked(
+        cls,
+        /,
+        *,
+        authors_books: dict[ID, set[ID]],
+        books_authors: dict[ID, set[ID]],
+        names: Mapping[ID, str],
+        titles: Mapping[ID, str],
+    ) -> Self:
+        """
+        Builds all indices from raw data with the relations
+        already indexed both ways, which the catalog takes over.
+        The data is trusted, see `build`.
+        """
+
+        index_authors = {
+            author_id: construct(
+                Author,
+                author_id=author_id,
+                book_ids=sorted(
+                    authors_books.get(author_id, ()),
+                    key=titles.__getitem__,
+                ),
+                name=name,
+            )
+            for author_id, name in names.items()
+        }
+
+        index_books = {
+            book_id: construct(
+                Book,
+                author_ids=sorted(
+                    books_authors.get(book_id, ()),
+                    key=names.__getitem__,
+                ),
+                book_id=book_id,
+                title=title,
+            )
+            for book_id, title in titles.items()
+        }
+
+        catalog = cls(
+            index_authors=index_authors,
+            index_authors_books=authors_books,
+            index_books_authors=books_authors,
+            index_books=index_books,
+            index_names={name: i for i, name in names.items()},
+            index_sorted_names=sorted(names.values()),
+            index_sorted_titles=sorted(titles.values()),
+            index_titles={title: i for i, title in titles.items()},
+        )
+
+        return catalog
+
+    def author_repo(self, /) -> AuthorRepo:
+        repo = AuthorRepo(
+            index_authors=self.index_authors,
+            index_authors_books=self.index_authors_books,
+            index_books_authors=self.index_books_authors,
+            index_books=self.index_books,
+            index_names=self.index_names,
+            index_sorted_names=self.index_sorted_names,
+        )
+        return repo
+
+    def book_repo(self, /) -> BookRepo:
+        repo = BookRepo(
+            index_authors=self.index_authors,
+            index_authors_books=self.index_authors_books,
+            index_books_authors=self.index_books_authors,
+            index_books=self.index_books,
+            index_sorted_titles=self.index_sorted_titles,
+            index_titles=self.index_titles,
+        )
+        return repo
+
+    def copy(self, /) -> Self:
+        catalog = attrs.evolve(
+            self,
+            index_authors=dict(self.index_authors),
+            index_authors_books=dict(self.index_authors_books),
+            index_books_authors=dict(self.index_books_authors),
+            index_books=dict(self.index_books),
+            index_names=dict(self.index_names),
+            index_sorted_names=list(self.index_sorted_names),
+            index_sorted_titles=list(self.index_sorted_titles),
+            index_titles=dict(self.index_titles),
+        )
+        return catalog
+
+
+__all__ = ("Catalog",)
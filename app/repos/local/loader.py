@@ -0,0 +1,183 @@
+import csv
+from collections import Counter
+from itertools import islice
+from pathlib import Path
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import TypeVar
+from typing import final
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.entities.errors import DegenerateAuthorsError
+from app.entities.errors import DuplicateAuthorNameError
+from app.entities.errors import DuplicateBookTitleError
+from app.entities.errors import LostAuthorsError
+from app.entities.errors import LostBooksError
+from app.entities.models import ID
+from app.entities.models import Model
+from app.repos.local.catalog import Catalog
+
+Record = Mapping[str, Any]
+RecordT = TypeVar("RecordT", bound=Model)
+
+
+@final
+class AuthorRecord(Model):
+    author_id: ID
+    name: str
+
+
+@final
+class BookRecord(Model):
+    book_id: ID
+    title: str
+
+
+@final
+class RelationRecord(Model):
+    author_id: ID
+    book_id: ID
+
+
+def load(
+    *,
+    authors: Iterable[Record],
+    batch_size: int = 10_000,
+    books: Iterable[Record],
+    relations: Iterable[Record],
+) -> Catalog:
+    """
+    Loads the catalog from streams of raw records.
+
+    Records are validated in batches, all indices are built in one pass
+    at the end, and the invariants are checked once for the whole set.
+    A record with an already seen id replaces the previous one.
+    Raises the same errors as the repos do, but for the whole data set.
+    """
+
+    names = {
+        i.author_id: i.name
+        for i in validate(authors, AuthorRecord, batch_size=batch_size)
+    }
+    titles = {
+        i.book_id: i.title
+        for i in validate(books, BookRecord, batch_size=batch_size)
+    }
+    pairs = {
+        (i.author_id, i.book_id)
+        for i in validate(relations, RelationRecord, batch_size=batch_size)
+    }
+
+    _raise_on_duplicates(names, titles)
+    _raise_on_lost(names, pairs, titles)
+
+    catalog = Catalog.build(names=names, relations=pairs, titles=titles)
+    _raise_on_degenerate_authors(catalog)
+
+    return catalog
+
+
+def load_files(
+    *,
+    authors: Path,
+    batch_size: int = 10_000,
+    books: Path,
+    relations: Path,
+) -> Catalog:
+    """
+    Loads the catalog from JSONL (*.jsonl) or CSV (*.csv) files.
+    """
+
+    catalog = load(
+        authors=read_records(authors),
+        batch_size=batch_size,
+        books=read_records(books),
+        relations=read_records(relations),
+    )
+
+    return catalog
+
+
+def read_records(path: Path, /) -> Iterator[Record]:
+    match path.suffix:
+        case ".csv":
+            with path.open(encoding="utf-8", newline="") as src:
+                yield from csv.DictReader(src)
+        case ".jsonl":
+            with path.open("rb") as src:
+                for line in src:
+                    if line.strip():
+                        yield orjson.loads(line)
+        case _:
+            raise ValueError(f"unsupported records format: {path.name}")
+
+
+def validate(
+    records: Iterable[Record],
+    model: type[RecordT],
+    /,
+    *,
+    batch_size: int = 10_000,
+) -> Iterator[RecordT]:
+    adapter = TypeAdapter(list[model])  # type: ignore[valid-type]
+
+    iterator = iter(records)
+    while batch := list(islice(iterator, batch_size)):
+        validated: list[RecordT] = adapter.validate_python(batch)
+        yield from validated
+
+
+def _raise_on_degenerate_authors(catalog: Catalog, /) -> None:
+    degenerate = {
+        author.name: author.author_id
+        for author in catalog.index_authors.values()
+        if not author.book_ids
+    }
+    if degenerate:
+        raise DegenerateAuthorsError(authors=degenerate)
+
+
+def _raise_on_duplicates(
+    names: Mapping[ID, str],
+    titles: Mapping[ID, str],
+    /,
+) -> None:
+    if len(set(names.values())) != len(names):
+        name, _ = Counter(names.values()).most_common(1)[0]
+        raise DuplicateAuthorNameError(name=name)
+
+    if len(set(titles.values())) != len(titles):
+        title, _ = Counter(titles.values()).most_common(1)[0]
+        raise DuplicateBookTitleError(title=title)
+
+
+def _raise_on_lost(
+    names: Mapping[ID, str],
+    pairs: Iterable[tuple[ID, ID]],
+    titles: Mapping[ID, str],
+    /,
+) -> None:
+    author_ids = {author_id for author_id, _ in pairs}
+    lost_author_ids = author_ids - names.keys()
+    if lost_author_ids:
+        raise LostAuthorsError(author_ids=lost_author_ids)
+
+    book_ids = {book_id for _, book_id in pairs}
+    lost_book_ids = book_ids - titles.keys()
+    if lost_book_ids:
+        raise LostBooksError(book_ids=lost_book_ids)
+
+
+__all__ = (
+    "AuthorRecord",
+    "BookRecord",
+    "RelationRecord",
+    "load",
+    "load_files",
+    "read_records",
+    "validate",
+)
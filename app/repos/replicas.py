@@ -0,0 +1,187 @@
+"""
+Read replicas shared by the database-backed repos.
+
+Reads go to a replica which is fresh enough, writes go to the primary.
+Once a scope writes, its reads stay on the primary until the scope ends,
+so it always reads its own writes. A request is such a scope.
+Outside of any scope a write pins nothing: a context which must read
+its own writes opens a scope, see `request_scope`.
+"""
+
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
+from typing import Final
+from typing import Generic
+from typing import Iterator
+from typing import Sequence
+from typing import TypeVar
+from typing import final
+
+import attrs
+
+T = TypeVar("T")
+
+LAG_SQL: Final = """
+SELECT
+    CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+# None: outside of any scope
+_primary_pinned: Final[ContextVar[bool | None]] = ContextVar(
+    "primary_pinned",
+    default=None,
+)
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class Replica(Generic[T]):
+    """
+    A replica and its lag behind the primary, as seen at the last check.
+    The probe returns the lag in seconds.
+    """
+
+    checked_at: float = -math.inf
+    lag: float = math.inf
+    probe: Callable[[], float]
+    target: T
+
+    def check(self, /) -> None:
+        try:
+            self.lag = float(self.probe())
+        except Exception:
+            # an unreachable replica is as good as an infinitely stale one
+            self.lag = math.inf
+        self.checked_at = time.monotonic()
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class ReplicaSet(Generic[T]):
+    """
+    Picks replicas in turn, skipping the ones which lag
+    more than `max_staleness` seconds.
+
+    The lag of every replica is probed each `check_every` seconds
+    in a daemon thread of its own, started by the first pick,
+    so neither a slow nor an unreachable replica holds up the reads.
+    The reads rely on the last probe, which grows stale by its age:
+    until a probe succeeds, they go to the primary.
+    """
+
+    check_every: float = 1.0
+    counter: Iterator[int] = attrs.field(factory=itertools.count)
+    lock: threading.Lock = attrs.field(factory=threading.Lock)
+    max_staleness: float
+    probers: list[threading.Thread] = attrs.field(factory=list)
+    replicas: Sequence[Replica[T]]
+    stopped: threading.Event = attrs.field(factory=threading.Event)
+
+    def pick(self, /) -> T | None:
+        """
+        Returns a fresh replica to read from,
+        None means to read from the primary.
+        """
+
+        if not self.replicas or primary_pinned():
+            return None
+
+        self._start_probing()
+
+        start = next(self.counter)
+        for shift in range(len(self.replicas)):
+            replica = self.replicas[(start + shift) % len(self.replicas)]
+            if self._is_fresh(replica):
+                return replica.target
+
+        return None
+
+    def stop(self, /, *, timeout: float | None = None) -> None:
+        self.stopped.set()
+        for prober in self.probers:
+            prober.join(timeout)
+
+    def _is_fresh(self, replica: Replica[T], /) -> bool:
+        age = time.monotonic() - replica.checked_at
+        return replica.lag + age <= self.max_staleness
+
+    def _probe(self, replica: Replica[T], /) -> None:
+        while not self.stopped.is_set():
+            replica.check()
+            self.stopped.wait(self.check_every)
+
+    def _probing(self, /) -> bool:
+        # the probers do not survive a fork: a forked worker starts its own
+        return any(i.is_alive() for i in self.probers)
+
+    def _start_probing(self, /) -> None:
+        if self._probing():
+            return
+
+        with self.lock:
+            if self._probing() or self.stopped.is_set():
+                return
+
+            self.probers = [
+                threading.Thread(
+                    args=(replica,),
+                    daemon=True,
+                    name=f"replica-prober-{i}",
+                    target=self._probe,
+                )
+                for i, replica in enumerate(self.replicas)
+            ]
+            for prober in self.probers:
+                prober.start()
+
+
+def pin_primary() -> None:
+    """
+    Sends all the following reads of the scope to the primary.
+    Call this before writing. Outside of any scope it does nothing,
+    so a context never stays pinned for good.
+    """
+
+    if _primary_pinned.get() is not None:
+        _primary_pinned.set(True)
+
+
+def primary_pinned() -> bool:
+    return bool(_primary_pinned.get())
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """
+    Scopes pinning to the primary: reads go to replicas again on exit.
+    A scope within a scope is the outer one, so it keeps its pin.
+    """
+
+    if _primary_pinned.get() is not None:
+        yield
+        return
+
+    token = _primary_pinned.set(False)
+    try:
+        yield
+    finally:
+        _primary_pinned.reset(token)
+
+
+__all__ = (
+    "LAG_SQL",
+    "Replica",
+    "ReplicaSet",
+    "pin_primary",
+    "primary_pinned",
+    "request_scope",
+)
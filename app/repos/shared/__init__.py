@@ -0,0 +1,7 @@
+"""
+This package contains in-memory repos shared by worker processes.
+
+The catalog lives in shared memory as one compact read-only image,
+so all workers read the same copy without copying it.
+Writers are serialized across processes and publish a new image.
+"""
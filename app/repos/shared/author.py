@@ -0,0 +1,98 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import AuthorPatch
+from app.entities.models import NewAuthor
+from app.repos.shared.store import SharedStore
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AuthorRepo:
+    store: SharedStore
+
+    def create(self, /, *, book_ids: Collection[ID], name: str) -> Author:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            author = repo.create(book_ids=book_ids, name=name)
+
+        return author
+
+    def create_many(
+        self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            authors = repo.create_many(new_authors)
+
+        return authors
+
+    def delete(self, author_id: ID, /) -> None:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            repo.delete(author_id)
+
+    def get_all(self, /) -> list[Author]:
+        segment = self.store.attach()
+        image = segment.image
+        authors = [image.author(row) for row in image.authors.ordered()]
+        return authors
+
+    def get_by_id(self, author_id: ID, /) -> Author | None:
+        segment = self.store.attach()
+        row = segment.image.authors.find_uuid(author_id)
+        if row is None:
+            return None
+
+        author = segment.image.author(row)
+        return author
+
+    def get_by_name(self, name: str, /) -> Author | None:
+        segment = self.store.attach()
+        row = segment.image.authors.find_text(name)
+        if row is None:
+            return None
+
+        author = segment.image.author(row)
+        return author
+
+    def get_many_by_ids(
+        self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        segment = self.store.attach()
+        image = segment.image
+        rows = [image.authors.find_uuid(i) for i in author_ids]
+        authors = [None if row is None else image.author(row) for row in rows]
+        return authors
+
+    def update(
+        self,
+        author_id: ID,
+        /,
+        *,
+        book_ids: Collection[ID] | None = None,
+        name: str | None = None,
+    ) -> Author:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            author = repo.update(author_id, book_ids=book_ids, name=name)
+
+        return author
+
+    def update_many(self, patches: Collection[AuthorPatch], /) -> list[Author]:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            authors = repo.update_many(patches)
+
+        return authors
+
+
+__all__ = ("AuthorRepo",)
@@ -0,0 +1,94 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Book
+from app.entities.models import BookPatch
+from app.entities.models import NewBook
+from app.repos.shared.store import SharedStore
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class BookRepo:
+    store: SharedStore
+
+    def create(self, /, *, title: str) -> Book:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            book = repo.create(title=title)
+
+        return book
+
+    def create_many(self, new_books: Collection[NewBook], /) -> list[Book]:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            books = repo.create_many(new_books)
+
+        return books
+
+    def delete(self, book_id: ID, /) -> None:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            repo.delete(book_id)
+
+    def get_all(self, /) -> list[Book]:
+        segment = self.store.attach()
+        image = segment.image
+        books = [image.book(row) for row in image.books.ordered()]
+        return books
+
+    def get_by_id(self, book_id: ID, /) -> Book | None:
+        segment = self.store.attach()
+        row = segment.image.books.find_uuid(book_id)
+        if row is None:
+            return None
+
+        book = segment.image.book(row)
+        return book
+
+    def get_by_title(self, title: str, /) -> Book | None:
+        segment = self.store.attach()
+        row = segment.image.books.find_text(title)
+        if row is None:
+            return None
+
+        book = segment.image.book(row)
+        return book
+
+    def get_many_by_ids(
+        self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        segment = self.store.attach()
+        image = segment.image
+        rows = [image.books.find_uuid(i) for i in book_ids]
+        books = [None if row is None else image.book(row) for row in rows]
+        return books
+
+    def update(
+        self,
+        book_id: ID,
+        /,
+        *,
+        author_ids: Collection[ID] | None = None,
+        title: str | None = None,
+    ) -> Book:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            book = repo.update(book_id, author_ids=author_ids, title=title)
+
+        return book
+
+    def update_many(self, patches: Collection[BookPatch], /) -> list[Book]:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            books = repo.update_many(patches)
+
+        return books
+
+
+__all__ = ("BookRepo",)
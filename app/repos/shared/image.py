@@ -0,0 +1,329 @@
+import struct
+from array import array
+from typing import Final
+from typing import Iterable
+from typing import Iterator
+from typing import Literal
+from typing import Self
+from typing import final
+from uuid import UUID
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import Book
+from app.repos.local.catalog import Catalog
+
+MAGIC: Final = b"ECA1"
+
+_HEADER: Final = struct.Struct("<4sIIIQQ")
+_UUID_SIZE: Final = 16
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class Table:
+    """
+    One side of the catalog (authors or books) laid out in a flat buffer.
+
+    Rows are sorted by UUID bytes, so a row is found by binary search.
+    Sections, each aligned to 8 bytes:
+      - uuids: 16 bytes per row;
+      - offsets: u64 per row + 1, bounds of row texts in the blob;
+      - order: u32 per row, rows sorted by text;
+      - indptr: u32 per row + 1, bounds of row links in the indices;
+      - indices: u32 per link, rows of the other side (CSR);
+      - blob: UTF-8 texts (names or titles).
+    """
+
+    buf: memoryview
+    nr_rows: int
+    offset_blob: int
+    offset_indices: int
+    offset_indptr: int
+    offset_offsets: int
+    offset_order: int
+    offset_uuids: int
+
+    @classmethod
+    def layout(
+        cls,
+        buf: memoryview,
+        start: int,
+        /,
+        *,
+        nr_links: int,
+        nr_rows: int,
+    ) -> Self:
+        offset_uuids = start
+        offset_offsets = _align(offset_uuids + _UUID_SIZE * nr_rows)
+        offset_order = _align(offset_offsets + 8 * (nr_rows + 1))
+        offset_indptr = _align(offset_order + 4 * nr_rows)
+        offset_indices = _align(offset_indptr + 4 * (nr_rows + 1))
+        offset_blob = _align(offset_indices + 4 * nr_links)
+
+        table = cls(
+            buf=buf,
+            nr_rows=nr_rows,
+            offset_blob=offset_blob,
+            offset_indices=offset_indices,
+            offset_indptr=offset_indptr,
+            offset_offsets=offset_offsets,
+            offset_order=offset_order,
+            offset_uuids=offset_uuids,
+        )
+
+        return table
+
+    def find_text(self, text: str, /) -> int | None:
+        needle = text.encode()
+        order = self._array(self.offset_order, "I", self.nr_rows)
+
+        low, high = 0, self.nr_rows
+        while low < high:
+            middle = (low + high) // 2
+            if self._text_bytes(order[middle]) < needle:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.nr_rows and self._text_bytes(order[low]) == needle:
+            return order[low]
+
+        return None
+
+    def find_uuid(self, uuid: UUID, /) -> int | None:
+        needle = uuid.bytes
+
+        low, high = 0, self.nr_rows
+        while low < high:
+            middle = (low + high) // 2
+            if self._uuid_bytes(middle) < needle:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < self.nr_rows and self._uuid_bytes(low) == needle:
+            return low
+
+        return None
+
+    def links(self, row: int, /) -> list[int]:
+        indptr = self._array(self.offset_indptr, "I", self.nr_rows + 1)
+        start, stop = indptr[row], indptr[row + 1]
+        indices = self._array(
+            self.offset_indices + 4 * start, "I", stop - start
+        )
+        return indices.tolist()
+
+    def ordered(self, /) -> list[int]:
+        order = self._array(self.offset_order, "I", self.nr_rows)
+        return order.tolist()
+
+    def text(self, row: int, /) -> str:
+        return str(self._text_bytes(row), "utf-8")
+
+    def uuid(self, row: int, /) -> UUID:
+        return UUID(bytes=self._uuid_bytes(row))
+
+    def _array(
+        self,
+        offset: int,
+        fmt: Literal["I", "Q"],
+        size: int,
+        /,
+    ) -> memoryview:
+        stop = offset + struct.calcsize(fmt) * size
+        return self.buf[offset:stop].cast(fmt)
+
+    def _text_bytes(self, row: int, /) -> bytes:
+        offsets = self._array(self.offset_offsets, "Q", self.nr_rows + 1)
+        start = self.offset_blob + offsets[row]
+        stop = self.offset_blob + offsets[row + 1]
+        return bytes(self.buf[start:stop])
+
+    def _uuid_bytes(self, row: int, /) -> bytes:
+        start = self.offset_uuids + _UUID_SIZE * row
+        stop = start + _UUID_SIZE
+        return bytes(self.buf[start:stop])
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class CatalogImage:
+    """
+    Read-only compact image of the whole catalog over a flat buffer.
+
+    Nothing is copied on open: models are built on demand,
+    so many processes can share one image, e.g. in shared memory.
+    """
+
+    authors: Table
+    books: Table
+
+    @classmethod
+    def encode(cls, catalog: Catalog, /) -> bytes:
+        author_ids = sorted(catalog.index_authors, key=lambda i: i.bytes)
+        book_ids = sorted(catalog.index_books, key=lambda i: i.bytes)
+        author_rows = {
+            author_id: row for row, author_id in enumerate(author_ids)
+        }
+        book_rows = {book_id: row for row, book_id in enumerate(book_ids)}
+
+        authors = [catalog.index_authors[i] for i in author_ids]
+        books = [catalog.index_books[i] for i in book_ids]
+
+        authors_section = _encode_table(
+            ids=author_ids,
+            links=([book_rows[i] for i in a.book_ids] for a in authors),
+            order=(
+                author_rows[catalog.index_names[i]]
+                for i in catalog.index_sorted_names
+            ),
+            texts=(a.name for a in authors),
+        )
+        books_section = _encode_table(
+            ids=book_ids,
+            links=([author_rows[i] for i in b.author_ids] for b in books),
+            order=(
+                book_rows[catalog.index_titles[i]]
+                for i in catalog.index_sorted_titles
+            ),
+            texts=(b.title for b in books),
+        )
+        nr_relations = sum(len(a.book_ids) for a in authors)
+
+        header = _HEADER.pack(
+            MAGIC,
+            len(author_ids),
+            len(book_ids),
+            nr_relations,
+            len(authors_section),
+            len(books_section),
+        )
+
+        image = b"".join(
+            (
+                header.ljust(_align(_HEADER.size), b"\0"),
+                authors_section,
+                books_section,
+            )
+        )
+
+        return image
+
+    @classmethod
+    def open(cls, buf: memoryview, /) -> Self:  # noqa: A003
+        (
+            magic,
+            nr_authors,
+            nr_books,
+            nr_relations,
+            authors_size,
+            _,
+        ) = _HEADER.unpack_from(buf)
+        if magic != MAGIC:
+            raise ValueError(f"not a catalog image: {magic=!r}")
+
+        offset_authors = _align(_HEADER.size)
+        authors = Table.layout(
+            buf,
+            offset_authors,
+            nr_links=nr_relations,
+            nr_rows=nr_authors,
+        )
+        books = Table.layout(
+            buf,
+            offset_authors + authors_size,
+            nr_links=nr_relations,
+            nr_rows=nr_books,
+        )
+
+        image = cls(authors=authors, books=books)
+
+        return image
+
+    def author(self, row: int, /) -> Author:
+        author = Author(
+            author_id=self.authors.uuid(row),
+            book_ids=[self.books.uuid(i) for i in self.authors.links(row)],
+            name=self.authors.text(row),
+        )
+        return author
+
+    def book(self, row: int, /) -> Book:
+        book = Book(
+            author_ids=[self.authors.uuid(i) for i in self.books.links(row)],
+            book_id=self.books.uuid(row),
+            title=self.books.text(row),
+        )
+        return book
+
+    def to_catalog(self, /) -> Catalog:
+        names = {
+            self.authors.uuid(row): self.authors.text(row)
+            for row in range(self.authors.nr_rows)
+        }
+        titles = {
+            self.books.uuid(row): self.books.text(row)
+            for row in range(self.books.nr_rows)
+        }
+
+        catalog = Catalog.build(
+            names=names,
+            relations=self._relations(),
+            titles=titles,
+        )
+
+        return catalog
+
+    def _relations(self, /) -> Iterator[tuple[ID, ID]]:
+        for row in range(self.authors.nr_rows):
+            author_id = self.authors.uuid(row)
+            for book_row in self.authors.links(row):
+                yield author_id, self.books.uuid(book_row)
+
+
+def _align(offset: int, /) -> int:
+    return (offset + 7) & ~7
+
+
+def _encode_table(
+    *,
+    ids: list[ID],
+    links: Iterable[list[int]],
+    order: Iterable[int],
+    texts: Iterable[str],
+) -> bytes:
+    blob = bytearray()
+    offsets = array("Q", [0])
+    for text in texts:
+        blob += text.encode()
+        offsets.append(len(blob))
+
+    indices = array("I")
+    indptr = array("I", [0])
+    for row_links in links:
+        indices.extend(row_links)
+        indptr.append(len(indices))
+
+    sections = (
+        b"".join(i.bytes for i in ids),
+        offsets.tobytes(),
+        array("I", order).tobytes(),
+        indptr.tobytes(),
+        indices.tobytes(),
+        bytes(blob),
+    )
+
+    section = b"".join(i.ljust(_align(len(i)), b"\0") for i in sections)
+
+    return section
+
+
+__all__ = (
+    "CatalogImage",
+    "MAGIC",
+    "Table",
+)
@@ -0,0 +1,212 @@
+import fcntl
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import BinaryIO
+from typing import Final
+from typing import Iterator
+from typing import Self
+from typing import final
+
+import attrs
+
+from app.repos.local.catalog import Catalog
+from app.repos.shared.image import CatalogImage
+
+_GENERATION: Final = struct.Struct("<Q")
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class Segment:
+    """
+    An image attached to the current process.
+    Keep a reference to the segment while reading its image.
+    """
+
+    generation: int
+    image: CatalogImage
+    shm: SharedMemory
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class SharedStore:
+    """
+    Holds the catalog image in shared memory, one copy for all processes.
+
+    A tiny control segment keeps the generation of the published image,
+    every image lives in its own segment named after its generation.
+    A published image is never changed again, so readers attach to it
+    and read it in place, without locks.
+
+    Writers are serialized across processes by a file lock.
+    A writer decodes the image into a local catalog, changes it,
+    encodes a new image, publishes it by bumping the generation
+    and unlinks the previous one. Processes which still read
+    the previous image keep it mapped until they are done.
+
+    A write costs O(N) on top of the change itself:
+    this store suits read-heavy workloads.
+    """
+
+    control: SharedMemory
+    file_lock: BinaryIO
+    lock: threading.Lock = attrs.field(factory=threading.Lock)
+    name: str
+    segment: Segment | None = None
+
+    @classmethod
+    def open(cls, name: str, /) -> Self:  # noqa: A003
+        """
+        Attaches to the store with the given name, creates it if needed.
+        All processes which use the same name share one catalog.
+        """
+
+        path_lock = Path(tempfile.gettempdir()) / f"{name}.lock"
+        file_lock = path_lock.open("ab")
+
+        with _flock(file_lock):
+            try:
+                control = SharedMemory(
+                    create=True,
+                    name=name,
+                    size=_GENERATION.size,
+                )
+            except FileExistsError:
+                control = SharedMemory(name=name)
+            _untrack(control)
+
+            store = cls(control=control, file_lock=file_lock, name=name)
+            if not store.generation:
+                store._publish(1, Catalog())
+
+        return store
+
+    @property
+    def generation(self, /) -> int:
+        (generation,) = _GENERATION.unpack_from(_view(self.control))
+        return int(generation)
+
+    def attach(self, /) -> Segment:
+        """
+        Returns the segment with the latest published image.
+        """
+
+        while True:
+            generation = self.generation
+            segment = self.segment
+            if segment is not None and segment.generation == generation:
+                return segment
+
+            with self.lock:
+                try:
+                    segment = self._attach(generation)
+                except FileNotFoundError:
+                    # the image has been replaced right now: retry
+                    continue
+                self.segment = segment
+
+            return segment
+
+    def close(self, /) -> None:
+        self.segment = None
+        self.control.close()
+        self.file_lock.close()
+
+    def destroy(self, /) -> None:
+        """
+        Unlinks all the shared memory of the store.
+        The store must not be used after this by any process.
+        """
+
+        with self.lock, _flock(self.file_lock):
+            _unlink(_image_name(self.name, self.generation))
+            self.segment = None
+            resource_tracker.register(f"/{self.control.name}", "shared_memory")
+            self.control.unlink()
+
+        Path(self.file_lock.name).unlink(missing_ok=True)
+        self.close()
+
+    @contextmanager
+    def write(self, /) -> Iterator[Catalog]:
+        with self.lock, _flock(self.file_lock):
+            generation = self.generation
+            segment = self._attach(generation)
+            draft = segment.image.to_catalog()
+            yield draft
+            self._publish(generation + 1, draft)
+            _unlink(_image_name(self.name, generation))
+
+    def _attach(self, generation: int, /) -> Segment:
+        shm = SharedMemory(name=_image_name(self.name, generation))
+        _untrack(shm)
+        image = CatalogImage.open(_view(shm))
+        segment = Segment(generation=generation, image=image, shm=shm)
+        return segment
+
+    def _publish(self, generation: int, catalog: Catalog, /) -> None:
+        data = CatalogImage.encode(catalog)
+        name = _image_name(self.name, generation)
+
+        try:
+            shm = SharedMemory(create=True, name=name, size=len(data))
+        except FileExistsError:
+            # a leftover of a writer which died before publishing
+            _unlink(name)
+            shm = SharedMemory(create=True, name=name, size=len(data))
+        _untrack(shm)
+
+        _view(shm)[: len(data)] = data
+        _GENERATION.pack_into(_view(self.control), 0, generation)
+
+        image = CatalogImage.open(_view(shm))
+        self.segment = Segment(generation=generation, image=image, shm=shm)
+
+
+@contextmanager
+def _flock(file: BinaryIO, /) -> Iterator[None]:
+    fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def _image_name(name: str, generation: int, /) -> str:
+    return f"{name}-{generation}"
+
+
+def _unlink(name: str, /) -> None:
+    try:
+        shm = SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+
+    shm.unlink()
+    shm.close()
+
+
+def _untrack(shm: SharedMemory, /) -> None:
+    # the segment must outlive the process which attached to it:
+    # otherwise the resource tracker unlinks it when the process exits
+    resource_tracker.unregister(f"/{shm.name}", "shared_memory")
+
+
+def _view(shm: SharedMemory, /) -> memoryview:
+    buf = shm.buf
+    if buf is None:
+        raise ValueError(f"shared memory is closed: {shm.name}")
+
+    return buf
+
+
+__all__ = (
+    "Segment",
+    "SharedStore",
+)
@@ -0,0 +1,6 @@
+"""
+This package contains thread-safe in-memory repos.
+
+Readers work on an immutable snapshot of the local catalog without locks.
+Writers are serialized, change a private copy and publish it atomically.
+"""
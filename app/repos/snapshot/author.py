@@ -0,0 +1,87 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import AuthorPatch
+from app.entities.models import NewAuthor
+from app.repos.snapshot.store import SnapshotStore
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AuthorRepo:
+    store: SnapshotStore
+
+    def create(self, /, *, book_ids: Collection[ID], name: str) -> Author:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            author = repo.create(book_ids=book_ids, name=name)
+
+        return author
+
+    def create_many(
+        self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            authors = repo.create_many(new_authors)
+
+        return authors
+
+    def delete(self, author_id: ID, /) -> None:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            repo.delete(author_id)
+
+    def get_all(self, /) -> list[Author]:
+        repo = self.store.snapshot.author_repo()
+        authors = repo.get_all()
+        return authors
+
+    def get_by_id(self, author_id: ID, /) -> Author | None:
+        repo = self.store.snapshot.author_repo()
+        author = repo.get_by_id(author_id)
+        return author
+
+    def get_by_name(self, name: str, /) -> Author | None:
+        repo = self.store.snapshot.author_repo()
+        author = repo.get_by_name(name)
+        return author
+
+    def get_many_by_ids(
+        self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        repo = self.store.snapshot.author_repo()
+        authors = repo.get_many_by_ids(author_ids)
+        return authors
+
+    def update(
+        self,
+        author_id: ID,
+        /,
+        *,
+        book_ids: Collection[ID] | None = None,
+        name: str | None = None,
+    ) -> Author:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            author = repo.update(author_id, book_ids=book_ids, name=name)
+
+        return author
+
+    def update_many(self, patches: Collection[AuthorPatch], /) -> list[Author]:
+        with self.store.write() as catalog:
+            repo = catalog.author_repo()
+            authors = repo.update_many(patches)
+
+        return authors
+
+
+__all__ = ("AuthorRepo",)
@@ -0,0 +1,83 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities.models import ID
+from app.entities.models import Book
+from app.entities.models import BookPatch
+from app.entities.models import NewBook
+from app.repos.snapshot.store import SnapshotStore
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class BookRepo:
+    store: SnapshotStore
+
+    def create(self, /, *, title: str) -> Book:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            book = repo.create(title=title)
+
+        return book
+
+    def create_many(self, new_books: Collection[NewBook], /) -> list[Book]:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            books = repo.create_many(new_books)
+
+        return books
+
+    def delete(self, book_id: ID, /) -> None:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            repo.delete(book_id)
+
+    def get_all(self, /) -> list[Book]:
+        repo = self.store.snapshot.book_repo()
+        books = repo.get_all()
+        return books
+
+    def get_by_id(self, book_id: ID, /) -> Book | None:
+        repo = self.store.snapshot.book_repo()
+        book = repo.get_by_id(book_id)
+        return book
+
+    def get_by_title(self, title: str, /) -> Book | None:
+        repo = self.store.snapshot.book_repo()
+        book = repo.get_by_title(title)
+        return book
+
+    def get_many_by_ids(
+        self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        repo = self.store.snapshot.book_repo()
+        books = repo.get_many_by_ids(book_ids)
+        return books
+
+    def update(
+        self,
+        book_id: ID,
+        /,
+        *,
+        author_ids: Collection[ID] | None = None,
+        title: str | None = None,
+    ) -> Book:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            book = repo.update(book_id, author_ids=author_ids, title=title)
+
+        return book
+
+    def update_many(self, patches: Collection[BookPatch], /) -> list[Book]:
+        with self.store.write() as catalog:
+            repo = catalog.book_repo()
+            books = repo.update_many(patches)
+
+        return books
+
+
+__all__ = ("BookRepo",)
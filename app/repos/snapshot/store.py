@@ -0,0 +1,37 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+from typing import final
+
+import attrs
+
+from app.repos.local.catalog import Catalog
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class SnapshotStore:
+    """
+    Holds the published catalog snapshot and serializes its writers.
+
+    A published snapshot is never changed again, so readers just grab
+    the current reference. A writer changes a copy of the snapshot and
+    publishes it by rebinding the reference, which is atomic.
+    If the write fails, the copy is thrown away and nothing is published.
+
+    The copy is shallow, so a write costs O(N) pointer copies on top of
+    the change itself: this store suits read-heavy workloads.
+    """
+
+    snapshot: Catalog = attrs.field(factory=Catalog)
+    lock: threading.Lock = attrs.field(factory=threading.Lock)
+
+    @contextmanager
+    def write(self, /) -> Iterator[Catalog]:
+        with self.lock:
+            draft = self.snapshot.copy()
+            yield draft
+            self.snapshot = draft
+
+
+__all__ = ("SnapshotStore",)
@@ -1,5 +1,7 @@
+from collections import Counter
 from typing import Collection
-from typing import cast
+from typing import Iterator
+from typing import Mapping
 from typing import final
 from uuid import uuid4
 
@@ -7,14 +9,23 @@ import attrs
 import sqlalchemy as sa
 from sqlalchemy import Connection
 from sqlalchemy import Engine
-from sqlalchemy.dialects.postgresql import aggregate_order_by
 
 from app.entities.errors import DegenerateAuthorsError
 from app.entities.errors import DuplicateAuthorNameError
 from app.entities.errors import LostAuthorsError
 from app.entities.models import ID
 from app.entities.models import Author
-from app.entities.models import to_uuid
+from app.entities.models import AuthorPatch
+from app.entities.models import NewAuthor
+from app.repos.replicas import ReplicaSet
+from app.repos.replicas import pin_primary
+from app.repos.rows import author_from_row
+from app.repos.sqlalchemy.statements import AuthorReads
+from app.repos.sqlalchemy.statements import author_reads
+from app.repos.sqlalchemy.statements import author_reads_denormalized
+from app.repos.sqlalchemy.statements import sql_author_create
+from app.repos.sqlalchemy.statements import sql_author_rename
+from app.repos.sqlalchemy.statements import sql_author_update
 from app.repos.sqlalchemy.tables import table_authors
 from app.repos.sqlalchemy.tables import table_books
 from app.repos.sqlalchemy.tables import table_books_authors
@@ -23,61 +34,159 @@ from app.repos.sqlalchemy.tables import table_books_authors
 @final
 @attrs.frozen(kw_only=True, slots=True)
 class AuthorRepo:
+    denormalized: bool = False
     engine: Engine
+    replicas: ReplicaSet[Engine] | None = None
+    validate_rows: bool = False
 
     def create(self, /, *, book_ids: Collection[ID], name: str) -> Author:
+        pin_primary()
+        params = {
+            "author_id": uuid4(),
+            "book_ids": list(set(book_ids)),
+            "name": name,
+        }
+
         conn: Connection
         with self.engine.begin() as conn:
-            self._raise_on_duplicate_name(conn, name)
-            clean_book_ids = self._clean_book_ids(conn, book_ids)
-            self._raise_on_degenerate_author(clean_book_ids, name=name)
-            author_id = self._create_without_relations(conn, name=name)
-            self._assing_books(conn, author_id, clean_book_ids)
-
-        author = self.get_by_id(author_id)
-        if author is None:
-            raise LostAuthorsError(author_ids=[author_id])
+            row = conn.execute(sql_author_create, params).fetchone()
+            if row is None:
+                # nothing is inserted: the name is taken or no book is valid
+                self._raise_on_duplicate_name(conn, name)
+                raise DegenerateAuthorsError(authors={name: None})
 
+        author = Author.model_validate(row)
         return author
 
+    def create_many(
+        self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        pin_primary()
+        if not new_authors:
+            return []
+
+        names = {uuid4(): i.name for i in new_authors}
+        book_ids = {
+            author_id: i.book_ids for author_id, i in zip(names, new_authors)
+        }
+
+        conn: Connection
+        with self.engine.begin() as conn:
+            self._raise_on_duplicate_names(conn, names)
+            values_relations = self._build_relations(
+                conn,
+                book_ids,
+                names,
+                indexed=False,
+            )
+
+            values_authors = [
+                {"author_id": author_id, "name": name}
+                for author_id, name in names.items()
+            ]
+            conn.execute(sa.insert(table_authors), values_authors)
+            conn.execute(sa.insert(table_books_authors), values_relations)
+
+            authors = self._get_many(conn, list(names))
+
+        return authors
+
     def delete(self, author_id: ID, /) -> None:
+        pin_primary()
         conn: Connection
         with self.engine.begin() as conn:
             self._unassign_books(conn, author_id)
             self._delete(conn, author_id)
 
     def get_all(self, /) -> list[Author]:
-        sql = self.__build_total_sql()
         conn: Connection
-        with self.engine.begin() as conn:
-            cursor = conn.execute(sql)
-            authors = [Author.model_validate(row) for row in cursor]
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(self._reads().every)
+            authors = [self._from_row(row) for row in cursor]
 
         return authors
 
     def get_by_id(self, author_id: ID, /) -> Author | None:
-        stmt = self.__build_total_sql().where(
-            table_authors.c.author_id == author_id,
-        )
+        sql = self._reads().by_id
 
         conn: Connection
-        with self.engine.begin() as conn:
-            cursor = conn.execute(stmt)
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(sql, {"author_id": author_id})
             row = cursor.fetchone()
-            author = Author.model_validate(row) if row else None
+            author = self._from_row(row) if row else None
 
         return author
 
     def get_by_name(self, name: str, /) -> Author | None:
-        sql = self.__build_total_sql().where(table_authors.c.name == name)
         conn: Connection
-        with self.engine.begin() as conn:
-            cursor = conn.execute(sql)
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(self._reads().by_name, {"name": name})
             row = cursor.fetchone()
-            author = Author.model_validate(row) if row else None
+            author = self._from_row(row) if row else None
 
         return author
 
+    def get_many_by_ids(
+        self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        if not author_ids:
+            return []
+
+        sql = self._reads().by_ids
+
+        conn: Connection
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(sql, {"author_ids": list(set(author_ids))})
+            found = {i.author_id: i for i in map(self._from_row, cursor)}
+
+        authors = [found.get(i) for i in author_ids]
+        return authors
+
+    def iter_all(self, /, *, batch_size: int = 1000) -> Iterator[Author]:
+        """
+        Yields all authors streamed through a server-side cursor,
+        so at most `batch_size` rows are held in memory at once.
+        The connection is held until the generator is exhausted or closed.
+        """
+
+        sql = self._reads().every
+
+        conn: Connection
+        with self._read_engine().begin() as conn:
+            cursor = conn.execution_options(yield_per=batch_size).execute(sql)
+            for row in cursor:
+                yield self._from_row(row)
+
+    def page(
+        self,
+        /,
+        *,
+        after: Author | None = None,
+        limit: int,
+    ) -> list[Author]:
+        """
+        Returns up to `limit` authors which follow `after` by name.
+        Pass the last author of the previous page to get the next one.
+        """
+
+        reads = self._reads()
+        sql = reads.page
+        params: dict[str, object] = {"limit": limit}
+        if after is not None:
+            sql = reads.page_after
+            params["after_name"] = after.name
+
+        conn: Connection
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(sql, params)
+            authors = [self._from_row(row) for row in cursor]
+
+        return authors
+
     def update(
         self,
         author_id: ID,
@@ -86,55 +195,128 @@ class AuthorRepo:
         book_ids: Collection[ID] | None = None,
         name: str | None = None,
     ) -> Author:
-        current = self.get_by_id(author_id)
-        if current is None:
-            raise LostAuthorsError(author_ids=[author_id])
-
-        if name is None and book_ids is None:
-            return current
-
+        pin_primary()
         conn: Connection
         with self.engine.begin() as conn:
-            if name is not None and name != current.name:
-                self._raise_on_duplicate_name(conn, name)
-                self._update_without_relations(
-                    conn,
-                    current.author_id,
-                    name=name,
-                )
+            (current,) = self._get_many(conn, [author_id])
+            new_name = None if name == current.name else name
+            new_book_ids = current.book_ids
+            if book_ids is not None:
+                new_book_ids = list(book_ids)
+
+            if new_name is None and new_book_ids == current.book_ids:
+                # a no-op patch writes nothing
+                return current
 
-            if book_ids is not None and book_ids != current.book_ids:
-                clean_book_ids = self._clean_book_ids(conn, book_ids)
+            if new_name is not None:
+                self._raise_on_duplicate_name(conn, new_name)
+
+            if new_book_ids != current.book_ids:
+                new_book_ids = self._clean_book_ids(conn, new_book_ids)
                 self._raise_on_degenerate_author(
-                    clean_book_ids,
+                    new_book_ids,
                     author_id=author_id,
                     name=current.name,
                 )
-                self._unassign_books(conn, author_id)
-                self._assing_books(conn, author_id, clean_book_ids)
 
-        author = self.get_by_id(author_id)
-        if author is None:
-            raise LostAuthorsError(author_ids=[author_id])
+            sql = sql_author_update if new_name is None else sql_author_rename
+            params = {
+                "author_id": author_id,
+                "book_ids": list(set(new_book_ids)),
+                "name": new_name,
+            }
+            row = conn.execute(sql, params).fetchone()
+            if row is None:
+                raise LostAuthorsError(author_ids=[author_id])
 
+        author = Author.model_validate(row)
         return author
 
-    def _assing_books(
+    def update_many(self, patches: Collection[AuthorPatch], /) -> list[Author]:
+        pin_primary()
+        if not patches:
+            return []
+
+        author_ids = [i.author_id for i in patches]
+
+        conn: Connection
+        with self.engine.begin() as conn:
+            currents = {
+                i.author_id: i for i in self._get_many(conn, author_ids)
+            }
+
+            names = {
+                i.author_id: i.name
+                for i in patches
+                if i.name is not None and i.name != currents[i.author_id].name
+            }
+            self._raise_on_duplicate_names(conn, names)
+
+            relinks = {
+                i.author_id: i.book_ids
+                for i in patches
+                if i.book_ids is not None
+                and i.book_ids != currents[i.author_id].book_ids
+            }
+            values_relations = self._build_relations(
+                conn,
+                relinks,
+                {i: currents[i].name for i in relinks},
+            )
+
+            if names:
+                moving = set(names.values()) & {
+                    currents[i].name for i in names
+                }
+                self._rename_many(conn, names, free_first=bool(moving))
+
+            if relinks:
+                self._relink(
+                    conn,
+                    {
+                        (author_id, book_id)
+                        for author_id in relinks
+                        for book_id in currents[author_id].book_ids
+                    },
+                    {(i["author_id"], i["book_id"]) for i in values_relations},
+                )
+
+            authors = self._get_many(conn, author_ids)
+
+        return authors
+
+    def _build_relations(
         self,
         conn: Connection,
-        author_id: ID,
-        book_ids: list[ID],
+        book_ids: Mapping[ID, Collection[ID]],
+        names: Mapping[ID, str],
         /,
-    ) -> None:
-        values = [
-            {
-                table_books_authors.c.author_id: author_id,
-                table_books_authors.c.book_id: book_id,
-            }
-            for book_id in book_ids
-        ]
-        sql = sa.insert(table_books_authors).values(values)
-        conn.execute(sql)
+        *,
+        indexed: bool = True,
+    ) -> list[dict[str, ID]]:
+        existing_book_ids = set(
+            self._clean_book_ids(
+                conn,
+                {book_id for i in book_ids.values() for book_id in i},
+            )
+        )
+
+        values_relations: list[dict[str, ID]] = []
+        degenerates: dict[str, ID | None] = {}
+        for author_id, raw_book_ids in book_ids.items():
+            clean_book_ids = set(raw_book_ids) & existing_book_ids
+            if not clean_book_ids:
+                name = names[author_id]
+                degenerates[name] = author_id if indexed else None
+            values_relations.extend(
+                {"author_id": author_id, "book_id": book_id}
+                for book_id in clean_book_ids
+            )
+
+        if degenerates:
+            raise DegenerateAuthorsError(authors=degenerates)
+
+        return values_relations
 
     def _clean_book_ids(
         self,
@@ -160,36 +342,33 @@ class AuthorRepo:
         clean_book_ids = [row.book_id for row in rows]
         return clean_book_ids
 
-    def _create_without_relations(
+    def _delete(self, conn: Connection, author_id: ID, /) -> None:
+        sql = table_authors.delete().where(
+            table_authors.c.author_id == author_id,
+        )
+        conn.execute(sql)
+
+    def _from_row(self, row: sa.Row, /) -> Author:
+        author = author_from_row(row, validate=self.validate_rows)
+        return author
+
+    def _get_many(
         self,
         conn: Connection,
+        author_ids: Collection[ID],
         /,
-        *,
-        name: str,
-    ) -> ID:
-        sql = (
-            sa.insert(table_authors)
-            .values(
-                {
-                    table_authors.c.author_id: uuid4(),
-                    table_authors.c.name: name,
-                }
-            )
-            .returning(
-                table_authors.c.author_id,
-            )
+    ) -> list[Author]:
+        cursor = conn.execute(
+            self._reads().by_ids,
+            {"author_ids": list(set(author_ids))},
         )
+        authors = {i.author_id: i for i in map(self._from_row, cursor)}
 
-        author_id_raw = cast(ID, conn.execute(sql).scalar())
-        author_id = to_uuid(author_id_raw)
-
-        return author_id
+        lost_author_ids = set(author_ids) - authors.keys()
+        if lost_author_ids:
+            raise LostAuthorsError(author_ids=lost_author_ids)
 
-    def _delete(self, conn: Connection, author_id: ID, /) -> None:
-        sql = table_authors.delete().where(
-            table_authors.c.author_id == author_id,
-        )
-        conn.execute(sql)
+        return [authors[i] for i in author_ids]
 
     def _raise_on_degenerate_author(
         self,
@@ -208,24 +387,106 @@ class AuthorRepo:
         if name_is_taken:
             raise DuplicateAuthorNameError(name=name)
 
-    def _update_without_relations(
+    def _raise_on_duplicate_names(
         self,
         conn: Connection,
-        author_id: ID,
+        names: Mapping[ID, str],
+        /,
+    ) -> None:
+        """
+        Checks the names by id against the state after the batch:
+        the ids give up their current names, so they may swap them.
+        """
+
+        counter = Counter(names.values())
+        if not counter:
+            return
+
+        repeated_names = sorted(i for i, n in counter.items() if n > 1)
+        if repeated_names:
+            raise DuplicateAuthorNameError(name=repeated_names[0])
+
+        sql = sa.select(sa.func.min(table_authors.c.name)).where(
+            table_authors.c.name.in_(list(counter)),
+            table_authors.c.author_id.not_in(list(names)),
+        )
+        taken_name = conn.execute(sql).scalar()
+        if taken_name is not None:
+            raise DuplicateAuthorNameError(name=taken_name)
+
+    def _read_engine(self, /) -> Engine:
+        engine = self.replicas.pick() if self.replicas else None
+        return engine or self.engine
+
+    def _reads(self, /) -> AuthorReads:
+        if self.denormalized:
+            return author_reads_denormalized
+
+        return author_reads
+
+    def _relink(
+        self,
+        conn: Connection,
+        current: set[tuple[ID, ID]],
+        wanted: set[tuple[ID, ID]],
+        /,
+    ) -> None:
+        """
+        Turns the current (author_id, book_id) links into the wanted ones,
+        deleting and inserting only the links which differ.
+        """
+
+        m2m = table_books_authors
+
+        unlinks = current - wanted
+        if unlinks:
+            sql = m2m.delete().where(
+                sa.tuple_(m2m.c.author_id, m2m.c.book_id).in_(list(unlinks)),
+            )
+            conn.execute(sql)
+
+        links = wanted - current
+        if links:
+            values = [
+                {"author_id": author_id, "book_id": book_id}
+                for author_id, book_id in links
+            ]
+            conn.execute(sa.insert(m2m), values)
+
+    def _rename_many(
+        self,
+        conn: Connection,
+        names: Mapping[ID, str],
         /,
         *,
-        name: str,
+        free_first: bool = False,
     ) -> None:
+        if free_first:
+            # unique names are checked row by row:
+            # the names moving within the batch are replaced with the ids
+            sql_free = (
+                sa.update(table_authors)
+                .where(table_authors.c.author_id.in_(list(names)))
+                .values(
+                    {
+                        table_authors.c.name: sa.cast(
+                            table_authors.c.author_id, sa.Text
+                        )
+                    }
+                )
+            )
+            conn.execute(sql_free)
+
         sql = (
             sa.update(table_authors)
-            .values(
-                {
-                    table_authors.c.name: name,
-                }
-            )
-            .where(table_authors.c.author_id == author_id)
+            .where(table_authors.c.author_id == sa.bindparam("b_author_id"))
+            .values({table_authors.c.name: sa.bindparam("b_name")})
         )
-        conn.execute(sql)
+        values = [
+            {"b_author_id": author_id, "b_name": name}
+            for author_id, name in names.items()
+        ]
+        conn.execute(sql, values)
 
     def _unassign_books(self, conn: Connection, author_id: ID, /) -> None:
         sql = table_books_authors.delete().where(
@@ -233,44 +494,5 @@ class AuthorRepo:
         )
         conn.execute(sql)
 
-    @staticmethod
-    def __build_total_sql() -> sa.Select:
-        stmt = (  # noqa: ECE001
-            sa.select(
-                table_authors.c.author_id,
-                table_authors.c.name,
-                sa.func.coalesce(
-                    sa.func.array_agg(
-                        aggregate_order_by(  # type: ignore
-                            table_books.c.book_id,
-                            table_books.c.title.asc(),
-                        ),
-                    ).filter(
-                        ~table_books.c.book_id.is_(None),
-                    ),
-                    [],
-                ).label("book_ids"),
-            )
-            .select_from(
-                table_authors,
-            )
-            .join(
-                table_books_authors,
-                table_books_authors.c.author_id == table_authors.c.author_id,
-            )
-            .join(
-                table_books,
-                table_books.c.book_id == table_books_authors.c.book_id,
-            )
-            .group_by(
-                table_authors.c.author_id,
-            )
-            .order_by(
-                table_authors.c.name,
-            )
-        )
-
-        return stmt
-
 
 __all__ = ("AuthorRepo",)
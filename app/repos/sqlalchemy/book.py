@@ -1,13 +1,16 @@
+from collections import Counter
 from typing import Collection
-from typing import cast
+from typing import Iterator
+from typing import Mapping
 from typing import final
+from uuid import UUID
 from uuid import uuid4
 
 import attrs
 import sqlalchemy as sa
 from sqlalchemy import Connection
 from sqlalchemy import Engine
-from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.entities.errors import DegenerateAuthorsError
 from app.entities.errors import DuplicateBookTitleError
@@ -15,7 +18,17 @@ from app.entities.errors import LostAuthorsError
 from app.entities.errors import LostBooksError
 from app.entities.models import ID
 from app.entities.models import Book
-from app.entities.models import to_uuid
+from app.entities.models import BookPatch
+from app.entities.models import NewBook
+from app.repos.replicas import ReplicaSet
+from app.repos.replicas import pin_primary
+from app.repos.rows import book_from_row
+from app.repos.sqlalchemy.statements import BookReads
+from app.repos.sqlalchemy.statements import book_reads
+from app.repos.sqlalchemy.statements import book_reads_denormalized
+from app.repos.sqlalchemy.statements import sql_book_delete
+from app.repos.sqlalchemy.statements import sql_book_retitle
+from app.repos.sqlalchemy.statements import sql_book_update
 from app.repos.sqlalchemy.tables import table_authors
 from app.repos.sqlalchemy.tables import table_books
 from app.repos.sqlalchemy.tables import table_books_authors
@@ -24,78 +37,163 @@ from app.repos.sqlalchemy.tables import table_books_authors
 @final
 @attrs.frozen(kw_only=True, slots=True)
 class BookRepo:
+    denormalized: bool = False
     engine: Engine
+    replicas: ReplicaSet[Engine] | None = None
+    validate_rows: bool = False
 
     def create(self, /, *, title: str) -> Book:
+        pin_primary()
+        sql = (  # noqa: ECE001
+            pg_insert(table_books)
+            .values(
+                {
+                    table_books.c.book_id: uuid4(),
+                    table_books.c.title: title,
+                }
+            )
+            .on_conflict_do_nothing(
+                index_elements=[table_books.c.title],
+            )
+            .returning(
+                table_books.c.book_id,
+                table_books.c.title,
+            )
+        )
+
         conn: Connection
         with self.engine.begin() as conn:
-            self._raise_on_duplicate_title(conn, title)
-            book_id = self._create_without_relations(conn, title=title)
+            row = conn.execute(sql).fetchone()
 
-        book = self.get_by_id(book_id)
-        if book is None:
-            raise LostBooksError(book_ids=[book_id])
+        if row is None:
+            raise DuplicateBookTitleError(title=title)
 
+        book = Book(author_ids=[], book_id=row.book_id, title=row.title)
         return book
 
-    def delete(self, book_id: ID, /) -> None:
-        current = self.get_by_id(book_id)
-        if current is None:
-            return
+    def create_many(self, new_books: Collection[NewBook], /) -> list[Book]:
+        pin_primary()
+        if not new_books:
+            return []
+
+        titles = {uuid4(): i.title for i in new_books}
 
         conn: Connection
         with self.engine.begin() as conn:
-            self._raise_on_degenerate_authors(
-                conn,
-                book_id,
-                current.author_ids,
-            )
-            self._unassign_authors(conn, book_id)
-            self._delete(conn, book_id)
+            self._raise_on_duplicate_titles(conn, titles)
 
-    def get_all(self, /) -> list[Book]:
-        sql = self.__build_all_sql()
+            values_books = [
+                {"book_id": book_id, "title": title}
+                for book_id, title in titles.items()
+            ]
+            conn.execute(sa.insert(table_books), values_books)
+
+            books = self._get_many(conn, list(titles))
+
+        return books
+
+    def delete(self, book_id: ID, /) -> None:
+        pin_primary()
 
         conn: Connection
         with self.engine.begin() as conn:
-            cursor = conn.execute(sql)
+            row = conn.execute(sql_book_delete, {"book_id": book_id}).one()
+
+        if row.degenerate_authors:
+            degenerates = {
+                name: UUID(author_id)
+                for name, author_id in row.degenerate_authors.items()
+            }
+            raise DegenerateAuthorsError(authors=degenerates)
+
+    def get_all(self, /) -> list[Book]:
+        conn: Connection
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(self._reads().every)
             rows = cursor.fetchall()
-            books = [Book.model_validate(row) for row in rows]
+            books = [self._from_row(row) for row in rows]
 
         return books
 
     def get_by_id(self, book_id: ID, /) -> Book | None:
-        sql = (
-            self.__build_all_sql()
-            .where(table_books.c.book_id == book_id)
-            .limit(1)
-        )
-
         conn: Connection
-        with self.engine.begin() as conn:
-            cursor = conn.execute(sql)
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(self._reads().by_id, {"book_id": book_id})
             row = cursor.fetchone()
-            book = Book.model_validate(row) if row else None
+            book = self._from_row(row) if row else None
 
         return book
 
     def get_by_title(self, title: str, /) -> Book | None:
-        stmt = (
-            self.__build_all_sql()
-            .where(
-                table_books.c.title == title,
-            )
-            .limit(1)
-        )
-
         conn: Connection
-        with self.engine.begin() as conn:
-            cursor = conn.execute(stmt)
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(self._reads().by_title, {"title": title})
             row = cursor.fetchone()
-            book = Book.model_validate(row) if row else None
+            book = self._from_row(row) if row else None
 
         return book
 
+    def get_many_by_ids(
+        self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        if not book_ids:
+            return []
+
+        sql = self._reads().by_ids
+
+        conn: Connection
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(sql, {"book_ids": list(set(book_ids))})
+            found = {i.book_id: i for i in map(self._from_row, cursor)}
+
+        books = [found.get(i) for i in book_ids]
+        return books
+
+    def iter_all(self, /, *, batch_size: int = 1000) -> Iterator[Book]:
+        """
+        Yields all books streamed through a server-side cursor,
+        so at most `batch_size` rows are held in memory at once.
+        The connection is held until the generator is exhausted or closed.
+        """
+
+        sql = self._reads().every
+
+        conn: Connection
+        with self._read_engine().begin() as conn:
+            cursor = conn.execution_options(yield_per=batch_size).execute(sql)
+            for row in cursor:
+                yield self._from_row(row)
+
+    def page(
+        self,
+        /,
+        *,
+        after: Book | None = None,
+        limit: int,
+    ) -> list[Book]:
+        """
+        Returns up to `limit` books which follow `after`
+        in the (title, book_id) order.
+        Pass the last book of the previous page to get the next one.
+        """
+
+        reads = self._reads()
+        sql = reads.page
+        params: dict[str, object] = {"limit": limit}
+        if after is not None:
+            sql = reads.page_after
+            params["after_title"] = after.title
+            params["after_book_id"] = after.book_id
+
+        conn: Connection
+        with self._read_engine().begin() as conn:
+            cursor = conn.execute(sql, params)
+            books = [self._from_row(row) for row in cursor]
+
+        return books
+
     def update(
         self,
         book_id: ID,
@@ -104,55 +202,94 @@ class BookRepo:
         author_ids: Collection[ID] | None = None,
         title: str | None = None,
     ) -> Book:
-        current = self.get_by_id(book_id)
-        if current is None:
-            raise LostBooksError(book_ids=[book_id])
+        pin_primary()
+        sql = sql_book_update if title is None else sql_book_retitle
+        new_author_ids = set(author_ids or [])
+        params = {
+            "author_ids": list(new_author_ids),
+            "book_id": book_id,
+            "relink": author_ids is not None,
+            "title": title,
+        }
 
         conn: Connection
         with self.engine.begin() as conn:
-            if title is not None and title != current.title:
-                self._raise_on_duplicate_title(conn, title)
-                self._update_without_relations(conn, book_id, title=title)
-
-            if author_ids is not None and author_ids != current.author_ids:
-                clean_author_ids = self._clean_author_ids(conn, author_ids)
-                discard_author_ids = set(current.author_ids)
-                discard_author_ids -= set(clean_author_ids)
-                self._raise_on_degenerate_authors(
-                    conn,
-                    book_id,
-                    discard_author_ids,
-                )
-                self._unassign_authors(conn, book_id)
-                self._assign_authors(conn, book_id, clean_author_ids)
+            row = conn.execute(sql, params).one()
 
-        book = self.get_by_id(book_id)
-        if book is None:
+        if not row.book_exists:
             raise LostBooksError(book_ids=[book_id])
 
+        if row.title_taken:
+            raise DuplicateBookTitleError(title=str(title))
+
+        lost_author_ids = new_author_ids - set(row.found_author_ids)
+        if lost_author_ids:
+            raise LostAuthorsError(author_ids=lost_author_ids)
+
+        if row.degenerate_authors:
+            degenerates = {
+                name: UUID(author_id)
+                for name, author_id in row.degenerate_authors.items()
+            }
+            raise DegenerateAuthorsError(authors=degenerates)
+
+        book = Book.model_validate(row)
         return book
 
-    def _assign_authors(
-        self,
-        conn: Connection,
-        book_id: ID,
-        author_ids: Collection[ID],
-        /,
-    ) -> None:
-        if not author_ids:
-            return
+    def update_many(self, patches: Collection[BookPatch], /) -> list[Book]:
+        pin_primary()
+        if not patches:
+            return []
 
-        values = [
-            {
-                table_books_authors.c.author_id: author_id,
-                table_books_authors.c.book_id: book_id,
+        book_ids = [i.book_id for i in patches]
+
+        conn: Connection
+        with self.engine.begin() as conn:
+            currents = {i.book_id: i for i in self._get_many(conn, book_ids)}
+
+            titles = {
+                i.book_id: i.title
+                for i in patches
+                if i.title is not None and i.title != currents[i.book_id].title
             }
-            for author_id in author_ids
-        ]
+            self._raise_on_duplicate_titles(conn, titles)
+
+            relinks = {
+                i.book_id: set(i.author_ids)
+                for i in patches
+                if i.author_ids is not None
+                and i.author_ids != currents[i.book_id].author_ids
+            }
+            self._clean_author_ids(
+                conn,
+                {author_id for i in relinks.values() for author_id in i},
+            )
+            self._raise_on_degenerate_relinks(conn, relinks, currents)
+
+            if titles:
+                moving = set(titles.values()) & {
+                    currents[i].title for i in titles
+                }
+                self._retitle_many(conn, titles, free_first=bool(moving))
+
+            if relinks:
+                self._relink(
+                    conn,
+                    {
+                        (author_id, book_id)
+                        for book_id in relinks
+                        for author_id in currents[book_id].author_ids
+                    },
+                    {
+                        (author_id, book_id)
+                        for book_id, author_ids in relinks.items()
+                        for author_id in author_ids
+                    },
+                )
 
-        sql = sa.insert(table_books_authors).values(values)
+            books = self._get_many(conn, book_ids)
 
-        conn.execute(sql)
+        return books
 
     def _clean_author_ids(
         self,
@@ -184,79 +321,75 @@ class BookRepo:
 
         return actual_author_ids
 
-    def _create_without_relations(
-        self, conn: Connection, /, *, title: str
-    ) -> ID:
-        sql = (
-            sa.insert(table_books)
-            .values(
-                {
-                    table_books.c.book_id: uuid4(),
-                    table_books.c.title: title,
-                }
-            )
-            .returning(
-                table_books.c.book_id,
-            )
-        )
-
-        book_id_raw = cast(ID, conn.execute(sql).scalar())
-        book_id = to_uuid(book_id_raw)
-
-        return book_id
+    def _from_row(self, row: sa.Row, /) -> Book:
+        book = book_from_row(row, validate=self.validate_rows)
+        return book
 
-    def _delete(self, conn: Connection, book_id: ID) -> None:
-        sql = sa.delete(
-            table_books,
-        ).where(
-            table_books.c.book_id == book_id,
+    def _get_many(
+        self,
+        conn: Connection,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book]:
+        cursor = conn.execute(
+            self._reads().by_ids,
+            {"book_ids": list(set(book_ids))},
         )
+        books = {i.book_id: i for i in map(self._from_row, cursor)}
+
+        lost_book_ids = set(book_ids) - books.keys()
+        if lost_book_ids:
+            raise LostBooksError(book_ids=lost_book_ids)
 
-        conn.execute(sql)
+        return [books[i] for i in book_ids]
 
-    def _raise_on_degenerate_authors(
+    def _raise_on_degenerate_relinks(
         self,
         conn: Connection,
-        book_id: ID,
-        author_ids: Collection[ID],
+        relinks: Mapping[ID, set[ID]],
+        currents: Mapping[ID, Book],
         /,
     ) -> None:
-        if not author_ids:
+        discarded = {
+            (author_id, book_id)
+            for book_id, author_ids in relinks.items()
+            for author_id in set(currents[book_id].author_ids) - author_ids
+        }
+        if not discarded:
             return
 
+        added = {
+            (author_id, book_id)
+            for book_id, author_ids in relinks.items()
+            for author_id in author_ids
+        }
+
         authors = table_authors
         m2m = table_books_authors
 
         sql = (  # noqa: ECE001
-            sa.select(
-                authors.c.author_id,
-                authors.c.name,
-                sa.func.count(m2m.c.book_id).label("nr_books"),
-            )
-            .select_from(
-                authors,
-            )
-            .outerjoin(
-                m2m,
-                sa.and_(
-                    m2m.c.author_id == authors.c.author_id,
-                    m2m.c.book_id != book_id,
-                ),
-            )
-            .where(
-                authors.c.author_id.in_(author_ids),
-            )
-            .group_by(
-                authors.c.author_id,
-            )
+            sa.select(authors.c.author_id, authors.c.name, m2m.c.book_id)
+            .select_from(authors)
+            .join(m2m, m2m.c.author_id == authors.c.author_id)
+            .where(authors.c.author_id.in_({i for i, _ in discarded}))
         )
 
-        rows = conn.execute(sql).fetchall()
+        remaining: dict[ID, set[ID]] = {}
+        names: dict[ID, str] = {}
+        for row in conn.execute(sql):
+            names[row.author_id] = row.name
+            book_ids = remaining.setdefault(row.author_id, set())
+            if (row.author_id, row.book_id) not in discarded:
+                book_ids.add(row.book_id)
+        for author_id, book_id in added:
+            if author_id in remaining:
+                remaining[author_id].add(book_id)
 
         degenerates = {
-            row.name: row.author_id for row in rows if not row.nr_books
+            names[author_id]: author_id
+            for author_id, book_ids in remaining.items()
+            if not book_ids
         }
-
         if degenerates:
             raise DegenerateAuthorsError(authors=degenerates)
 
@@ -276,81 +409,106 @@ class BookRepo:
         if title_is_taken:
             raise DuplicateBookTitleError(title=title)
 
-    def _unassign_authors(self, conn: Connection, book_id: ID, /) -> None:
-        sql = sa.delete(
-            table_books_authors,
-        ).where(
-            table_books_authors.c.book_id == book_id,
+    def _raise_on_duplicate_titles(
+        self,
+        conn: Connection,
+        titles: Mapping[ID, str],
+        /,
+    ) -> None:
+        """
+        Checks the titles by id against the state after the batch:
+        the ids give up their current titles, so they may swap them.
+        """
+
+        counter = Counter(titles.values())
+        if not counter:
+            return
+
+        repeated_titles = sorted(i for i, n in counter.items() if n > 1)
+        if repeated_titles:
+            raise DuplicateBookTitleError(title=repeated_titles[0])
+
+        sql = sa.select(sa.func.min(table_books.c.title)).where(
+            table_books.c.title.in_(list(counter)),
+            table_books.c.book_id.not_in(list(titles)),
         )
+        taken_title = conn.execute(sql).scalar()
+        if taken_title is not None:
+            raise DuplicateBookTitleError(title=taken_title)
+
+    def _read_engine(self, /) -> Engine:
+        engine = self.replicas.pick() if self.replicas else None
+        return engine or self.engine
 
-        conn.execute(sql)
+    def _reads(self, /) -> BookReads:
+        if self.denormalized:
+            return book_reads_denormalized
 
-    def _update_without_relations(
+        return book_reads
+
+    def _relink(
         self,
         conn: Connection,
-        book_id: ID,
+        current: set[tuple[ID, ID]],
+        wanted: set[tuple[ID, ID]],
         /,
-        *,
-        title: str,
     ) -> None:
-        sql = (
-            sa.update(
-                table_books,
-            )
-            .values(
-                {
-                    table_books.c.title: title,
-                }
-            )
-            .where(
-                table_books.c.book_id == book_id,
-            )
-        )
-        conn.execute(sql)
+        """
+        Turns the current (author_id, book_id) links into the wanted ones,
+        deleting and inserting only the links which differ.
+        """
 
-    @staticmethod
-    def __build_all_sql() -> sa.Select:
-        authors = table_authors
-        books = table_books
         m2m = table_books_authors
 
-        sql = (  # noqa: ECE001
-            sa.select(
-                books.c.book_id,
-                books.c.title,
-                sa.func.coalesce(
-                    sa.func.array_agg(
-                        aggregate_order_by(  # type: ignore
-                            authors.c.author_id,
-                            authors.c.name.asc(),
-                        ),
-                    ).filter(
-                        ~authors.c.author_id.is_(None),
-                    ),
-                    [],
-                ).label("author_ids"),
-            )
-            .select_from(
-                books,
-            )
-            .outerjoin(
-                m2m,
-                m2m.c.book_id == books.c.book_id,
+        unlinks = current - wanted
+        if unlinks:
+            sql = m2m.delete().where(
+                sa.tuple_(m2m.c.author_id, m2m.c.book_id).in_(list(unlinks)),
             )
-            .outerjoin(
-                authors,
-                authors.c.author_id == m2m.c.author_id,
-            )
-            .order_by(
-                books.c.title.asc(),
-                books.c.book_id.asc(),
-            )
-            .group_by(
-                books.c.book_id,
+            conn.execute(sql)
+
+        links = wanted - current
+        if links:
+            values = [
+                {"author_id": author_id, "book_id": book_id}
+                for author_id, book_id in links
+            ]
+            conn.execute(sa.insert(m2m), values)
+
+    def _retitle_many(
+        self,
+        conn: Connection,
+        titles: Mapping[ID, str],
+        /,
+        *,
+        free_first: bool = False,
+    ) -> None:
+        if free_first:
+            # unique titles are checked row by row:
+            # the titles moving within the batch are replaced with the ids
+            sql_free = (
+                sa.update(table_books)
+                .where(table_books.c.book_id.in_(list(titles)))
+                .values(
+                    {
+                        table_books.c.title: sa.cast(
+                            table_books.c.book_id, sa.Text
+                        )
+                    }
+                )
             )
-        )
+            conn.execute(sql_free)
 
-        return sql
+        sql = (
+            sa.update(table_books)
+            .where(table_books.c.book_id == sa.bindparam("b_book_id"))
+            .values({table_books.c.title: sa.bindparam("b_title")})
+        )
+        values = [
+            {"b_book_id": book_id, "b_title": title}
+            for book_id, title in titles.items()
+        ]
+        conn.execute(sql, values)
 
 
 __all__ = ("BookRepo",)
@@ -0,0 +1,75 @@
+import select
+from typing import Any
+from typing import final
+
+import attrs
+from sqlalchemy import Engine
+from sqlalchemy import PoolProxiedConnection
+
+from app.repos.changes import CHANNEL
+from app.repos.changes import ChangeFeed
+from app.repos.changes import ChangeListener
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class EngineChannel:
+    """
+    Listens to the change notifications of the database of the engine
+    on a connection of its own, detached from the pool.
+    """
+
+    connection: PoolProxiedConnection | None = None
+    engine: Engine
+
+    def close(self, /) -> None:
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            connection.close()
+
+    def listen(self, /) -> None:
+        self.close()
+
+        connection = self.engine.raw_connection()
+        connection.detach()
+        self.connection = connection
+
+        driver_connection = self._driver_connection()
+        driver_connection.autocommit = True
+        with driver_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+
+    def receive(self, /, *, timeout: float) -> list[str]:
+        driver_connection = self._driver_connection()
+
+        ready, _, _ = select.select([driver_connection], [], [], timeout)
+        if ready:
+            driver_connection.poll()
+
+        payloads = [i.payload for i in driver_connection.notifies]
+        driver_connection.notifies.clear()
+
+        return payloads
+
+    def _driver_connection(self, /) -> Any:
+        if self.connection is None:
+            raise ConnectionError(f"not listening to {CHANNEL!r}")
+
+        return self.connection.driver_connection
+
+
+def listen_changes(engine: Engine, /, *, feed: ChangeFeed) -> ChangeListener:
+    """
+    Starts publishing the changes of the database of the engine to the feed.
+    """
+
+    listener = ChangeListener(channel=EngineChannel(engine=engine), feed=feed)
+    listener.start()
+
+    return listener
+
+
+__all__ = (
+    "EngineChannel",
+    "listen_changes",
+)
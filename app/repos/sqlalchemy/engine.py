@@ -0,0 +1,69 @@
+from functools import partial
+
+import sqlalchemy as sa
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+
+from app.entities.config import Config
+from app.repos.replicas import LAG_SQL
+from app.repos.replicas import Replica
+from app.repos.replicas import ReplicaSet
+from app.repos.sqlalchemy.pool import MeteredQueuePool
+
+
+def build_engine(url: str, /, *, config: Config) -> Engine:
+    """
+    Builds the engine for the database at the url
+    with the pool configured by the config.
+    """
+
+    engine = sa.create_engine(
+        url,
+        echo=config.MODE_DEBUG,
+        max_overflow=config.DATABASE_POOL_MAX_OVERFLOW,
+        pool_pre_ping=config.DATABASE_POOL_PRE_PING,
+        pool_recycle=config.DATABASE_POOL_RECYCLE,
+        pool_size=config.DATABASE_POOL_SIZE,
+        pool_timeout=config.DATABASE_POOL_TIMEOUT,
+        poolclass=MeteredQueuePool,
+    )
+
+    return engine
+
+
+def build_replicas(config: Config, /) -> ReplicaSet[Engine]:
+    """
+    Builds the engines for the replicas listed in the config.
+    """
+
+    replicas = ReplicaSet(
+        max_staleness=config.REPLICA_MAX_STALENESS,
+        replicas=[
+            Replica(probe=partial(probe_lag, engine), target=engine)
+            for engine in (
+                build_engine(url, config=config)
+                for url in config.REPLICA_DATABASE_URLS
+            )
+        ],
+    )
+
+    return replicas
+
+
+def probe_lag(engine: Engine, /) -> float:
+    """
+    Returns the lag of the replica behind the primary, in seconds.
+    """
+
+    conn: Connection
+    with engine.connect() as conn:
+        lag = conn.execute(sa.text(LAG_SQL)).scalar_one()
+
+    return float(lag)
+
+
+__all__ = (
+    "build_engine",
+    "build_replicas",
+    "probe_lag",
+)
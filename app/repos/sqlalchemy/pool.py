@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from typing import Any
+from typing import Final
+from typing import final
+
+import attrs
+import sqlalchemy as sa
+from sqlalchemy import Engine
+from sqlalchemy.engine.interfaces import DBAPIConnection
+from sqlalchemy.pool import ConnectionPoolEntry
+from sqlalchemy.pool import PoolProxiedConnection
+from sqlalchemy.pool import QueuePool
+
+# a checkout which waits this many seconds is logged with the pool stats
+SLOW_CHECKOUT: Final = 0.1
+
+_checkouts: Final = threading.local()
+
+_logger: Final = logging.getLogger(__name__)
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class PoolStats:
+    """
+    A point-in-time view of a metered pool.
+
+    checked_out: connections in use right now,
+    connects: connections opened since the pool was created,
+    connect_max / connect_total: seconds spent opening the connections,
+    overflow: connections opened above the pool size right now,
+    size: the configured pool size,
+    waits: checkouts served since the pool was created,
+    wait_max / wait_total: seconds the checkouts waited for a connection,
+        not counting the time spent opening one.
+    """
+
+    checked_out: int
+    connect_max: float
+    connect_total: float
+    connects: int
+    overflow: int
+    size: int
+    wait_max: float
+    wait_total: float
+    waits: int
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class _Checkout:
+    """
+    A checkout in progress in the current thread.
+    """
+
+    connecting: float = 0.0
+    pool: "MeteredQueuePool"
+    started: float
+
+
+@final
+class MeteredQueuePool(QueuePool):
+    """
+    The default pool of SqlAlchemy which times every checkout
+    through the public interface of the pool.
+
+    `connect` marks the start of a checkout, the `checkout` event its end,
+    and the `connect` event a connection opened within it.
+    The pool opens a connection at once when the queue is empty
+    and the overflow allows, so the time up to the `connect` event
+    is spent connecting, and the rest is a wait, pre-ping included.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._connect_max = 0.0
+        self._connect_total = 0.0
+        self._connects = 0
+        self._metrics_lock = threading.Lock()
+        self._wait_max = 0.0
+        self._wait_total = 0.0
+        self._waits = 0
+
+    def connect(self) -> PoolProxiedConnection:
+        outer = getattr(_checkouts, "current", None)
+        _checkouts.current = _Checkout(pool=self, started=time.perf_counter())
+        try:
+            return super().connect()
+        finally:
+            _checkouts.current = outer
+
+    def stats(self, /) -> PoolStats:
+        with self._metrics_lock:
+            stats = PoolStats(
+                checked_out=self.checkedout(),
+                connect_max=self._connect_max,
+                connect_total=self._connect_total,
+                connects=self._connects,
+                overflow=max(self.overflow(), 0),
+                size=self.size(),
+                wait_max=self._wait_max,
+                wait_total=self._wait_total,
+                waits=self._waits,
+            )
+
+        return stats
+
+    def _count_connect(self, connected: float, /) -> None:
+        with self._metrics_lock:
+            self._connect_max = max(self._connect_max, connected)
+            self._connect_total += connected
+            self._connects += 1
+
+    def _count_wait(self, waited: float, /) -> None:
+        with self._metrics_lock:
+            self._wait_max = max(self._wait_max, waited)
+            self._wait_total += waited
+            self._waits += 1
+
+
+@sa.event.listens_for(MeteredQueuePool, "connect")
+def _on_connect(
+    dbapi_connection: DBAPIConnection,
+    connection_record: ConnectionPoolEntry,
+    /,
+) -> None:
+    checkout: _Checkout | None = getattr(_checkouts, "current", None)
+    if checkout is None:
+        return
+
+    connected = time.perf_counter() - checkout.started - checkout.connecting
+    checkout.connecting += connected
+    checkout.pool._count_connect(connected)
+
+
+@sa.event.listens_for(MeteredQueuePool, "checkout")
+def _on_checkout(
+    dbapi_connection: DBAPIConnection,
+    connection_record: ConnectionPoolEntry,
+    connection_proxy: PoolProxiedConnection,
+    /,
+) -> None:
+    checkout: _Checkout | None = getattr(_checkouts, "current", None)
+    if checkout is None:
+        return
+
+    elapsed = time.perf_counter() - checkout.started
+    waited = max(elapsed - checkout.connecting, 0.0)
+    checkout.pool._count_wait(waited)
+
+    if waited >= SLOW_CHECKOUT:
+        _logger.warning(
+            "slow checkout: waited %.3fs for a connection of %s, %s",
+            waited,
+            checkout.pool,
+            checkout.pool.stats(),
+        )
+
+
+def pool_stats(engine: Engine, /) -> PoolStats:
+    pool = engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        raise TypeError(f"the pool of {engine} is not metered: {pool}")
+
+    return pool.stats()
+
+
+__all__ = (
+    "SLOW_CHECKOUT",
+    "MeteredQueuePool",
+    "PoolStats",
+    "pool_stats",
+)
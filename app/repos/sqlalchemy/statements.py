@@ -0,0 +1,702 @@
+"""
+Statements of the repos, built once at import.
+
+The values are passed as bind parameters on execution,
+so a call neither builds the statement nor walks it
+to produce the key for the compiled cache of the engine.
+"""
+
+from typing import Final
+from typing import Self
+from typing import final
+
+import attrs
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.repos.sqlalchemy.tables import table_authors
+from app.repos.sqlalchemy.tables import table_books
+from app.repos.sqlalchemy.tables import table_books_authors
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AuthorReads:
+    """
+    The read statements of authors, built over one select of all authors.
+    """
+
+    by_id: sa.Select
+    by_ids: sa.Select
+    by_name: sa.Select
+    every: sa.Select
+    page: sa.Select
+    page_after: sa.Select
+
+    @classmethod
+    def build(cls, sql: sa.Select, /) -> Self:
+        page = sql.limit(sa.bindparam("limit"))
+
+        reads = cls(
+            by_id=sql.where(
+                table_authors.c.author_id == sa.bindparam("author_id"),
+            ),
+            by_ids=sql.where(
+                table_authors.c.author_id.in_(
+                    sa.bindparam("author_ids", expanding=True),
+                ),
+            ),
+            by_name=sql.where(
+                table_authors.c.name == sa.bindparam("name"),
+            ),
+            every=sql,
+            page=page,
+            page_after=page.where(
+                table_authors.c.name > sa.bindparam("after_name"),
+            ),
+        )
+
+        return reads
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class BookReads:
+    """
+    The read statements of books, built over one select of all books.
+    """
+
+    by_id: sa.Select
+    by_ids: sa.Select
+    by_title: sa.Select
+    every: sa.Select
+    page: sa.Select
+    page_after: sa.Select
+
+    @classmethod
+    def build(cls, sql: sa.Select, /) -> Self:
+        page = sql.limit(sa.bindparam("limit"))
+
+        reads = cls(
+            by_id=sql.where(
+                table_books.c.book_id == sa.bindparam("book_id"),
+            ).limit(1),
+            by_ids=sql.where(
+                table_books.c.book_id.in_(
+                    sa.bindparam("book_ids", expanding=True),
+                ),
+            ),
+            by_title=sql.where(
+                table_books.c.title == sa.bindparam("title"),
+            ).limit(1),
+            every=sql,
+            page=page,
+            page_after=page.where(
+                sa.tuple_(table_books.c.title, table_books.c.book_id)
+                > sa.tuple_(
+                    sa.bindparam(
+                        "after_title",
+                        type_=table_books.c.title.type,
+                    ),
+                    sa.bindparam(
+                        "after_book_id",
+                        type_=table_books.c.book_id.type,
+                    ),
+                ),
+            ),
+        )
+
+        return reads
+
+
+def build_authors_denormalized_sql() -> sa.Select:
+    """
+    Reads the book ids which the triggers keep in the authors table.
+    """
+
+    authors = table_authors
+
+    sql = (
+        sa.select(authors.c.author_id, authors.c.name, authors.c.book_ids)
+        .where(sa.func.cardinality(authors.c.book_ids) > 0)
+        .order_by(authors.c.name)
+    )
+
+    return sql
+
+
+def build_authors_sql() -> sa.Select:
+    authors = table_authors
+    books = table_books
+    m2m = table_books_authors
+
+    sql = (  # noqa: ECE001
+        sa.select(
+            authors.c.author_id,
+            authors.c.name,
+            sa.func.coalesce(
+                sa.func.array_agg(
+                    aggregate_order_by(
+                        books.c.book_id,
+                        books.c.title.asc(),
+                    ),
+                ).filter(
+                    ~books.c.book_id.is_(None),
+                ),
+                [],
+            ).label("book_ids"),
+        )
+        .select_from(
+            authors,
+        )
+        .join(
+            m2m,
+            m2m.c.author_id == authors.c.author_id,
+        )
+        .join(
+            books,
+            books.c.book_id == m2m.c.book_id,
+        )
+        .group_by(
+            authors.c.author_id,
+        )
+        .order_by(
+            authors.c.name,
+        )
+    )
+
+    return sql
+
+
+def build_books_denormalized_sql() -> sa.Select:
+    """
+    Reads the author ids which the triggers keep in the books table.
+    """
+
+    books = table_books
+
+    sql = sa.select(
+        books.c.book_id, books.c.title, books.c.author_ids
+    ).order_by(
+        books.c.title.asc(),
+        books.c.book_id.asc(),
+    )
+
+    return sql
+
+
+def build_books_sql() -> sa.Select:
+    authors = table_authors
+    books = table_books
+    m2m = table_books_authors
+
+    sql = (  # noqa: ECE001
+        sa.select(
+            books.c.book_id,
+            books.c.title,
+            sa.func.coalesce(
+                sa.func.array_agg(
+                    aggregate_order_by(
+                        authors.c.author_id,
+                        authors.c.name.asc(),
+                    ),
+                ).filter(
+                    ~authors.c.author_id.is_(None),
+                ),
+                [],
+            ).label("author_ids"),
+        )
+        .select_from(
+            books,
+        )
+        .outerjoin(
+            m2m,
+            m2m.c.book_id == books.c.book_id,
+        )
+        .outerjoin(
+            authors,
+            authors.c.author_id == m2m.c.author_id,
+        )
+        .order_by(
+            books.c.title.asc(),
+            books.c.book_id.asc(),
+        )
+        .group_by(
+            books.c.book_id,
+        )
+    )
+
+    return sql
+
+
+def build_author_create_sql() -> sa.Select:
+    """
+    Builds one statement which inserts an author with its books.
+
+    Parameters:
+        author_id: the id of the new author,
+        book_ids: the distinct book ids,
+        name.
+
+    Returns the new author with aggregated book ids.
+    Nothing is inserted (and no row is returned)
+    if the name is taken or none of the books exists.
+    """
+
+    authors = table_authors
+    books = table_books
+    m2m = table_books_authors
+
+    p_author_id = sa.cast(
+        sa.bindparam("author_id", type_=authors.c.author_id.type),
+        authors.c.author_id.type,
+    )
+    p_book_ids = sa.cast(
+        sa.bindparam("book_ids", type_=ARRAY(books.c.book_id.type)),
+        ARRAY(books.c.book_id.type),
+    )
+    p_name = sa.cast(
+        sa.bindparam("name", type_=authors.c.name.type),
+        authors.c.name.type,
+    )
+
+    clean = (
+        sa.select(books.c.book_id, books.c.title)
+        .where(books.c.book_id == sa.any_(p_book_ids))
+        .cte("clean")
+    )
+
+    new_author = (  # noqa: ECE001
+        pg_insert(authors)
+        .from_select(
+            [authors.c.author_id, authors.c.name],
+            sa.select(p_author_id, p_name).where(sa.exists(clean.select())),
+        )
+        .on_conflict_do_nothing(index_elements=[authors.c.name])
+        .returning(authors.c.author_id, authors.c.name)
+        .cte("new_author")
+    )
+
+    linked = (  # noqa: ECE001
+        sa.insert(m2m)
+        .from_select(
+            [m2m.c.author_id, m2m.c.book_id],
+            sa.select(new_author.c.author_id, clean.c.book_id).select_from(
+                new_author.join(clean, sa.true())
+            ),
+        )
+        .returning(m2m.c.author_id, m2m.c.book_id)
+        .cte("linked")
+    )
+
+    stmt = (  # noqa: ECE001
+        sa.select(
+            new_author.c.author_id,
+            new_author.c.name,
+            sa.func.array_agg(
+                aggregate_order_by(
+                    clean.c.book_id,
+                    clean.c.title.asc(),
+                ),
+            ).label("book_ids"),
+        )
+        .select_from(new_author)
+        .join(linked, linked.c.author_id == new_author.c.author_id)
+        .join(clean, clean.c.book_id == linked.c.book_id)
+        .group_by(new_author.c.author_id, new_author.c.name)
+    )
+
+    return stmt
+
+
+def build_author_update_sql(*, rename: bool) -> sa.Select:
+    """
+    Builds one statement which renames the author (with `rename` only),
+    makes its books exactly the given ones touching only changed links,
+    and returns the updated author with aggregated book ids.
+
+    Parameters:
+        author_id,
+        book_ids: the distinct new book ids, which must exist,
+        name: the new name, with `rename` only.
+
+    No row is returned if the author is missing.
+    """
+
+    authors = table_authors
+    books = table_books
+    m2m = table_books_authors
+
+    p_author_id = sa.cast(
+        sa.bindparam("author_id", type_=authors.c.author_id.type),
+        authors.c.author_id.type,
+    )
+    p_book_ids = sa.cast(
+        sa.bindparam("book_ids", type_=ARRAY(books.c.book_id.type)),
+        ARRAY(books.c.book_id.type),
+    )
+
+    target: sa.CTE
+    if rename:
+        target = (  # noqa: ECE001
+            sa.update(authors)
+            .where(authors.c.author_id == p_author_id)
+            .values({authors.c.name: sa.bindparam("name")})
+            .returning(authors.c.author_id, authors.c.name)
+            .cte("target")
+        )
+    else:
+        target = (
+            sa.select(authors.c.author_id, authors.c.name)
+            .where(authors.c.author_id == p_author_id)
+            .cte("target")
+        )
+
+    unlinked = (  # noqa: ECE001
+        sa.delete(m2m)
+        .where(
+            m2m.c.author_id == p_author_id,
+            m2m.c.book_id != sa.all_(p_book_ids),
+        )
+        .returning(m2m.c.book_id)
+        .cte("unlinked")
+    )
+
+    kept = sa.select(m2m.c.book_id).where(
+        m2m.c.author_id == p_author_id,
+        m2m.c.book_id == sa.any_(p_book_ids),
+    )
+
+    linked = (  # noqa: ECE001
+        sa.insert(m2m)
+        .from_select(
+            [m2m.c.author_id, m2m.c.book_id],
+            sa.select(p_author_id, books.c.book_id).where(
+                books.c.book_id == sa.any_(p_book_ids),
+                books.c.book_id.not_in(kept),
+            ),
+        )
+        .returning(m2m.c.book_id)
+        .cte("linked")
+    )
+
+    relations = sa.union_all(kept, sa.select(linked.c.book_id)).subquery(
+        "relations"
+    )
+
+    stmt = (  # noqa: ECE001
+        sa.select(
+            target.c.author_id,
+            target.c.name,
+            sa.func.array_agg(
+                aggregate_order_by(
+                    books.c.book_id,
+                    books.c.title.asc(),
+                ),
+            ).label("book_ids"),
+        )
+        .add_cte(unlinked)
+        .select_from(target)
+        .join(relations, sa.true())
+        .join(books, books.c.book_id == relations.c.book_id)
+        .group_by(target.c.author_id, target.c.name)
+    )
+
+    return stmt
+
+
+def build_book_delete_sql() -> sa.Select:
+    """
+    Builds one statement which deletes a book with its links
+    only if none of its authors is left without books.
+
+    Parameters:
+        book_id.
+
+    Always returns one row with the result of the check:
+        degenerate_authors: {name: author_id} of the authors
+            which would be left without books, or NULL.
+    A missing book is not an error: nothing is deleted.
+    """
+
+    authors = table_authors
+    books = table_books
+    m2m = table_books_authors
+    others = m2m.alias("others")
+
+    p_book_id = sa.bindparam("book_id", type_=books.c.book_id.type)
+
+    degenerate = (  # noqa: ECE001
+        sa.select(authors.c.author_id, authors.c.name)
+        .join(m2m, m2m.c.author_id == authors.c.author_id)
+        .where(
+            m2m.c.book_id == p_book_id,
+            ~sa.exists().where(
+                others.c.author_id == authors.c.author_id,
+                others.c.book_id != p_book_id,
+            ),
+        )
+        .cte("degenerate")
+    )
+
+    checks = sa.select(
+        sa.func.jsonb_object_agg(
+            degenerate.c.name,
+            degenerate.c.author_id,
+            type_=JSONB,
+        ).label("degenerate_authors"),
+    ).cte("checks")
+
+    passed = sa.exists().where(checks.c.degenerate_authors.is_(None))
+
+    unlinked = (  # noqa: ECE001
+        sa.delete(m2m)
+        .where(m2m.c.book_id == p_book_id, passed)
+        .returning(m2m.c.book_id)
+        .cte("unlinked")
+    )
+
+    deleted = (  # noqa: ECE001
+        sa.delete(books)
+        .where(books.c.book_id == p_book_id, passed)
+        .returning(books.c.book_id)
+        .cte("deleted")
+    )
+
+    stmt = (
+        sa.select(checks.c.degenerate_authors)
+        .add_cte(unlinked)
+        .add_cte(deleted)
+    )
+
+    return stmt
+
+
+def build_book_update_sql(*, retitle: bool) -> sa.Select:
+    """
+    Builds one statement which checks the update of a book
+    and applies it only if all the checks pass.
+
+    Parameters:
+        book_id,
+        author_ids: the distinct new author ids,
+        relink: whether the authors must become exactly author_ids,
+        title: the new title, with `retitle` only.
+
+    Always returns one row with the results of the checks:
+        book_exists,
+        degenerate_authors: {name: author_id} of the authors
+            which would be left without books, or NULL,
+        found_author_ids: which of author_ids exist,
+        title_taken.
+    The row also holds the updated book if the update is applied.
+    """
+
+    authors = table_authors
+    books = table_books
+    m2m = table_books_authors
+    others = m2m.alias("others")
+
+    p_author_ids = sa.cast(
+        sa.bindparam("author_ids", type_=ARRAY(authors.c.author_id.type)),
+        ARRAY(authors.c.author_id.type),
+    )
+    p_book_id = sa.bindparam("book_id", type_=books.c.book_id.type)
+    p_relink = sa.bindparam("relink", type_=sa.Boolean())
+
+    wanted = (
+        sa.select(authors.c.author_id)
+        .where(authors.c.author_id == sa.any_(p_author_ids))
+        .cte("wanted")
+    )
+
+    discarded = (  # noqa: ECE001
+        sa.select(m2m.c.author_id)
+        .where(
+            p_relink,
+            m2m.c.book_id == p_book_id,
+            m2m.c.author_id != sa.all_(p_author_ids),
+        )
+        .cte("discarded")
+    )
+
+    degenerate = (  # noqa: ECE001
+        sa.select(authors.c.author_id, authors.c.name)
+        .where(
+            authors.c.author_id.in_(sa.select(discarded.c.author_id)),
+            ~sa.exists().where(
+                others.c.author_id == authors.c.author_id,
+                others.c.book_id != p_book_id,
+            ),
+        )
+        .cte("degenerate")
+    )
+
+    title_taken: sa.ColumnElement[bool] = sa.false()
+    if retitle:
+        title_taken = sa.exists().where(
+            books.c.title == sa.bindparam("title", type_=books.c.title.type),
+            books.c.book_id != p_book_id,
+        )
+
+    checks = sa.select(  # noqa: ECE001
+        sa.exists().where(books.c.book_id == p_book_id).label("book_exists"),
+        sa.select(
+            sa.func.jsonb_object_agg(
+                degenerate.c.name,
+                degenerate.c.author_id,
+                type_=JSONB,
+            ),
+        )
+        .scalar_subquery()
+        .label("degenerate_authors"),
+        sa.func.array(sa.select(wanted.c.author_id).scalar_subquery()).label(
+            "found_author_ids"
+        ),
+        title_taken.label("title_taken"),
+    ).cte("checks")
+
+    passed = sa.exists().where(
+        checks.c.book_exists,
+        checks.c.degenerate_authors.is_(None),
+        sa.func.cardinality(checks.c.found_author_ids)
+        == sa.func.cardinality(p_author_ids),
+        ~checks.c.title_taken,
+    )
+
+    target: sa.CTE
+    if retitle:
+        target = (  # noqa: ECE001
+            sa.update(books)
+            .where(books.c.book_id == p_book_id, passed)
+            .values({books.c.title: sa.bindparam("title")})
+            .returning(books.c.book_id, books.c.title)
+            .cte("target")
+        )
+    else:
+        target = (
+            sa.select(books.c.book_id, books.c.title)
+            .where(books.c.book_id == p_book_id, passed)
+            .cte("target")
+        )
+
+    unlinked = (  # noqa: ECE001
+        sa.delete(m2m)
+        .where(
+            m2m.c.book_id.in_(sa.select(target.c.book_id)),
+            m2m.c.author_id.in_(sa.select(discarded.c.author_id)),
+        )
+        .returning(m2m.c.author_id)
+        .cte("unlinked")
+    )
+
+    kept = sa.select(m2m.c.author_id).where(
+        m2m.c.book_id.in_(sa.select(target.c.book_id)),
+        m2m.c.author_id.not_in(sa.select(discarded.c.author_id)),
+    )
+
+    linked = (  # noqa: ECE001
+        sa.insert(m2m)
+        .from_select(
+            [m2m.c.author_id, m2m.c.book_id],
+            sa.select(wanted.c.author_id, target.c.book_id)
+            .select_from(wanted.join(target, sa.true()))
+            .where(p_relink, wanted.c.author_id.not_in(kept)),
+        )
+        .returning(m2m.c.author_id)
+        .cte("linked")
+    )
+
+    relations = sa.union_all(
+        kept,
+        sa.select(linked.c.author_id),
+    ).subquery("relations")
+
+    stmt = (  # noqa: ECE001
+        sa.select(
+            checks.c.book_exists,
+            checks.c.degenerate_authors,
+            checks.c.found_author_ids,
+            checks.c.title_taken,
+            target.c.book_id,
+            target.c.title,
+            sa.func.coalesce(
+                sa.func.array_agg(
+                    aggregate_order_by(
+                        authors.c.author_id,
+                        authors.c.name.asc(),
+                    ),
+                ).filter(
+                    ~authors.c.author_id.is_(None),
+                ),
+                [],
+            ).label("author_ids"),
+        )
+        .add_cte(unlinked)
+        .select_from(checks)
+        .outerjoin(target, sa.true())
+        .outerjoin(relations, ~target.c.book_id.is_(None))
+        .outerjoin(authors, authors.c.author_id == relations.c.author_id)
+        .group_by(
+            checks.c.book_exists,
+            checks.c.degenerate_authors,
+            checks.c.found_author_ids,
+            checks.c.title_taken,
+            target.c.book_id,
+            target.c.title,
+        )
+    )
+
+    return stmt
+
+
+author_reads: Final = AuthorReads.build(build_authors_sql())
+
+author_reads_denormalized: Final = AuthorReads.build(
+    build_authors_denormalized_sql()
+)
+
+book_reads: Final = BookReads.build(build_books_sql())
+
+book_reads_denormalized: Final = BookReads.build(
+    build_books_denormalized_sql()
+)
+
+sql_author_create: Final = build_author_create_sql()
+
+sql_author_rename: Final = build_author_update_sql(rename=True)
+
+sql_author_update: Final = build_author_update_sql(rename=False)
+
+sql_book_delete: Final = build_book_delete_sql()
+
+sql_book_retitle: Final = build_book_update_sql(retitle=True)
+
+sql_book_update: Final = build_book_update_sql(retitle=False)
+
+
+__all__ = (
+    "AuthorReads",
+    "BookReads",
+    "author_reads",
+    "author_reads_denormalized",
+    "book_reads",
+    "book_reads_denormalized",
+    "build_author_create_sql",
+    "build_author_update_sql",
+    "build_authors_denormalized_sql",
+    "build_authors_sql",
+    "build_book_delete_sql",
+    "build_book_update_sql",
+    "build_books_denormalized_sql",
+    "build_books_sql",
+    "sql_author_create",
+    "sql_author_rename",
+    "sql_author_update",
+    "sql_book_delete",
+    "sql_book_retitle",
+    "sql_book_update",
+)
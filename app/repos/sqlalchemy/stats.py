@@ -0,0 +1,76 @@
+import threading
+from typing import Any
+from typing import Self
+from typing import final
+
+import attrs
+import sqlalchemy as sa
+from sqlalchemy import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.engine.interfaces import DBAPICursor
+from sqlalchemy.engine.interfaces import ExecutionContext
+
+
+@final
+@attrs.define(kw_only=True, slots=True)
+class StatementCacheStats:
+    """
+    Counts how the compiled cache of an engine serves executed statements.
+
+    hits: the compiled form is taken from the cache,
+    misses: the statement is compiled and put into the cache,
+    uncached: the statement is compiled on every execution
+    (driver-level SQL, DDL, or a statement without a cache key).
+    """
+
+    engine: Engine
+    hits: int = 0
+    lock: threading.Lock = attrs.field(factory=threading.Lock)
+    misses: int = 0
+    uncached: int = 0
+
+    @classmethod
+    def watch(cls, engine: Engine, /) -> Self:
+        """
+        Starts counting the statements executed by the engine.
+        """
+
+        stats = cls(engine=engine)
+        sa.event.listen(engine, "after_cursor_execute", stats._on_execute)
+        return stats
+
+    @property
+    def hit_ratio(self, /) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset(self, /) -> None:
+        with self.lock:
+            self.hits = self.misses = self.uncached = 0
+
+    def unwatch(self, /) -> None:
+        sa.event.remove(self.engine, "after_cursor_execute", self._on_execute)
+
+    def _on_execute(
+        self,
+        conn: sa.Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+        /,
+    ) -> None:
+        cache_hit = getattr(context, "cache_hit", None)
+
+        with self.lock:
+            match cache_hit:
+                case CacheStats.CACHE_HIT:
+                    self.hits += 1
+                case CacheStats.CACHE_MISS:
+                    self.misses += 1
+                case _:
+                    self.uncached += 1
+
+
+__all__ = ("StatementCacheStats",)
@@ -1,6 +1,7 @@
 from typing import Final
 
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
 
 metadata: Final = sa.MetaData()
 
@@ -12,6 +13,13 @@ table_authors: Final = sa.Table(
         sa.Uuid(as_uuid=True),
         primary_key=True,
     ),
+    sa.Column(
+        # denormalized, kept sorted by titles by triggers
+        "book_ids",
+        ARRAY(sa.Uuid(as_uuid=True)),
+        nullable=False,
+        server_default="{}",
+    ),
     sa.Column(
         "name",
         sa.Text(),
@@ -24,6 +32,13 @@ table_authors: Final = sa.Table(
 table_books: Final = sa.Table(
     "books",
     metadata,
+    sa.Column(
+        # denormalized, kept sorted by names by triggers
+        "author_ids",
+        ARRAY(sa.Uuid(as_uuid=True)),
+        nullable=False,
+        server_default="{}",
+    ),
     sa.Column(
         "book_id",
         sa.Uuid(as_uuid=True),
@@ -62,6 +77,16 @@ table_books_authors: Final = sa.Table(
         autoincrement=True,
         primary_key=True,
     ),
+    sa.UniqueConstraint(
+        "book_id",
+        "author_id",
+    ),
+    sa.Index(
+        "books_authors_author_id_book_id_uniq",
+        "author_id",
+        "book_id",
+        unique=True,
+    ),
 )
 
 
@@ -0,0 +1,7 @@
+"""
+This package contains async SqlAlchemy-based repos.
+
+They run the queries of the SqlAlchemy-based repos on an async engine:
+every wait for the database suspends the caller on the event loop,
+so concurrent calls overlap their waits in one process.
+"""
@@ -0,0 +1,162 @@
+from typing import AsyncIterator
+from typing import Collection
+from typing import final
+
+import attrs
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.util import greenlet_spawn
+
+from app.entities.models import ID
+from app.entities.models import Author
+from app.entities.models import AuthorPatch
+from app.entities.models import NewAuthor
+from app.repos.replicas import ReplicaSet
+from app.repos.rows import author_from_row
+from app.repos.sqlalchemy.author import AuthorRepo as SyncAuthorRepo
+from app.repos.sqlalchemy.statements import author_reads
+from app.repos.sqlalchemy.statements import author_reads_denormalized
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AuthorRepo:
+    """
+    Runs the sync repo in a greenlet bound to the async engine:
+    the queries, transactions and errors are exactly the same.
+    Reads go through the replicas as the sync repo routes them,
+    see `build_async_replicas`.
+    """
+
+    denormalized: bool = False
+    engine: AsyncEngine
+    replicas: ReplicaSet[Engine] | None = None
+    sync_repo: SyncAuthorRepo = attrs.field(init=False)
+    validate_rows: bool = False
+
+    @sync_repo.default
+    def _build_sync_repo(self) -> SyncAuthorRepo:
+        return SyncAuthorRepo(
+            denormalized=self.denormalized,
+            engine=self.engine.sync_engine,
+            replicas=self.replicas,
+            validate_rows=self.validate_rows,
+        )
+
+    async def create(
+        self,
+        /,
+        *,
+        book_ids: Collection[ID],
+        name: str,
+    ) -> Author:
+        author = await greenlet_spawn(
+            self.sync_repo.create,
+            book_ids=book_ids,
+            name=name,
+        )
+        return author
+
+    async def create_many(
+        self,
+        new_authors: Collection[NewAuthor],
+        /,
+    ) -> list[Author]:
+        authors = await greenlet_spawn(self.sync_repo.create_many, new_authors)
+        return authors
+
+    async def delete(self, author_id: ID, /) -> None:
+        await greenlet_spawn(self.sync_repo.delete, author_id)
+
+    async def get_all(self, /) -> list[Author]:
+        authors = await greenlet_spawn(self.sync_repo.get_all)
+        return authors
+
+    async def get_by_id(self, author_id: ID, /) -> Author | None:
+        author = await greenlet_spawn(self.sync_repo.get_by_id, author_id)
+        return author
+
+    async def get_by_name(self, name: str, /) -> Author | None:
+        author = await greenlet_spawn(self.sync_repo.get_by_name, name)
+        return author
+
+    async def get_many_by_ids(
+        self,
+        author_ids: Collection[ID],
+        /,
+    ) -> list[Author | None]:
+        authors = await greenlet_spawn(
+            self.sync_repo.get_many_by_ids, author_ids
+        )
+        return authors
+
+    async def iter_all(
+        self,
+        /,
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Author]:
+        """
+        Yields all authors streamed through a server-side cursor,
+        so at most `batch_size` rows are held in memory at once.
+        The connection is held until the generator is exhausted or closed.
+        """
+
+        sql = author_reads.every
+        if self.denormalized:
+            sql = author_reads_denormalized.every
+
+        conn: AsyncConnection
+        async with self._read_engine().begin() as conn:
+            cursor = await conn.stream(
+                sql,
+                execution_options={"yield_per": batch_size},
+            )
+            async for row in cursor:
+                yield author_from_row(row, validate=self.validate_rows)
+
+    async def page(
+        self,
+        /,
+        *,
+        after: Author | None = None,
+        limit: int,
+    ) -> list[Author]:
+        authors = await greenlet_spawn(
+            self.sync_repo.page,
+            after=after,
+            limit=limit,
+        )
+        return authors
+
+    async def update(
+        self,
+        author_id: ID,
+        /,
+        *,
+        book_ids: Collection[ID] | None = None,
+        name: str | None = None,
+    ) -> Author:
+        author = await greenlet_spawn(
+            self.sync_repo.update,
+            author_id,
+            book_ids=book_ids,
+            name=name,
+        )
+        return author
+
+    async def update_many(
+        self,
+        patches: Collection[AuthorPatch],
+        /,
+    ) -> list[Author]:
+        authors = await greenlet_spawn(self.sync_repo.update_many, patches)
+        return authors
+
+    def _read_engine(self, /) -> AsyncEngine:
+        engine = self.replicas.pick() if self.replicas else None
+        return self.engine if engine is None else AsyncEngine(engine)
+
+
+__all__ = ("AuthorRepo",)
@@ -0,0 +1,150 @@
+from typing import AsyncIterator
+from typing import Collection
+from typing import final
+
+import attrs
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.util import greenlet_spawn
+
+from app.entities.models import ID
+from app.entities.models import Book
+from app.entities.models import BookPatch
+from app.entities.models import NewBook
+from app.repos.replicas import ReplicaSet
+from app.repos.rows import book_from_row
+from app.repos.sqlalchemy.book import BookRepo as SyncBookRepo
+from app.repos.sqlalchemy.statements import book_reads
+from app.repos.sqlalchemy.statements import book_reads_denormalized
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class BookRepo:
+    """
+    Runs the sync repo in a greenlet bound to the async engine:
+    the queries, transactions and errors are exactly the same.
+    Reads go through the replicas as the sync repo routes them,
+    see `build_async_replicas`.
+    """
+
+    denormalized: bool = False
+    engine: AsyncEngine
+    replicas: ReplicaSet[Engine] | None = None
+    sync_repo: SyncBookRepo = attrs.field(init=False)
+    validate_rows: bool = False
+
+    @sync_repo.default
+    def _build_sync_repo(self) -> SyncBookRepo:
+        return SyncBookRepo(
+            denormalized=self.denormalized,
+            engine=self.engine.sync_engine,
+            replicas=self.replicas,
+            validate_rows=self.validate_rows,
+        )
+
+    async def create(self, /, *, title: str) -> Book:
+        book = await greenlet_spawn(self.sync_repo.create, title=title)
+        return book
+
+    async def create_many(
+        self,
+        new_books: Collection[NewBook],
+        /,
+    ) -> list[Book]:
+        books = await greenlet_spawn(self.sync_repo.create_many, new_books)
+        return books
+
+    async def delete(self, book_id: ID, /) -> None:
+        await greenlet_spawn(self.sync_repo.delete, book_id)
+
+    async def get_all(self, /) -> list[Book]:
+        books = await greenlet_spawn(self.sync_repo.get_all)
+        return books
+
+    async def get_by_id(self, book_id: ID, /) -> Book | None:
+        book = await greenlet_spawn(self.sync_repo.get_by_id, book_id)
+        return book
+
+    async def get_by_title(self, title: str, /) -> Book | None:
+        book = await greenlet_spawn(self.sync_repo.get_by_title, title)
+        return book
+
+    async def get_many_by_ids(
+        self,
+        book_ids: Collection[ID],
+        /,
+    ) -> list[Book | None]:
+        books = await greenlet_spawn(self.sync_repo.get_many_by_ids, book_ids)
+        return books
+
+    async def iter_all(
+        self,
+        /,
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Book]:
+        """
+        Yields all books streamed through a server-side cursor,
+        so at most `batch_size` rows are held in memory at once.
+        The connection is held until the generator is exhausted or closed.
+        """
+
+        sql = book_reads.every
+        if self.denormalized:
+            sql = book_reads_denormalized.every
+
+        conn: AsyncConnection
+        async with self._read_engine().begin() as conn:
+            cursor = await conn.stream(
+                sql,
+                execution_options={"yield_per": batch_size},
+            )
+            async for row in cursor:
+                yield book_from_row(row, validate=self.validate_rows)
+
+    async def page(
+        self,
+        /,
+        *,
+        after: Book | None = None,
+        limit: int,
+    ) -> list[Book]:
+        books = await greenlet_spawn(
+            self.sync_repo.page,
+            after=after,
+            limit=limit,
+        )
+        return books
+
+    async def update(
+        self,
+        book_id: ID,
+        /,
+        *,
+        author_ids: Collection[ID] | None = None,
+        title: str | None = None,
+    ) -> Book:
+        book = await greenlet_spawn(
+            self.sync_repo.update,
+            book_id,
+            author_ids=author_ids,
+            title=title,
+        )
+        return book
+
+    async def update_many(
+        self,
+        patches: Collection[BookPatch],
+        /,
+    ) -> list[Book]:
+        books = await greenlet_spawn(self.sync_repo.update_many, patches)
+        return books
+
+    def _read_engine(self, /) -> AsyncEngine:
+        engine = self.replicas.pick() if self.replicas else None
+        return self.engine if engine is None else AsyncEngine(engine)
+
+
+__all__ = ("BookRepo",)
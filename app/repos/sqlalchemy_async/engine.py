@@ -0,0 +1,60 @@
+from functools import partial
+
+import sqlalchemy as sa
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.entities.config import Config
+from app.repos.replicas import Replica
+from app.repos.replicas import ReplicaSet
+from app.repos.sqlalchemy.engine import build_engine
+from app.repos.sqlalchemy.engine import probe_lag
+
+
+def build_async_engine(url: str, /, *, config: Config) -> AsyncEngine:
+    """
+    Builds the engine for the database at the url, driven by asyncpg,
+    with the pool configured by the config.
+    """
+
+    engine = create_async_engine(
+        sa.make_url(url).set(drivername="postgresql+asyncpg"),
+        echo=config.MODE_DEBUG,
+        max_overflow=config.DATABASE_POOL_MAX_OVERFLOW,
+        pool_pre_ping=config.DATABASE_POOL_PRE_PING,
+        pool_recycle=config.DATABASE_POOL_RECYCLE,
+        pool_size=config.DATABASE_POOL_SIZE,
+        pool_timeout=config.DATABASE_POOL_TIMEOUT,
+    )
+
+    return engine
+
+
+def build_async_replicas(config: Config, /) -> ReplicaSet[Engine]:
+    """
+    Builds the async engines for the replicas listed in the config.
+
+    The targets are the sync faces of the async engines,
+    which the async repos run their sync repos on.
+    The lag is probed through a sync engine, so a probe needs no event loop.
+    """
+
+    replicas = ReplicaSet(
+        max_staleness=config.REPLICA_MAX_STALENESS,
+        replicas=[
+            Replica(
+                probe=partial(probe_lag, build_engine(url, config=config)),
+                target=build_async_engine(url, config=config).sync_engine,
+            )
+            for url in config.REPLICA_DATABASE_URLS
+        ],
+    )
+
+    return replicas
+
+
+__all__ = (
+    "build_async_engine",
+    "build_async_replicas",
+)
@@ -0,0 +1,116 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities.errors import LostAuthorsError
+from app.entities.interfaces import AsyncAuthorRepo
+from app.entities.models import ID
+from app.entities.models import Author
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AsyncCreateAuthorUseCase:
+    """
+    Use Case: Create an author, asynchronously.
+    """
+
+    repo: AsyncAuthorRepo
+
+    async def __call__(
+        self,
+        /,
+        *,
+        book_ids: Collection[ID],
+        name: str,
+    ) -> Author:
+        author = await self.repo.create(book_ids=book_ids, name=name)
+        return author
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AsyncDeleteAuthorUseCase:
+    """
+    Use Case: Delete an author, asynchronously.
+    """
+
+    repo: AsyncAuthorRepo
+
+    async def __call__(self, author_id: ID, /) -> None:
+        await self.repo.delete(author_id)
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AsyncFindAuthorsUseCase:
+    """
+    Use Case: Find authors by attributes, asynchronously.
+    Authors found by IDs follow the order of the IDs,
+    the missing ones are reported with `LostAuthorsError`.
+    """
+
+    repo: AsyncAuthorRepo
+
+    async def __call__(
+        self,
+        /,
+        *,
+        author_id: ID | None = None,
+        author_ids: Collection[ID] | None = None,
+        name: str | None = None,
+    ) -> list[Author]:
+        authors: list[Author] = []
+
+        if all(arg is None for arg in (author_id, author_ids, name)):
+            authors.extend(await self.repo.get_all())
+        elif author_id is not None:
+            author = await self.repo.get_by_id(author_id)
+            if author:
+                authors.append(author)
+        elif author_ids is not None:
+            found = await self.repo.get_many_by_ids(author_ids)
+            lost_author_ids = [
+                i for i, author in zip(author_ids, found) if author is None
+            ]
+            if lost_author_ids:
+                raise LostAuthorsError(author_ids=lost_author_ids)
+            authors.extend(filter(None, found))
+        elif name is not None:
+            author = await self.repo.get_by_name(name)
+            if author:
+                authors.append(author)
+
+        return authors
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AsyncUpdateAuthorUseCase:
+    """
+    Use Case: Update an author, asynchronously.
+    """
+
+    repo: AsyncAuthorRepo
+
+    async def __call__(
+        self,
+        author_id: ID,
+        /,
+        *,
+        book_ids: Collection[ID] | None = None,
+        name: str | None = None,
+    ) -> Author:
+        author = await self.repo.update(
+            author_id, book_ids=book_ids, name=name
+        )
+        return author
+
+
+__all__ = (
+    "AsyncCreateAuthorUseCase",
+    "AsyncDeleteAuthorUseCase",
+    "AsyncFindAuthorsUseCase",
+    "AsyncUpdateAuthorUseCase",
+)
@@ -0,0 +1,110 @@
+from typing import Collection
+from typing import final
+
+import attrs
+
+from app.entities.errors import LostBooksError
+from app.entities.interfaces import AsyncBookRepo
+from app.entities.models import ID
+from app.entities.models import Book
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AsyncCreateBookUseCase:
+    """
+    Use Case: Create a book, asynchronously.
+    """
+
+    repo: AsyncBookRepo
+
+    async def __call__(self, /, *, title: str) -> Book:
+        book = await self.repo.create(title=title)
+        return book
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AsyncDeleteBookUseCase:
+    """
+    Use Case: Delete a book, asynchronously.
+    """
+
+    repo: AsyncBookRepo
+
+    async def __call__(self, book_id: ID, /) -> None:
+        await self.repo.delete(book_id)
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AsyncFindBooksUseCase:
+    """
+    Use Case: Find books by attributes, asynchronously.
+    Books found by IDs follow the order of the IDs,
+    the missing ones are reported with `LostBooksError`.
+    """
+
+    repo: AsyncBookRepo
+
+    async def __call__(
+        self,
+        /,
+        *,
+        book_id: ID | None = None,
+        book_ids: Collection[ID] | None = None,
+        title: str | None = None,
+    ) -> list[Book]:
+        books: list[Book] = []
+
+        if all(arg is None for arg in (book_id, book_ids, title)):
+            books.extend(await self.repo.get_all())
+        elif book_id is not None:
+            book = await self.repo.get_by_id(book_id)
+            if book:
+                books.append(book)
+        elif book_ids is not None:
+            found = await self.repo.get_many_by_ids(book_ids)
+            lost_book_ids = [
+                i for i, book in zip(book_ids, found) if book is None
+            ]
+            if lost_book_ids:
+                raise LostBooksError(book_ids=lost_book_ids)
+            books.extend(filter(None, found))
+        elif title is not None:
+            book = await self.repo.get_by_title(title)
+            if book:
+                books.append(book)
+
+        return books
+
+
+@final
+@attrs.frozen(kw_only=True, slots=True)
+class AsyncUpdateBookUseCase:
+    """
+    Use Case: Update a book, asynchronously.
+    """
+
+    repo: AsyncBookRepo
+
+    async def __call__(
+        self,
+        book_id: ID,
+        /,
+        *,
+        author_ids: Collection[ID] | None = None,
+        title: str | None = None,
+    ) -> Book:
+        book = await self.repo.update(
+            book_id, author_ids=author_ids, title=title
+        )
+        return book
+
+
+__all__ = (
+    "AsyncCreateBookUseCase",
+    "AsyncDeleteBookUseCase",
+    "AsyncFindBooksUseCase",
+    "AsyncUpdateBookUseCase",
+)
@@ -3,6 +3,7 @@ from typing import final
 
 import attrs
 
+from app.entities.errors import LostAuthorsError
 from app.entities.interfaces import AuthorRepo
 from app.entities.models import ID
 from app.entities.models import Author
@@ -40,6 +41,8 @@ class DeleteAuthorUseCase:
 class FindAuthorsUseCase:
     """
     Use case: Find authors by attributes.
+    Authors found by IDs follow the order of the IDs,
+    the missing ones are reported with `LostAuthorsError`.
     """
 
     repo: AuthorRepo
@@ -49,16 +52,25 @@ class FindAuthorsUseCase:
         /,
         *,
         author_id: ID | None = None,
+        author_ids: Collection[ID] | None = None,
         name: str | None = None,
     ) -> list[Author]:
         authors: list[Author] = []
 
-        if all(arg is None for arg in (author_id, name)):
+        if all(arg is None for arg in (author_id, author_ids, name)):
             authors.extend(self.repo.get_all())
         elif author_id is not None:
             author = self.repo.get_by_id(author_id)
             if author:
                 authors.append(author)
+        elif author_ids is not None:
+            found = self.repo.get_many_by_ids(author_ids)
+            lost_author_ids = [
+                i for i, author in zip(author_ids, found) if author is None
+            ]
+            if lost_author_ids:
+                raise LostAuthorsError(author_ids=lost_author_ids)
+            authors.extend(filter(None, found))
         elif name is not None:
             author = self.repo.get_by_name(name)
             if author:
@@ -3,6 +3,7 @@ from typing import final
 
 import attrs
 
+from app.entities.errors import LostBooksError
 from app.entities.interfaces import BookRepo
 from app.entities.models import ID
 from app.entities.models import Book
@@ -40,6 +41,8 @@ class DeleteBookUseCase:
 class FindBooksUseCase:
     """
     Use case: Find books by attributes.
+    Books found by IDs follow the order of the IDs,
+    the missing ones are reported with `LostBooksError`.
     """
 
     repo: BookRepo
@@ -49,16 +52,25 @@ class FindBooksUseCase:
         /,
         *,
         book_id: ID | None = None,
+        book_ids: Collection[ID] | None = None,
         title: str | None = None,
     ) -> list[Book]:
         books: list[Book] = []
 
-        if all(arg is None for arg in (book_id, title)):
+        if all(arg is None for arg in (book_id, book_ids, title)):
             books.extend(self.repo.get_all())
         elif book_id is not None:
             book = self.repo.get_by_id(book_id)
             if book:
                 books.append(book)
+        elif book_ids is not None:
+            found = self.repo.get_many_by_ids(book_ids)
+            lost_book_ids = [
+                i for i, book in zip(book_ids, found) if book is None
+            ]
+            if lost_book_ids:
+                raise LostBooksError(book_ids=lost_book_ids)
+            books.extend(filter(None, found))
         elif title is not None:
             book = self.repo.get_by_title(title)
             if book:
@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    The auto-created M2M table already has a unique (book_id, author_id)
+    index, which serves lookups by book. This adds the reverse one
+    for lookups by author. The index is built concurrently,
+    so the table stays writable: hence the migration is not atomic.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("app_api_v3", "0003_alter_book_title"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=(
+                "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS"
+                " books_authors_author_id_book_id_uniq"
+                " ON books_authors (author_id, book_id);"
+            ),
+            reverse_sql=(
+                "DROP INDEX CONCURRENTLY IF EXISTS"
+                " books_authors_author_id_book_id_uniq;"
+            ),
+        ),
+    ]
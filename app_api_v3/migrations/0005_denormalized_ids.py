@@ -0,0 +1,170 @@
+from django.db import migrations
+
+# Denormalized ids: authors.book_ids and books.author_ids.
+# They are kept in the order of the aggregated reads
+# (books by title, authors by name) by triggers on links and renames.
+# Link triggers are per statement: a bulk relink refreshes each
+# touched row once. Unchanged arrays are not rewritten.
+
+SQL_FORWARD = """
+ALTER TABLE authors
+    ADD COLUMN IF NOT EXISTS book_ids uuid[] NOT NULL DEFAULT '{}';
+
+ALTER TABLE books
+    ADD COLUMN IF NOT EXISTS author_ids uuid[] NOT NULL DEFAULT '{}';
+
+CREATE OR REPLACE FUNCTION refresh_authors_book_ids(ids uuid[])
+RETURNS void LANGUAGE sql AS $$
+    UPDATE authors AS a
+    SET book_ids = fresh.book_ids
+    FROM (
+        SELECT
+            x.author_id,
+            coalesce(
+                array_agg(b.book_id ORDER BY b.title)
+                    FILTER (WHERE b.book_id IS NOT NULL),
+                '{}'
+            ) AS book_ids
+        FROM (SELECT DISTINCT unnest(ids) AS author_id) AS x
+        LEFT JOIN books_authors AS m ON m.author_id = x.author_id
+        LEFT JOIN books AS b ON b.book_id = m.book_id
+        GROUP BY x.author_id
+    ) AS fresh
+    WHERE a.author_id = fresh.author_id
+        AND a.book_ids IS DISTINCT FROM fresh.book_ids;
+$$;
+
+CREATE OR REPLACE FUNCTION refresh_books_author_ids(ids uuid[])
+RETURNS void LANGUAGE sql AS $$
+    UPDATE books AS b
+    SET author_ids = fresh.author_ids
+    FROM (
+        SELECT
+            x.book_id,
+            coalesce(
+                array_agg(a.author_id ORDER BY a.name)
+                    FILTER (WHERE a.author_id IS NOT NULL),
+                '{}'
+            ) AS author_ids
+        FROM (SELECT DISTINCT unnest(ids) AS book_id) AS x
+        LEFT JOIN books_authors AS m ON m.book_id = x.book_id
+        LEFT JOIN authors AS a ON a.author_id = m.author_id
+        GROUP BY x.book_id
+    ) AS fresh
+    WHERE b.book_id = fresh.book_id
+        AND b.author_ids IS DISTINCT FROM fresh.author_ids;
+$$;
+
+CREATE OR REPLACE FUNCTION books_authors_refresh_ids()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed_author_ids uuid[];
+    changed_book_ids uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(author_id), array_agg(book_id)
+        INTO changed_author_ids, changed_book_ids
+        FROM new_links;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(author_id), array_agg(book_id)
+        INTO changed_author_ids, changed_book_ids
+        FROM old_links;
+    ELSE
+        SELECT array_agg(author_id), array_agg(book_id)
+        INTO changed_author_ids, changed_book_ids
+        FROM (
+            SELECT author_id, book_id FROM new_links
+            UNION ALL
+            SELECT author_id, book_id FROM old_links
+        ) AS links;
+    END IF;
+
+    PERFORM refresh_authors_book_ids(changed_author_ids);
+    PERFORM refresh_books_author_ids(changed_book_ids);
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION authors_refresh_ids()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM refresh_books_author_ids(
+        ARRAY(
+            SELECT book_id FROM books_authors
+            WHERE author_id = NEW.author_id
+        )
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION books_refresh_ids()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM refresh_authors_book_ids(
+        ARRAY(
+            SELECT author_id FROM books_authors
+            WHERE book_id = NEW.book_id
+        )
+    );
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER books_authors_inserted
+    AFTER INSERT ON books_authors
+    REFERENCING NEW TABLE AS new_links
+    FOR EACH STATEMENT EXECUTE FUNCTION books_authors_refresh_ids();
+
+CREATE TRIGGER books_authors_deleted
+    AFTER DELETE ON books_authors
+    REFERENCING OLD TABLE AS old_links
+    FOR EACH STATEMENT EXECUTE FUNCTION books_authors_refresh_ids();
+
+CREATE TRIGGER books_authors_updated
+    AFTER UPDATE ON books_authors
+    REFERENCING OLD TABLE AS old_links NEW TABLE AS new_links
+    FOR EACH STATEMENT EXECUTE FUNCTION books_authors_refresh_ids();
+
+CREATE TRIGGER authors_renamed
+    AFTER UPDATE OF name ON authors
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION authors_refresh_ids();
+
+CREATE TRIGGER books_retitled
+    AFTER UPDATE OF title ON books
+    FOR EACH ROW WHEN (OLD.title IS DISTINCT FROM NEW.title)
+    EXECUTE FUNCTION books_refresh_ids();
+
+SELECT refresh_authors_book_ids(ARRAY(SELECT author_id FROM authors));
+
+SELECT refresh_books_author_ids(ARRAY(SELECT book_id FROM books));
+"""
+
+SQL_REVERSE = """
+DROP TRIGGER IF EXISTS books_retitled ON books;
+DROP TRIGGER IF EXISTS authors_renamed ON authors;
+DROP TRIGGER IF EXISTS books_authors_updated ON books_authors;
+DROP TRIGGER IF EXISTS books_authors_deleted ON books_authors;
+DROP TRIGGER IF EXISTS books_authors_inserted ON books_authors;
+
+DROP FUNCTION IF EXISTS books_refresh_ids();
+DROP FUNCTION IF EXISTS authors_refresh_ids();
+DROP FUNCTION IF EXISTS books_authors_refresh_ids();
+DROP FUNCTION IF EXISTS refresh_books_author_ids(uuid[]);
+DROP FUNCTION IF EXISTS refresh_authors_book_ids(uuid[]);
+
+ALTER TABLE books DROP COLUMN IF EXISTS author_ids;
+ALTER TABLE authors DROP COLUMN IF EXISTS book_ids;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app_api_v1", "0002_alter_author_options"),
+        ("app_api_v3", "0004_books_authors_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=SQL_FORWARD, reverse_sql=SQL_REVERSE),
+    ]
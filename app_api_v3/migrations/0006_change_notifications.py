@@ -0,0 +1,185 @@
+from django.db import migrations
+
+# Change notifications: every statement which changes authors, books
+# or their links notifies the catalog_changes channel with the ids
+# of the changed entities, see app.repos.changes.
+# Notifications are delivered on commit and only if it happens.
+# A payload must fit 8000 bytes, so ids are sent in chunks.
+
+SQL_FORWARD = """
+CREATE OR REPLACE FUNCTION notify_catalog_changes(
+    author_ids uuid[],
+    book_ids uuid[]
+)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    chunk CONSTANT int := 80;
+    total int;
+BEGIN
+    author_ids := coalesce(author_ids, '{}');
+    book_ids := coalesce(book_ids, '{}');
+    total := greatest(cardinality(author_ids), cardinality(book_ids));
+
+    FOR head IN 1 .. total BY chunk LOOP
+        PERFORM pg_notify(
+            'catalog_changes',
+            json_build_object(
+                'author_ids', author_ids[head : head + chunk - 1],
+                'book_ids', book_ids[head : head + chunk - 1]
+            )::text
+        );
+    END LOOP;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION authors_notify_changes()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed_author_ids uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(author_id) INTO changed_author_ids
+        FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(author_id) INTO changed_author_ids
+        FROM old_rows;
+    ELSE
+        SELECT array_agg(author_id) INTO changed_author_ids
+        FROM (
+            SELECT author_id FROM new_rows
+            UNION
+            SELECT author_id FROM old_rows
+        ) AS changed_rows;
+    END IF;
+
+    PERFORM notify_catalog_changes(changed_author_ids, NULL);
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION books_notify_changes()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed_book_ids uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(book_id) INTO changed_book_ids
+        FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(book_id) INTO changed_book_ids
+        FROM old_rows;
+    ELSE
+        SELECT array_agg(book_id) INTO changed_book_ids
+        FROM (
+            SELECT book_id FROM new_rows
+            UNION
+            SELECT book_id FROM old_rows
+        ) AS changed_rows;
+    END IF;
+
+    PERFORM notify_catalog_changes(NULL, changed_book_ids);
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION books_authors_notify_changes()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    changed_author_ids uuid[];
+    changed_book_ids uuid[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT author_id), array_agg(DISTINCT book_id)
+        INTO changed_author_ids, changed_book_ids
+        FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT author_id), array_agg(DISTINCT book_id)
+        INTO changed_author_ids, changed_book_ids
+        FROM old_rows;
+    ELSE
+        SELECT array_agg(DISTINCT author_id), array_agg(DISTINCT book_id)
+        INTO changed_author_ids, changed_book_ids
+        FROM (
+            SELECT author_id, book_id FROM new_rows
+            UNION ALL
+            SELECT author_id, book_id FROM old_rows
+        ) AS changed_rows;
+    END IF;
+
+    PERFORM notify_catalog_changes(changed_author_ids, changed_book_ids);
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER authors_inserted_notify
+    AFTER INSERT ON authors
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION authors_notify_changes();
+
+CREATE TRIGGER authors_deleted_notify
+    AFTER DELETE ON authors
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION authors_notify_changes();
+
+CREATE TRIGGER authors_updated_notify
+    AFTER UPDATE ON authors
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION authors_notify_changes();
+
+CREATE TRIGGER books_inserted_notify
+    AFTER INSERT ON books
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION books_notify_changes();
+
+CREATE TRIGGER books_deleted_notify
+    AFTER DELETE ON books
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION books_notify_changes();
+
+CREATE TRIGGER books_updated_notify
+    AFTER UPDATE ON books
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION books_notify_changes();
+
+CREATE TRIGGER books_authors_inserted_notify
+    AFTER INSERT ON books_authors
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION books_authors_notify_changes();
+
+CREATE TRIGGER books_authors_deleted_notify
+    AFTER DELETE ON books_authors
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION books_authors_notify_changes();
+
+CREATE TRIGGER books_authors_updated_notify
+    AFTER UPDATE ON books_authors
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION books_authors_notify_changes();
+"""
+
+SQL_REVERSE = """
+DROP TRIGGER IF EXISTS books_authors_updated_notify ON books_authors;
+DROP TRIGGER IF EXISTS books_authors_deleted_notify ON books_authors;
+DROP TRIGGER IF EXISTS books_authors_inserted_notify ON books_authors;
+DROP TRIGGER IF EXISTS books_updated_notify ON books;
+DROP TRIGGER IF EXISTS books_deleted_notify ON books;
+DROP TRIGGER IF EXISTS books_inserted_notify ON books;
+DROP TRIGGER IF EXISTS authors_updated_notify ON authors;
+DROP TRIGGER IF EXISTS authors_deleted_notify ON authors;
+DROP TRIGGER IF EXISTS authors_inserted_notify ON authors;
+
+DROP FUNCTION IF EXISTS books_authors_notify_changes();
+DROP FUNCTION IF EXISTS books_notify_changes();
+DROP FUNCTION IF EXISTS authors_notify_changes();
+DROP FUNCTION IF EXISTS notify_catalog_changes(uuid[], uuid[]);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app_api_v3", "0005_denormalized_ids"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=SQL_FORWARD, reverse_sql=SQL_REVERSE),
+    ]
@@ -0,0 +1,128 @@
+from django.db import migrations
+
+# The refresh of the denormalized ids, see 0005, locks the rows to refresh
+# before it aggregates the links.
+#
+# Under READ COMMITTED one UPDATE ... FROM (aggregate) loses updates:
+# of two transactions which relink the same author, the second one
+# waits for the row lock of the first, then re-checks the row only
+# and writes the aggregate of the snapshot taken before the wait.
+# Now the rows are locked in the order of ids by one statement
+# and aggregated by the next one, which takes a fresh snapshot
+# and so sees the links committed by the transaction waited for.
+# FOR NO KEY UPDATE is the lock the UPDATE takes anyway:
+# it serializes refreshes but lets foreign key checks through.
+#
+# The triggers run on every write, whether the repos read
+# the denormalized ids or not: the arrays must be fresh
+# by the time the denormalized mode is switched on.
+# A link statement costs one locking select and one aggregate
+# over the links of the touched rows per side.
+
+SQL_FORWARD = """
+CREATE OR REPLACE FUNCTION refresh_authors_book_ids(ids uuid[])
+RETURNS void LANGUAGE sql AS $$
+    SELECT 1 FROM authors
+    WHERE author_id = ANY(ids)
+    ORDER BY author_id
+    FOR NO KEY UPDATE;
+
+    UPDATE authors AS a
+    SET book_ids = fresh.book_ids
+    FROM (
+        SELECT
+            x.author_id,
+            coalesce(
+                array_agg(b.book_id ORDER BY b.title)
+                    FILTER (WHERE b.book_id IS NOT NULL),
+                '{}'
+            ) AS book_ids
+        FROM (SELECT DISTINCT unnest(ids) AS author_id) AS x
+        LEFT JOIN books_authors AS m ON m.author_id = x.author_id
+        LEFT JOIN books AS b ON b.book_id = m.book_id
+        GROUP BY x.author_id
+    ) AS fresh
+    WHERE a.author_id = fresh.author_id
+        AND a.book_ids IS DISTINCT FROM fresh.book_ids;
+$$;
+
+CREATE OR REPLACE FUNCTION refresh_books_author_ids(ids uuid[])
+RETURNS void LANGUAGE sql AS $$
+    SELECT 1 FROM books
+    WHERE book_id = ANY(ids)
+    ORDER BY book_id
+    FOR NO KEY UPDATE;
+
+    UPDATE books AS b
+    SET author_ids = fresh.author_ids
+    FROM (
+        SELECT
+            x.book_id,
+            coalesce(
+                array_agg(a.author_id ORDER BY a.name)
+                    FILTER (WHERE a.author_id IS NOT NULL),
+                '{}'
+            ) AS author_ids
+        FROM (SELECT DISTINCT unnest(ids) AS book_id) AS x
+        LEFT JOIN books_authors AS m ON m.book_id = x.book_id
+        LEFT JOIN authors AS a ON a.author_id = m.author_id
+        GROUP BY x.book_id
+    ) AS fresh
+    WHERE b.book_id = fresh.book_id
+        AND b.author_ids IS DISTINCT FROM fresh.author_ids;
+$$;
+"""
+
+SQL_REVERSE = """
+CREATE OR REPLACE FUNCTION refresh_authors_book_ids(ids uuid[])
+RETURNS void LANGUAGE sql AS $$
+    UPDATE authors AS a
+    SET book_ids = fresh.book_ids
+    FROM (
+        SELECT
+            x.author_id,
+            coalesce(
+                array_agg(b.book_id ORDER BY b.title)
+                    FILTER (WHERE b.book_id IS NOT NULL),
+                '{}'
+            ) AS book_ids
+        FROM (SELECT DISTINCT unnest(ids) AS author_id) AS x
+        LEFT JOIN books_authors AS m ON m.author_id = x.author_id
+        LEFT JOIN books AS b ON b.book_id = m.book_id
+        GROUP BY x.author_id
+    ) AS fresh
+    WHERE a.author_id = fresh.author_id
+        AND a.book_ids IS DISTINCT FROM fresh.book_ids;
+$$;
+
+CREATE OR REPLACE FUNCTION refresh_books_author_ids(ids uuid[])
+RETURNS void LANGUAGE sql AS $$
+    UPDATE books AS b
+    SET author_ids = fresh.author_ids
+    FROM (
+        SELECT
+            x.book_id,
+            coalesce(
+                array_agg(a.author_id ORDER BY a.name)
+                    FILTER (WHERE a.author_id IS NOT NULL),
+                '{}'
+            ) AS author_ids
+        FROM (SELECT DISTINCT unnest(ids) AS book_id) AS x
+        LEFT JOIN books_authors AS m ON m.book_id = x.book_id
+        LEFT JOIN authors AS a ON a.author_id = m.author_id
+        GROUP BY x.book_id
+    ) AS fresh
+    WHERE b.book_id = fresh.book_id
+        AND b.author_ids IS DISTINCT FROM fresh.author_ids;
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("app_api_v3", "0006_change_notifications"),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=SQL_FORWARD, reverse_sql=SQL_REVERSE),
+    ]
@@ -30,6 +30,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "app.repos.django.routing.replica_routing_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -60,10 +61,25 @@ TEMPLATES = [
 WSGI_APPLICATION = "project.wsgi.application"
 
 
-_db_conf = dj_database_url.parse(config.PRIMARY_DATABASE_URL)
+_db_conf = dj_database_url.parse(
+    config.PRIMARY_DATABASE_URL,
+    conn_health_checks=config.DATABASE_CONN_HEALTH_CHECKS,
+    conn_max_age=config.DATABASE_CONN_MAX_AGE,
+)
 DATABASES = {
     "default": _db_conf,
 }
+for _i, _url in enumerate(config.REPLICA_DATABASE_URLS):
+    DATABASES[f"replica_{_i}"] = dj_database_url.parse(
+        _url,
+        conn_health_checks=config.DATABASE_CONN_HEALTH_CHECKS,
+        conn_max_age=config.DATABASE_CONN_MAX_AGE,
+        test_options={"MIRROR": "default"},
+    )
+
+DATABASE_ROUTERS = ["app.repos.django.routing.ReplicaRouter"]
+
+REPLICA_MAX_STALENESS = config.REPLICA_MAX_STALENESS
 
 _pvpkg = "django.contrib.auth.password_validation"
 AUTH_PASSWORD_VALIDATORS = [
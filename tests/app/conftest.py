@@ -1,44 +1,179 @@
+from pathlib import Path
+from typing import Iterator
 from typing import NamedTuple
+from uuid import uuid4
 
 import pytest
 
+from app.entities.interfaces import AuthorRepo
+from app.entities.interfaces import BookRepo
 from app.entities.models import ID
 from app.entities.models import Author
 from app.entities.models import Book
-from app.repos.local.author import AuthorRepo
-from app.repos.local.book import BookRepo
+from app.repos.cached.author import AuthorRepo as CachedAuthorRepo
+from app.repos.cached.book import BookRepo as CachedBookRepo
+from app.repos.cached.cache import CatalogCache
+from app.repos.changes import ChangeFeed
+from app.repos.columnar.author import AuthorRepo as ColumnarAuthorRepo
+from app.repos.columnar.book import BookRepo as ColumnarBookRepo
+from app.repos.columnar.storage import Storage
+from app.repos.durable.author import AuthorRepo as DurableAuthorRepo
+from app.repos.durable.book import BookRepo as DurableBookRepo
+from app.repos.durable.journal import Journal
+from app.repos.local.author import AuthorRepo as LocalAuthorRepo
+from app.repos.local.book import BookRepo as LocalBookRepo
+from app.repos.shared.author import AuthorRepo as SharedAuthorRepo
+from app.repos.shared.book import BookRepo as SharedBookRepo
+from app.repos.shared.store import SharedStore
+from app.repos.snapshot.author import AuthorRepo as SnapshotAuthorRepo
+from app.repos.snapshot.book import BookRepo as SnapshotBookRepo
+from app.repos.snapshot.store import SnapshotStore
 
 
 class Indices(NamedTuple):
     authors: dict[ID, Author]
+    authors_books: dict[ID, set[ID]]
     books_authors: dict[ID, set[ID]]
     books: dict[ID, Book]
+    names: dict[str, ID]
+    sorted_names: list[str]
+    sorted_titles: list[str]
+    titles: dict[str, ID]
+
+
+@pytest.fixture(
+    scope="function",
+    params=["cached", "columnar", "durable", "local", "shared", "snapshot"],
+)
+def backend(request: pytest.FixtureRequest) -> str:
+    return str(request.param)
+
+
+@pytest.fixture(scope="function")
+def catalog_cache() -> CatalogCache:
+    return CatalogCache.watch(ChangeFeed())
+
+
+@pytest.fixture(scope="function")
+def columnar_storage() -> Storage:
+    return Storage()
 
 
 @pytest.fixture(scope="function")
 def indices() -> Indices:
-    return Indices(authors={}, books_authors={}, books={})
+    return Indices(
+        authors={},
+        authors_books={},
+        books_authors={},
+        books={},
+        names={},
+        sorted_names=[],
+        sorted_titles=[],
+        titles={},
+    )
+
+
+@pytest.fixture(scope="function")
+def journal(tmp_path: Path) -> Iterator[Journal]:
+    journal = Journal.open(tmp_path / "journal", fsync=False)
+    yield journal
+    journal.close()
+
+
+@pytest.fixture(scope="function")
+def shared_store() -> Iterator[SharedStore]:
+    store = SharedStore.open(f"eca-test-{uuid4().hex[:12]}")
+    yield store
+    store.destroy()
 
 
 @pytest.fixture(scope="function")
-def author_repo(indices: Indices) -> AuthorRepo:
-    return AuthorRepo(
+def snapshot_store() -> SnapshotStore:
+    return SnapshotStore()
+
+
+@pytest.fixture(scope="function")
+def author_repo(
+    backend: str,
+    catalog_cache: CatalogCache,
+    columnar_storage: Storage,
+    indices: Indices,
+    journal: Journal,
+    shared_store: SharedStore,
+    snapshot_store: SnapshotStore,
+) -> AuthorRepo:
+    if backend == "columnar":
+        return ColumnarAuthorRepo(storage=columnar_storage)
+
+    if backend == "durable":
+        return DurableAuthorRepo(journal=journal)
+
+    if backend == "shared":
+        return SharedAuthorRepo(store=shared_store)
+
+    if backend == "snapshot":
+        return SnapshotAuthorRepo(store=snapshot_store)
+
+    repo = LocalAuthorRepo(
         index_authors=indices.authors,
+        index_authors_books=indices.authors_books,
         index_books_authors=indices.books_authors,
         index_books=indices.books,
+        index_names=indices.names,
+        index_sorted_names=indices.sorted_names,
     )
 
+    if backend == "cached":
+        return CachedAuthorRepo(cache=catalog_cache, repo=repo)
+
+    return repo
+
 
 @pytest.fixture(scope="function")
-def book_repo(indices: Indices) -> BookRepo:
-    return BookRepo(
+def book_repo(
+    backend: str,
+    catalog_cache: CatalogCache,
+    columnar_storage: Storage,
+    indices: Indices,
+    journal: Journal,
+    shared_store: SharedStore,
+    snapshot_store: SnapshotStore,
+) -> BookRepo:
+    if backend == "columnar":
+        return ColumnarBookRepo(storage=columnar_storage)
+
+    if backend == "durable":
+        return DurableBookRepo(journal=journal)
+
+    if backend == "shared":
+        return SharedBookRepo(store=shared_store)
+
+    if backend == "snapshot":
+        return SnapshotBookRepo(store=snapshot_store)
+
+    repo = LocalBookRepo(
         index_authors=indices.authors,
+        index_authors_books=indices.authors_books,
         index_books_authors=indices.books_authors,
         index_books=indices.books,
+        index_sorted_titles=indices.sorted_titles,
+        index_titles=indices.titles,
     )
 
+    if backend == "cached":
+        return CachedBookRepo(cache=catalog_cache, repo=repo)
+
+    return repo
+
 
 __all__ = (
     "author_repo",
+    "backend",
     "book_repo",
+    "catalog_cache",
+    "columnar_storage",
+    "indices",
+    "journal",
+    "shared_store",
+    "snapshot_store",
 )
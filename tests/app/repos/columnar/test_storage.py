@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+import pytest
+
+from app.repos.columnar.storage import Links
+from app.repos.columnar.storage import Storage
+
+
+@pytest.mark.unit
+def test_links_survive_compaction() -> None:
+    links = Links(compact_every=3)
+    links.set(0, [1, 2])
+    links.set(2, [0])
+    assert links.overlay
+
+    links.set(1, [])
+    assert not links.overlay
+    assert [links.get(row).tolist() for row in range(4)] == [
+        [1, 2],
+        [],
+        [0],
+        [],
+    ]
+
+    links.set(1, [3])
+    assert links.get(1).tolist() == [3]
+    assert links.get(0).tolist() == [1, 2]
+
+
+@pytest.mark.unit
+def test_rows_are_linked_both_ways_and_reused() -> None:
+    storage = Storage()
+    laws = storage.books.add(uuid4(), "Laws")
+    republic = storage.books.add(uuid4(), "Republic")
+    plato = storage.authors.add(uuid4(), "Plato")
+
+    storage.link_author(plato, [republic, laws])
+    assert storage.author(plato).book_ids == [
+        storage.books.uuid(laws),
+        storage.books.uuid(republic),
+    ]
+    assert storage.books.links.get(laws).tolist() == [plato]
+
+    storage.link_book(laws, [])
+    storage.books.remove(laws)
+    assert storage.authors.links.get(plato).tolist() == [republic]
+    assert storage.books.find_text("Laws") is None
+
+    timaeus_id = uuid4()
+    timaeus = storage.books.add(timaeus_id, "Timaeus")
+    assert timaeus == laws
+    assert storage.books.uuid(timaeus) == timaeus_id
+    assert storage.books.links.get(timaeus).tolist() == []
+    assert storage.books.ordered() == [republic, timaeus]
+
+
+__all__ = (
+    "test_links_survive_compaction",
+    "test_rows_are_linked_both_ways_and_reused",
+)
@@ -0,0 +1,256 @@
+import time
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO
+
+import pytest
+
+from app.entities.models import AuthorPatch
+from app.entities.models import NewAuthor
+from app.entities.models import NewBook
+from app.repos.durable.author import AuthorRepo
+from app.repos.durable.book import BookRepo
+from app.repos.durable.journal import NAME_LOG
+from app.repos.durable.journal import NAME_SNAPSHOT
+from app.repos.durable.journal import Journal
+from app.repos.local.catalog import Catalog
+
+
+def fill(journal: Journal, /) -> None:
+    author_repo = AuthorRepo(journal=journal)
+    book_repo = BookRepo(journal=journal)
+
+    laws = book_repo.create(title="Laws")
+    republic = book_repo.create(title="Republic")
+    categoriae = book_repo.create(title="Categoriae")
+    timaeus = book_repo.create(title="Timaeus")
+    plato = author_repo.create(book_ids=[laws.book_id], name="Plato")
+    aristotle = author_repo.create(
+        book_ids=[categoriae.book_id],
+        name="Aristotle",
+    )
+    author_repo.update(
+        plato.author_id,
+        book_ids=[laws.book_id, republic.book_id],
+        name="Aristocles",
+    )
+    book_repo.update(republic.book_id, title="Politeia")
+    book_repo.update(
+        categoriae.book_id,
+        author_ids=[aristotle.author_id, plato.author_id],
+    )
+    author_repo.delete(aristotle.author_id)
+    book_repo.update(laws.book_id, author_ids=[])
+    book_repo.delete(timaeus.book_id)
+
+
+@pytest.mark.unit
+def test_restore_from_log(tmp_path: Path) -> None:
+    journal = Journal.open(tmp_path, fsync=False)
+    fill(journal)
+    journal.close()
+
+    restored = Journal.open(tmp_path, fsync=False)
+    restored.close()
+
+    assert not (tmp_path / NAME_SNAPSHOT).exists()
+    assert restored.catalog == journal.catalog
+
+
+@pytest.mark.unit
+def test_restore_from_snapshot(tmp_path: Path) -> None:
+    journal = Journal.open(tmp_path, fsync=False, snapshot_every=4)
+    fill(journal)
+    journal.close()
+
+    restored = Journal.open(tmp_path, fsync=False)
+    restored.close()
+
+    assert (tmp_path / NAME_SNAPSHOT).is_file()
+    assert restored.nr_records < 4
+    assert restored.catalog == journal.catalog
+
+
+@pytest.mark.unit
+def test_restore_ignores_torn_tail(tmp_path: Path) -> None:
+    journal = Journal.open(tmp_path, fsync=False)
+    fill(journal)
+    journal.close()
+
+    with (tmp_path / NAME_LOG).open("ab") as log:
+        log.write(b'{"op": "save_bo')
+
+    restored = Journal.open(tmp_path, fsync=False)
+    restored.close()
+
+    assert restored.catalog == journal.catalog
+
+
+@pytest.mark.unit
+def test_writes_after_torn_tail_survive(tmp_path: Path) -> None:
+    journal = Journal.open(tmp_path, fsync=False)
+    BookRepo(journal=journal).create(title="A")
+    journal.close()
+
+    with (tmp_path / NAME_LOG).open("ab") as log:
+        log.write(b'{"op": "save_bo')
+
+    journal = Journal.open(tmp_path, fsync=False)
+    book_repo = BookRepo(journal=journal)
+    book_repo.create(title="B")
+    book_repo.create(title="C")
+    journal.close()
+
+    restored = Journal.open(tmp_path, fsync=False)
+    titles = [i.title for i in BookRepo(journal=restored).get_all()]
+    restored.close()
+
+    assert titles == ["A", "B", "C"]
+
+
+@pytest.mark.unit
+def test_batch_is_one_record(tmp_path: Path) -> None:
+    journal = Journal.open(tmp_path, fsync=False)
+    author_repo = AuthorRepo(journal=journal)
+    book_repo = BookRepo(journal=journal)
+    laws, republic = book_repo.create_many(
+        [NewBook(title="Laws"), NewBook(title="Republic")]
+    )
+    plato, socrates = author_repo.create_many(
+        [
+            NewAuthor(book_ids=[laws.book_id], name="Plato"),
+            NewAuthor(book_ids=[republic.book_id], name="Socrates"),
+        ]
+    )
+    author_repo.update_many(
+        [
+            AuthorPatch(author_id=plato.author_id, name="Socrates"),
+            AuthorPatch(author_id=socrates.author_id, name="Plato"),
+        ]
+    )
+    journal.close()
+
+    lines = (tmp_path / NAME_LOG).read_bytes().splitlines(keepends=True)
+    assert len(lines) == 3
+
+    restored = Journal.open(tmp_path, fsync=False)
+    restored.close()
+    assert restored.catalog == journal.catalog
+    assert restored.nr_records == journal.nr_records == 6
+
+    # a torn batch is dropped as a whole
+    (tmp_path / NAME_LOG).write_bytes(b"".join(lines[:-1]) + lines[-1][:-9])
+    restored = Journal.open(tmp_path, fsync=False)
+    restored.close()
+    names = {
+        i.name: i.author_id for i in restored.catalog.index_authors.values()
+    }
+    assert names == {"Plato": plato.author_id, "Socrates": socrates.author_id}
+
+
+@pytest.mark.unit
+def test_failed_append_changes_nothing(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    journal = Journal.open(tmp_path, fsync=False)
+    author_repo = AuthorRepo(journal=journal)
+    book_repo = BookRepo(journal=journal)
+    fill(journal)
+    catalog = journal.catalog.copy()
+    size = (tmp_path / NAME_LOG).stat().st_size
+
+    def broken_sync(self: Journal, file: BinaryIO, /) -> None:
+        # the log is written before the catalog is changed
+        assert journal.catalog == catalog
+        raise OSError("no space left on device")
+
+    laws = book_repo.get_by_title("Laws")
+    assert laws is not None
+    with monkeypatch.context() as patched:
+        patched.setattr(Journal, "_sync", broken_sync)
+        for write in (
+            partial(book_repo.create, title="Timaeus"),
+            partial(book_repo.update, laws.book_id, title="Nomoi"),
+            partial(book_repo.delete, laws.book_id),
+            partial(
+                author_repo.create_many,
+                [
+                    NewAuthor(book_ids=[laws.book_id], name="Plato"),
+                    NewAuthor(book_ids=[laws.book_id], name="Socrates"),
+                ],
+            ),
+        ):
+            with pytest.raises(OSError):
+                write()
+
+            assert journal.catalog == catalog
+            assert (tmp_path / NAME_LOG).stat().st_size == size
+
+    book_repo.create(title="Timaeus")
+    book_repo.update(laws.book_id, title="Nomoi")
+    journal.close()
+
+    restored = Journal.open(tmp_path, fsync=False)
+    restored.close()
+    assert restored.catalog == journal.catalog
+    assert restored.catalog.index_sorted_titles == sorted(
+        restored.catalog.index_titles
+    )
+
+
+@pytest.mark.benchmark
+def test_large_catalog_opens_fast(tmp_path: Path) -> None:
+    """
+    The snapshot is built into indices in one pass,
+    which beats replaying the same catalog through the repos.
+    """
+
+    size = 100_000
+    journal = Journal.open(tmp_path, fsync=False, snapshot_every=size * 10)
+    book_repo = BookRepo(journal=journal)
+    books = book_repo.create_many(
+        [NewBook(title=f"Book {i}") for i in range(size)]
+    )
+    AuthorRepo(journal=journal).create_many(
+        [
+            NewAuthor(book_ids=[i.book_id], name=f"Author {n}")
+            for n, i in enumerate(books)
+        ]
+    )
+    journal.compact()
+    for book in books[:1000]:
+        book_repo.update(book.book_id, title=f"{book.title} renamed")
+    journal.close()
+
+    started = time.perf_counter()
+    restored = Journal.open(tmp_path, fsync=False)
+    opened = time.perf_counter() - started
+    restored.close()
+
+    started = time.perf_counter()
+    catalog = Catalog()
+    replayed_books = catalog.book_repo().create_many(
+        [NewBook(title=i.title) for i in journal.catalog.index_books.values()]
+    )
+    catalog.author_repo().create_many(
+        [
+            NewAuthor(book_ids=[i.book_id], name=f"Author {n}")
+            for n, i in enumerate(replayed_books)
+        ]
+    )
+    replayed = time.perf_counter() - started
+
+    assert restored.catalog == journal.catalog
+    assert opened < replayed, f"opened in {opened}s, replayed {replayed}s"
+
+
+__all__ = (
+    "test_batch_is_one_record",
+    "test_failed_append_changes_nothing",
+    "test_large_catalog_opens_fast",
+    "test_restore_from_log",
+    "test_restore_from_snapshot",
+    "test_restore_ignores_torn_tail",
+    "test_writes_after_torn_tail_survive",
+)
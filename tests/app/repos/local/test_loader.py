@@ -0,0 +1,79 @@
+from pathlib import Path
+from uuid import uuid4
+
+import orjson
+import pytest
+
+from app.entities.errors import DegenerateAuthorsError
+from app.entities.errors import DuplicateBookTitleError
+from app.entities.errors import LostBooksError
+from app.repos.local.loader import load
+from app.repos.local.loader import load_files
+
+
+@pytest.mark.unit
+def test_load_files(tmp_path: Path) -> None:
+    plato, laws, republic = uuid4(), uuid4(), uuid4()
+
+    path_authors = tmp_path / "authors.csv"
+    path_authors.write_text(f"author_id,name\n{plato},Plato\n")
+
+    path_books = tmp_path / "books.jsonl"
+    path_books.write_bytes(
+        b"\n".join(
+            orjson.dumps({"book_id": book_id, "title": title})
+            for book_id, title in [(republic, "Republic"), (laws, "Laws")]
+        )
+    )
+
+    path_relations = tmp_path / "relations.csv"
+    path_relations.write_text(
+        f"author_id,book_id\n{plato},{republic}\n{plato},{laws}\n"
+    )
+
+    catalog = load_files(
+        authors=path_authors,
+        batch_size=1,
+        books=path_books,
+        relations=path_relations,
+    )
+
+    author = catalog.author_repo().get_by_name("Plato")
+    assert author is not None
+    assert author.author_id == plato
+    assert author.book_ids == [laws, republic]
+
+    books = catalog.book_repo().get_all()
+    assert [i.title for i in books] == ["Laws", "Republic"]
+    assert all(i.author_ids == [plato] for i in books)
+
+
+@pytest.mark.unit
+def test_load_checks_invariants() -> None:
+    plato, laws = str(uuid4()), str(uuid4())
+    authors = [{"author_id": plato, "name": "Plato"}]
+    books = [{"book_id": laws, "title": "Laws"}]
+    relations = [{"author_id": plato, "book_id": laws}]
+
+    with pytest.raises(DuplicateBookTitleError):
+        load(
+            authors=authors,
+            books=[*books, {"book_id": str(uuid4()), "title": "Laws"}],
+            relations=relations,
+        )
+
+    with pytest.raises(LostBooksError):
+        load(
+            authors=authors,
+            books=books,
+            relations=[*relations, {"author_id": plato, "book_id": plato}],
+        )
+
+    with pytest.raises(DegenerateAuthorsError):
+        load(authors=authors, books=books, relations=[])
+
+
+__all__ = (
+    "test_load_checks_invariants",
+    "test_load_files",
+)
@@ -0,0 +1,65 @@
+import multiprocessing
+
+import pytest
+
+from app.entities.errors import DegenerateAuthorsError
+from app.repos.shared.author import AuthorRepo
+from app.repos.shared.book import BookRepo
+from app.repos.shared.store import SharedStore
+
+
+@pytest.mark.unit
+def test_failed_write_is_not_published(shared_store: SharedStore) -> None:
+    author_repo = AuthorRepo(store=shared_store)
+    book_repo = BookRepo(store=shared_store)
+
+    laws = book_repo.create(title="Laws")
+    plato = author_repo.create(book_ids=[laws.book_id], name="Plato")
+    generation = shared_store.generation
+
+    with pytest.raises(DegenerateAuthorsError):
+        book_repo.update(laws.book_id, author_ids=[])
+
+    assert shared_store.generation == generation
+    book = book_repo.get_by_id(laws.book_id)
+    assert book is not None
+    assert book.author_ids == [plato.author_id]
+
+
+@pytest.mark.unit
+def test_previous_image_stays_readable(shared_store: SharedStore) -> None:
+    book_repo = BookRepo(store=shared_store)
+    laws = book_repo.create(title="Laws")
+
+    segment = shared_store.attach()
+    book_repo.update(laws.book_id, title="Republic")
+
+    row = segment.image.books.find_uuid(laws.book_id)
+    assert row is not None
+    assert segment.image.book(row) == laws
+    assert shared_store.attach().generation == segment.generation + 1
+
+
+@pytest.mark.unit
+def test_processes_share_one_catalog(shared_store: SharedStore) -> None:
+    context = multiprocessing.get_context("spawn")
+    worker = context.Process(target=_create_book, args=(shared_store.name,))
+    worker.start()
+    worker.join(timeout=30)
+
+    assert worker.exitcode == 0
+    book = BookRepo(store=shared_store).get_by_title("Laws")
+    assert book is not None
+
+
+def _create_book(name: str, /) -> None:
+    store = SharedStore.open(name)
+    BookRepo(store=store).create(title="Laws")
+    store.close()
+
+
+__all__ = (
+    "test_failed_write_is_not_published",
+    "test_previous_image_stays_readable",
+    "test_processes_share_one_catalog",
+)
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.entities.errors import DegenerateAuthorsError
+from app.repos.snapshot.author import AuthorRepo
+from app.repos.snapshot.book import BookRepo
+from app.repos.snapshot.store import SnapshotStore
+
+
+@pytest.mark.unit
+def test_failed_write_is_not_published() -> None:
+    store = SnapshotStore()
+    author_repo = AuthorRepo(store=store)
+    book_repo = BookRepo(store=store)
+
+    laws = book_repo.create(title="Laws")
+    author_repo.create(book_ids=[laws.book_id], name="Plato")
+    snapshot = store.snapshot
+
+    with pytest.raises(DegenerateAuthorsError):
+        book_repo.update(laws.book_id, author_ids=[])
+
+    assert store.snapshot is snapshot
+    assert (
+        book_repo.get_by_id(laws.book_id) == snapshot.index_books[laws.book_id]
+    )
+
+
+@pytest.mark.unit
+def test_readers_see_consistent_snapshots() -> None:
+    store = SnapshotStore()
+    book_repo = BookRepo(store=store)
+    titles = [f"Book {i:03}" for i in range(200)]
+
+    def write() -> None:
+        for title in reversed(titles):
+            book_repo.create(title=title)
+
+    def read() -> int:
+        nr_books = 0
+        while nr_books < len(titles):
+            books = book_repo.get_all()
+            assert len(books) >= nr_books
+            assert [i.title for i in books] == sorted(i.title for i in books)
+            nr_books = len(books)
+        return nr_books
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        readers = [pool.submit(read) for _ in range(3)]
+        pool.submit(write).result()
+        results = [reader.result(timeout=10) for reader in readers]
+
+    assert results == [len(titles)] * len(readers)
+
+
+__all__ = (
+    "test_failed_write_is_not_published",
+    "test_readers_see_consistent_snapshots",
+)
@@ -0,0 +1,117 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+
+from app.entities.config import Config
+from app.repos.sqlalchemy.engine import build_engine
+from app.repos.sqlalchemy.pool import MeteredQueuePool
+from app.repos.sqlalchemy.pool import pool_stats
+
+
+@pytest.mark.unit
+def test_pool_stats(config: Config, tmp_path: Path) -> None:
+    config = config.model_copy(
+        update={"DATABASE_POOL_MAX_OVERFLOW": 1, "DATABASE_POOL_SIZE": 1},
+    )
+    engine = build_engine(f"sqlite:///{tmp_path / 'db.sqlite'}", config=config)
+
+    with engine.connect() as conn1, engine.connect() as conn2:
+        for conn in (conn1, conn2):
+            assert conn.execute(sa.text("select 1")).scalar() == 1
+
+        stats = pool_stats(engine)
+        assert stats.checked_out == 2
+        assert stats.overflow == 1
+        assert stats.size == 1
+
+    stats = pool_stats(engine)
+    assert stats.checked_out == 0
+    assert stats.connects == 2
+    assert stats.connect_total >= stats.connect_max > 0
+    assert stats.waits >= 2
+    assert stats.wait_total >= stats.wait_max >= 0
+
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_pool_stats_tell_waits_from_connects(
+    caplog: pytest.LogCaptureFixture,
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "db.sqlite"
+
+    def slow_connect() -> sqlite3.Connection:
+        time.sleep(0.2)
+        return sqlite3.connect(path, check_same_thread=False)
+
+    engine = sa.create_engine(
+        "sqlite://",
+        creator=slow_connect,
+        max_overflow=0,
+        pool_size=1,
+        poolclass=MeteredQueuePool,
+    )
+
+    with engine.connect():
+        stats = pool_stats(engine)
+        assert stats.connect_max >= 0.2
+        assert stats.wait_max < 0.2
+        assert not caplog.records
+
+        waiter = threading.Thread(target=lambda: engine.connect().close())
+        waiter.start()
+        time.sleep(0.3)
+
+    waiter.join()
+
+    stats = pool_stats(engine)
+    assert stats.connects == 1
+    assert stats.waits == 2
+    assert stats.wait_max >= 0.2
+
+    (record,) = caplog.records
+    assert record.levelno == logging.WARNING
+    assert record.getMessage().startswith("slow checkout: waited 0.")
+    assert "checked_out=1" in record.getMessage()
+
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_pool_stats_after_dispose(tmp_path: Path) -> None:
+    engine = sa.create_engine(
+        f"sqlite:///{tmp_path / 'db.sqlite'}",
+        poolclass=MeteredQueuePool,
+    )
+    engine.connect().close()
+    engine.dispose()
+
+    for _ in range(2):
+        engine.connect().close()
+
+    stats = pool_stats(engine)
+    assert stats.connects == 1
+    assert stats.waits == 2
+
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_pool_stats_need_metered_pool() -> None:
+    engine = sa.create_engine("sqlite://")
+    with pytest.raises(TypeError):
+        pool_stats(engine)
+
+
+__all__ = (
+    "test_pool_stats",
+    "test_pool_stats_after_dispose",
+    "test_pool_stats_tell_waits_from_connects",
+    "test_pool_stats_need_metered_pool",
+)
@@ -0,0 +1,67 @@
+from typing import Iterator
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.repos.sqlalchemy.statements import author_reads_denormalized
+from app.repos.sqlalchemy.statements import book_reads
+from app.repos.sqlalchemy.statements import sql_author_create
+from app.repos.sqlalchemy.statements import sql_author_rename
+from app.repos.sqlalchemy.statements import sql_author_update
+from app.repos.sqlalchemy.stats import StatementCacheStats
+
+
+@pytest.fixture
+def engine() -> Iterator[sa.Engine]:
+    engine = sa.create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_statements_take_values_as_bind_parameters() -> None:
+    dialect = postgresql.dialect()  # type: ignore[no-untyped-call]
+
+    compiled = book_reads.page_after.compile(dialect=dialect)
+    assert {"after_book_id", "after_title", "limit"} <= set(compiled.params)
+
+    compiled = author_reads_denormalized.by_ids.compile(dialect=dialect)
+    assert "author_ids" in compiled.params
+
+    compiled = sql_author_create.compile(dialect=dialect)
+    assert set(compiled.params) == {"author_id", "book_ids", "name"}
+
+    compiled = sql_author_rename.compile(dialect=dialect)
+    assert set(compiled.params) == {"author_id", "book_ids", "name"}
+
+    compiled = sql_author_update.compile(dialect=dialect)
+    assert set(compiled.params) == {"author_id", "book_ids"}
+
+
+@pytest.mark.unit
+def test_stats_count_cache_hits_and_misses(engine: sa.Engine) -> None:
+    stats = StatementCacheStats.watch(engine)
+    sql = sa.select(sa.bindparam("value", type_=sa.Integer()))
+
+    with engine.connect() as conn:
+        for value in range(3):
+            assert conn.execute(sql, {"value": value}).scalar() == value
+        conn.exec_driver_sql("select 1")
+
+    assert (stats.hits, stats.misses, stats.uncached) == (2, 1, 1)
+    assert stats.hit_ratio == pytest.approx(2 / 3)
+
+    stats.reset()
+    stats.unwatch()
+    with engine.connect() as conn:
+        conn.execute(sql, {"value": 0})
+
+    assert (stats.hits, stats.misses, stats.uncached) == (0, 0, 0)
+
+
+__all__ = (
+    "engine",
+    "test_statements_take_values_as_bind_parameters",
+    "test_stats_count_cache_hits_and_misses",
+)
@@ -0,0 +1,173 @@
+from uuid import uuid4
+
+import pytest
+
+from app.entities.errors import DegenerateAuthorsError
+from app.entities.errors import DuplicateAuthorNameError
+from app.entities.errors import DuplicateBookTitleError
+from app.entities.errors import LostAuthorsError
+from app.entities.errors import LostBooksError
+from app.entities.interfaces import AuthorRepo
+from app.entities.interfaces import BookRepo
+from app.entities.models import AuthorPatch
+from app.entities.models import BookPatch
+from app.entities.models import NewAuthor
+from app.entities.models import NewBook
+
+
+@pytest.mark.unit
+def test_create_many(author_repo: AuthorRepo, book_repo: BookRepo) -> None:
+    republic, laws = book_repo.create_many(
+        [NewBook(title="Republic"), NewBook(title="Laws")]
+    )
+    assert book_repo.get_all() == [laws, republic]
+
+    plato, socrates = author_repo.create_many(
+        [
+            NewAuthor(book_ids=[republic.book_id, laws.book_id], name="Plato"),
+            NewAuthor(book_ids=[republic.book_id], name="Socrates"),
+        ]
+    )
+    assert plato.book_ids == [laws.book_id, republic.book_id]
+    assert socrates.book_ids == [republic.book_id]
+
+    book = book_repo.get_by_id(republic.book_id)
+    assert book is not None
+    assert book.author_ids == [plato.author_id, socrates.author_id]
+
+    with pytest.raises(DuplicateBookTitleError):
+        book_repo.create_many([NewBook(title="Laws")])
+
+
+@pytest.mark.unit
+def test_update_many(author_repo: AuthorRepo, book_repo: BookRepo) -> None:
+    republic, laws = book_repo.create_many(
+        [NewBook(title="Republic"), NewBook(title="Laws")]
+    )
+    plato, socrates = author_repo.create_many(
+        [
+            NewAuthor(book_ids=[laws.book_id], name="Plato"),
+            NewAuthor(book_ids=[republic.book_id], name="Socrates"),
+        ]
+    )
+
+    republic, laws = book_repo.update_many(
+        [
+            BookPatch(
+                author_ids=[plato.author_id, socrates.author_id],
+                book_id=republic.book_id,
+            ),
+            BookPatch(book_id=laws.book_id, title="Nomoi"),
+        ]
+    )
+    assert republic.author_ids == [plato.author_id, socrates.author_id]
+    assert laws.title == "Nomoi"
+
+    (plato,) = author_repo.update_many(
+        [AuthorPatch(author_id=plato.author_id, book_ids=[republic.book_id])]
+    )
+    assert plato.book_ids == [republic.book_id]
+
+    with pytest.raises(DegenerateAuthorsError):
+        book_repo.update_many(
+            [BookPatch(author_ids=[], book_id=republic.book_id)]
+        )
+
+
+@pytest.mark.unit
+def test_failed_batches_change_nothing(
+    author_repo: AuthorRepo,
+    book_repo: BookRepo,
+) -> None:
+    republic, laws = book_repo.create_many(
+        [NewBook(title="Republic"), NewBook(title="Laws")]
+    )
+    plato, socrates = author_repo.create_many(
+        [
+            NewAuthor(book_ids=[laws.book_id], name="Plato"),
+            NewAuthor(book_ids=[republic.book_id], name="Socrates"),
+        ]
+    )
+    authors = author_repo.get_all()
+    books = book_repo.get_all()
+
+    with pytest.raises(DuplicateBookTitleError):
+        book_repo.create_many(
+            [NewBook(title="Timaeus"), NewBook(title="Laws")]
+        )
+
+    with pytest.raises(LostBooksError):
+        author_repo.create_many(
+            [
+                NewAuthor(book_ids=[laws.book_id], name="Aristotle"),
+                NewAuthor(book_ids=[uuid4()], name="Xenophon"),
+            ]
+        )
+
+    with pytest.raises(LostAuthorsError):
+        book_repo.update_many(
+            [
+                BookPatch(book_id=laws.book_id, title="Nomoi"),
+                BookPatch(author_ids=[uuid4()], book_id=republic.book_id),
+            ]
+        )
+
+    with pytest.raises(DuplicateAuthorNameError):
+        author_repo.update_many(
+            [
+                AuthorPatch(
+                    author_id=plato.author_id,
+                    book_ids=[laws.book_id, republic.book_id],
+                    name="Aristocles",
+                ),
+                AuthorPatch(author_id=socrates.author_id, name="Aristocles"),
+            ]
+        )
+
+    assert author_repo.get_all() == authors
+    assert book_repo.get_all() == books
+
+
+@pytest.mark.unit
+def test_update_many_swaps_unique_texts(
+    author_repo: AuthorRepo,
+    book_repo: BookRepo,
+) -> None:
+    republic, laws = book_repo.create_many(
+        [NewBook(title="Republic"), NewBook(title="Laws")]
+    )
+    plato, socrates = author_repo.create_many(
+        [
+            NewAuthor(book_ids=[laws.book_id], name="Plato"),
+            NewAuthor(book_ids=[republic.book_id], name="Socrates"),
+        ]
+    )
+
+    republic, laws = book_repo.update_many(
+        [
+            BookPatch(book_id=republic.book_id, title="Laws"),
+            BookPatch(book_id=laws.book_id, title="Republic"),
+        ]
+    )
+    assert (republic.title, laws.title) == ("Laws", "Republic")
+    assert book_repo.get_by_title("Laws") == republic
+    assert book_repo.get_all() == [republic, laws]
+
+    plato, socrates = author_repo.update_many(
+        [
+            AuthorPatch(author_id=plato.author_id, name="Socrates"),
+            AuthorPatch(author_id=socrates.author_id, name="Xenophon"),
+        ]
+    )
+    assert (plato.name, socrates.name) == ("Socrates", "Xenophon")
+    assert author_repo.get_by_name("Socrates") == plato
+    assert author_repo.get_by_name("Plato") is None
+    assert author_repo.get_all() == [plato, socrates]
+
+
+__all__ = (
+    "test_create_many",
+    "test_failed_batches_change_nothing",
+    "test_update_many",
+    "test_update_many_swaps_unique_texts",
+)
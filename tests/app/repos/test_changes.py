@@ -0,0 +1,196 @@
+import time
+from typing import Callable
+from typing import NamedTuple
+from uuid import uuid4
+
+import pytest
+
+from app.entities.models import Book
+from app.repos.cached.author import AuthorRepo as CachedAuthorRepo
+from app.repos.cached.book import BookRepo as CachedBookRepo
+from app.repos.cached.cache import CatalogCache
+from app.repos.changes import Change
+from app.repos.changes import ChangeFeed
+from app.repos.changes import ChangeListener
+from app.repos.changes import LocalChannel
+from app.repos.snapshot.author import AuthorRepo as SnapshotAuthorRepo
+from app.repos.snapshot.book import BookRepo as SnapshotBookRepo
+from app.repos.snapshot.store import SnapshotStore
+
+
+class Worker(NamedTuple):
+    author_repo: CachedAuthorRepo
+    book_repo: CachedBookRepo
+    cache: CatalogCache
+
+
+class FlakyChannel:
+    """
+    Breaks on the first receive, then acts as the local channel.
+    """
+
+    def __init__(self, channel: LocalChannel, /) -> None:
+        self.broken = False
+        self.channel = channel
+        self.listens = 0
+
+    def close(self, /) -> None:
+        self.channel.close()
+
+    def listen(self, /) -> None:
+        self.listens += 1
+        self.channel.listen()
+
+    def receive(self, /, *, timeout: float) -> list[str]:
+        if not self.broken:
+            self.broken = True
+            raise ConnectionError("the connection is lost")
+
+        return self.channel.receive(timeout=timeout)
+
+
+def build_worker(store: SnapshotStore, feed: ChangeFeed, /) -> Worker:
+    cache = CatalogCache.watch(feed)
+    author_repo = CachedAuthorRepo(
+        cache=cache,
+        repo=SnapshotAuthorRepo(store=store),
+    )
+    book_repo = CachedBookRepo(
+        cache=cache,
+        repo=SnapshotBookRepo(store=store),
+    )
+
+    return Worker(author_repo=author_repo, book_repo=book_repo, cache=cache)
+
+
+def wait_until(condition: Callable[[], bool], /) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.mark.unit
+def test_payload_round_trip() -> None:
+    change = Change(author_ids=[uuid4()], book_ids=[uuid4(), uuid4()])
+    assert Change.from_payload(change.to_payload()) == change
+
+    book_id = uuid4()
+    payload = f'{{"author_ids" : [], "book_ids" : ["{book_id}"]}}'
+    assert Change.from_payload(payload) == Change(book_ids=[book_id])
+
+
+@pytest.mark.unit
+def test_cache_drops_changed_and_linked_only(
+    snapshot_store: SnapshotStore,
+) -> None:
+    worker = build_worker(snapshot_store, ChangeFeed())
+    tales = worker.book_repo.create(title="Tales")
+    songs = worker.book_repo.create(title="Songs")
+    grimm = worker.author_repo.create(book_ids=[tales.book_id], name="Grimm")
+
+    for book in (tales, songs):
+        worker.book_repo.get_by_id(book.book_id)
+    worker.author_repo.get_by_id(grimm.author_id)
+    assert set(worker.cache.books.by_id) == {tales.book_id, songs.book_id}
+
+    worker.cache.apply(Change(author_ids=[grimm.author_id]))
+
+    assert set(worker.cache.authors.by_id) == set()
+    assert set(worker.cache.books.by_id) == {songs.book_id}
+
+
+@pytest.mark.unit
+def test_referrers_follow_the_cached_models() -> None:
+    books = CatalogCache(feed=ChangeFeed()).books
+    a1, a2, a3 = (uuid4() for _ in range(3))
+    tales = Book(author_ids=[a1, a2], book_id=uuid4(), title="Tales")
+    songs = Book(author_ids=[a2], book_id=uuid4(), title="Songs")
+
+    books.add([tales, songs])
+    assert books.referring({a2}) == {tales.book_id, songs.book_id}
+    assert books.referring({a1, a3}) == {tales.book_id}
+
+    books.add([tales.model_copy(update={"author_ids": [a3]})])
+    assert books.referring({a1}) == set()
+    assert books.referring({a2, a3}) == {tales.book_id, songs.book_id}
+
+    books.drop({songs.book_id})
+    assert books.referring({a2}) == set()
+    assert books.referrers == {a3: {tales.book_id}}
+
+    books.clear()
+    assert books.referrers == {}
+
+
+@pytest.mark.unit
+def test_listener_invalidates_other_workers(
+    snapshot_store: SnapshotStore,
+) -> None:
+    channel = LocalChannel()
+    feed = ChangeFeed()
+    listener = ChangeListener(channel=channel, feed=feed, receive_timeout=0.01)
+    reader = build_worker(snapshot_store, feed)
+    writer = build_worker(snapshot_store, ChangeFeed())
+
+    listener.start()
+    try:
+        wait_until(lambda: reader.cache.version > 0)
+        tales = writer.book_repo.create(title="Tales")
+        grimm = writer.author_repo.create(
+            book_ids=[tales.book_id],
+            name="Grimm",
+        )
+        books = reader.book_repo.get_all()
+        assert [i.author_ids for i in books] == [[grimm.author_id]]
+
+        assert reader.author_repo.get_by_name("Grimm") == grimm
+        renamed = writer.author_repo.update(grimm.author_id, name="Jacob")
+        assert reader.author_repo.get_by_name("Grimm") == grimm
+
+        # the trigger of the database
+        channel.notify(Change(author_ids=[grimm.author_id]))
+        wait_until(lambda: reader.author_repo.get_by_name("Grimm") is None)
+        assert reader.author_repo.get_by_id(grimm.author_id) == renamed
+    finally:
+        listener.stop()
+
+
+@pytest.mark.unit
+def test_listener_invalidates_everything_on_relisten(
+    snapshot_store: SnapshotStore,
+) -> None:
+    channel = FlakyChannel(LocalChannel())
+    feed = ChangeFeed()
+    listener = ChangeListener(
+        channel=channel,
+        feed=feed,
+        receive_timeout=0.01,
+        retry_after=0.01,
+    )
+    worker = build_worker(snapshot_store, feed)
+    tales = worker.book_repo.create(title="Tales")
+    version = worker.cache.version
+
+    listener.start()
+    try:
+        wait_until(lambda: channel.listens == 2)
+        wait_until(lambda: worker.cache.version >= version + 2)
+
+        assert worker.book_repo.get_all() == [tales]
+        assert worker.cache.books.listing == [tales]
+    finally:
+        listener.stop()
+
+
+__all__ = (
+    "FlakyChannel",
+    "Worker",
+    "build_worker",
+    "test_cache_drops_changed_and_linked_only",
+    "test_listener_invalidates_everything_on_relisten",
+    "test_listener_invalidates_other_workers",
+    "test_payload_round_trip",
+    "test_referrers_follow_the_cached_models",
+    "wait_until",
+)
@@ -0,0 +1,231 @@
+import asyncio
+import math
+import threading
+import time
+from functools import partial
+from typing import Callable
+
+import pytest
+
+from app.repos.replicas import Replica
+from app.repos.replicas import ReplicaSet
+from app.repos.replicas import pin_primary
+from app.repos.replicas import primary_pinned
+from app.repos.replicas import request_scope
+
+
+def broken_probe() -> float:
+    raise ConnectionError("replica is down")
+
+
+def probed(replicas: ReplicaSet[str], /) -> ReplicaSet[str]:
+    """
+    Starts probing and waits until every replica is probed.
+    """
+
+    replicas.pick()
+    wait_until(
+        lambda: all(i.checked_at > -math.inf for i in replicas.replicas)
+    )
+    return replicas
+
+
+def wait_until(condition: Callable[[], bool], /) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.mark.unit
+def test_pick_fresh_replicas_in_turn() -> None:
+    lags = {"r1": 0.0, "r2": 10.0, "r3": 1.0}
+    replicas = ReplicaSet(
+        max_staleness=5,
+        replicas=[
+            Replica(probe=partial(lags.__getitem__, alias), target=alias)
+            for alias in lags
+        ],
+    )
+
+    try:
+        probed(replicas)
+        picked = {replicas.pick() for _ in range(6)}
+        assert picked == {"r1", "r3"}
+    finally:
+        replicas.stop()
+
+
+@pytest.mark.unit
+def test_pick_primary_if_no_replica_is_fresh() -> None:
+    replicas = ReplicaSet(
+        max_staleness=5,
+        replicas=[
+            Replica(probe=lambda: 6.0, target="stale"),
+            Replica(probe=broken_probe, target="down"),
+        ],
+    )
+
+    try:
+        assert probed(replicas).pick() is None
+    finally:
+        replicas.stop()
+
+    assert ReplicaSet(max_staleness=5, replicas=[]).pick() is None
+
+
+@pytest.mark.unit
+def test_lag_is_checked_once_per_period() -> None:
+    calls: list[None] = []
+
+    def probe() -> float:
+        calls.append(None)
+        return 0.0
+
+    replicas = ReplicaSet(
+        check_every=60,
+        max_staleness=5,
+        replicas=[Replica(probe=probe, target="r1")],
+    )
+
+    try:
+        probed(replicas)
+        for _ in range(3):
+            assert replicas.pick() == "r1"
+    finally:
+        replicas.stop()
+
+    assert len(calls) == 1
+
+
+@pytest.mark.unit
+def test_reads_do_not_wait_for_probes() -> None:
+    probing = threading.Event()
+
+    def slow_probe() -> float:
+        probing.wait(5)
+        return 0.0
+
+    now = time.monotonic()
+    replicas = ReplicaSet(
+        max_staleness=5,
+        replicas=[
+            Replica(
+                checked_at=now - 1, lag=0.0, probe=slow_probe, target="r1"
+            ),
+            Replica(
+                checked_at=now - 9, lag=0.0, probe=slow_probe, target="r2"
+            ),
+            Replica(probe=slow_probe, target="r3"),
+        ],
+    )
+
+    try:
+        started = time.monotonic()
+        # the last probe of r1 is fresh, the one of r2 aged, r3 is unknown
+        assert {replicas.pick() for _ in range(6)} == {"r1"}
+        assert time.monotonic() - started < 1
+
+        probing.set()
+        wait_until(
+            lambda: {replicas.pick() for _ in range(6)} == {"r1", "r2", "r3"}
+        )
+    finally:
+        probing.set()
+        replicas.stop()
+
+
+@pytest.mark.unit
+def test_writes_pin_reads_to_primary_within_scope() -> None:
+    replicas = ReplicaSet(
+        max_staleness=5,
+        replicas=[Replica(probe=lambda: 0.0, target="r1")],
+    )
+
+    try:
+        probed(replicas)
+        with request_scope():
+            assert replicas.pick() == "r1"
+            pin_primary()
+            assert primary_pinned()
+            assert replicas.pick() is None
+
+        assert not primary_pinned()
+        with request_scope():
+            assert replicas.pick() == "r1"
+    finally:
+        replicas.stop()
+
+
+@pytest.mark.unit
+def test_reads_go_to_replicas_after_write_scope_ends() -> None:
+    replicas = ReplicaSet(
+        max_staleness=5,
+        replicas=[Replica(probe=lambda: 0.0, target="r1")],
+    )
+
+    try:
+        probed(replicas)
+
+        # no scope: a write pins nothing
+        pin_primary()
+        assert not primary_pinned()
+        assert replicas.pick() == "r1"
+
+        with request_scope():
+            pin_primary()
+            with request_scope():
+                # the inner scope is the outer one
+                assert replicas.pick() is None
+            assert replicas.pick() is None
+
+        assert replicas.pick() == "r1"
+    finally:
+        replicas.stop()
+
+
+@pytest.mark.unit
+def test_write_scopes_of_tasks_are_apart() -> None:
+    replicas = ReplicaSet(
+        max_staleness=5,
+        replicas=[Replica(probe=lambda: 0.0, target="r1")],
+    )
+
+    async def write_then_read(written: asyncio.Event) -> str | None:
+        with request_scope():
+            pin_primary()
+            written.set()
+            return replicas.pick()
+
+    async def read(written: asyncio.Event) -> str | None:
+        with request_scope():
+            await written.wait()
+            return replicas.pick()
+
+    async def scenario() -> list[str | None]:
+        written = asyncio.Event()
+        picked = await asyncio.gather(
+            write_then_read(written),
+            read(written),
+        )
+        return [*picked, replicas.pick()]
+
+    try:
+        probed(replicas)
+        assert asyncio.run(scenario()) == [None, "r1", "r1"]
+    finally:
+        replicas.stop()
+
+
+__all__ = (
+    "broken_probe",
+    "probed",
+    "test_lag_is_checked_once_per_period",
+    "test_pick_fresh_replicas_in_turn",
+    "test_pick_primary_if_no_replica_is_fresh",
+    "test_reads_do_not_wait_for_probes",
+    "test_reads_go_to_replicas_after_write_scope_ends",
+    "test_write_scopes_of_tasks_are_apart",
+    "test_writes_pin_reads_to_primary_within_scope",
+    "wait_until",
+)
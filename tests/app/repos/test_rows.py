@@ -0,0 +1,80 @@
+import timeit
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from app.repos.rows import author_from_row
+from app.repos.rows import book_from_row
+
+
+def build_rows(size: int, /) -> list[SimpleNamespace]:
+    rows = [
+        SimpleNamespace(
+            author_id=uuid4(),
+            book_ids=[uuid4() for _ in range(5)],
+            name=f"Author {i}",
+        )
+        for i in range(size)
+    ]
+
+    return rows
+
+
+@pytest.mark.unit
+def test_trusted_models_equal_validated() -> None:
+    author_row = build_rows(1)[0]
+    book_row = SimpleNamespace(
+        author_ids=[author_row.author_id],
+        book_id=author_row.book_ids[0],
+        title="Tales",
+    )
+
+    for from_row, row, field in (
+        (author_from_row, author_row, "name"),
+        (book_from_row, book_row, "title"),
+    ):
+        trusted = from_row(row)
+        validated = from_row(row, validate=True)
+
+        assert trusted == validated
+        assert trusted.model_dump() == validated.model_dump()
+        assert trusted.model_fields_set == validated.model_fields_set
+
+        with pytest.raises(ValidationError):
+            setattr(trusted, field, "Renamed")
+
+
+@pytest.mark.unit
+def test_validating_mode_rejects_foreign_rows() -> None:
+    row = SimpleNamespace(author_id="nope", book_ids=[], name="Author")
+
+    with pytest.raises(ValidationError):
+        author_from_row(row, validate=True)
+
+
+@pytest.mark.benchmark
+def test_trusted_rows_are_faster() -> None:
+    rows = build_rows(1000)
+
+    def bench(validate: bool) -> float:
+        timings = timeit.repeat(
+            lambda: [author_from_row(i, validate=validate) for i in rows],
+            number=3,
+            repeat=5,
+        )
+        return min(timings)
+
+    validated = bench(True)
+    trusted = bench(False)
+
+    assert trusted < validated, f"validated {validated}s, trusted {trusted}s"
+
+
+__all__ = (
+    "build_rows",
+    "test_trusted_models_equal_validated",
+    "test_trusted_rows_are_faster",
+    "test_validating_mode_rejects_foreign_rows",
+)
@@ -3,7 +3,9 @@ from uuid import uuid4
 import pytest
 
 from app.entities.models import Author
+from app.entities.models import Book
 from app.usecases.author import DeleteAuthorUseCase
+from app.usecases.book import FindBooksUseCase
 
 
 @pytest.mark.unit
@@ -14,6 +16,20 @@ def test_correct_delete(
     delete_author(plato.author_id)
 
 
+@pytest.mark.unit
+def test_correct_delete_references(
+    delete_author: DeleteAuthorUseCase,
+    find_books: FindBooksUseCase,
+    laws: Book,
+    plato: Author,
+) -> None:
+    assert find_books(book_id=laws.book_id)[0].author_ids == [plato.author_id]
+
+    delete_author(plato.author_id)
+
+    assert find_books(book_id=laws.book_id)[0].author_ids == []
+
+
 @pytest.mark.unit
 def test_lost_delete(
     delete_author: DeleteAuthorUseCase,
@@ -33,6 +49,7 @@ def test_noop_delete(
 
 __all__ = (
     "test_correct_delete",
+    "test_correct_delete_references",
     "test_lost_delete",
     "test_noop_delete",
 )
@@ -5,6 +5,8 @@ import pytest
 from app.entities.errors import DegenerateAuthorsError
 from app.entities.models import Author
 from app.entities.models import Book
+from app.usecases.author import FindAuthorsUseCase
+from app.usecases.author import UpdateAuthorUseCase
 from app.usecases.book import DeleteBookUseCase
 
 
@@ -16,6 +18,23 @@ def test_correct_delete(
     delete_book(bible.book_id)
 
 
+@pytest.mark.unit
+def test_correct_delete_shared(
+    bible: Book,
+    delete_book: DeleteBookUseCase,
+    find_authors: FindAuthorsUseCase,
+    laws: Book,
+    plato: Author,
+    update_author: UpdateAuthorUseCase,
+) -> None:
+    update_author(plato.author_id, book_ids=[bible.book_id, laws.book_id])
+
+    delete_book(laws.book_id)
+
+    author = find_authors(author_id=plato.author_id)[0]
+    assert author.book_ids == [bible.book_id]
+
+
 @pytest.mark.unit
 def test_deny_degenerate_authors(
     delete_book: DeleteBookUseCase,
@@ -50,6 +69,7 @@ def test_noop_delete(
 
 __all__ = (
     "test_correct_delete",
+    "test_correct_delete_shared",
     "test_deny_degenerate_authors",
     "test_lost_delete",
     "test_noop_delete",
@@ -1,7 +1,12 @@
+from uuid import uuid4
+
 import pytest
 
+from app.entities.errors import LostAuthorsError
+from app.entities.interfaces import AuthorRepo
 from app.entities.models import Author
 from app.usecases.author import FindAuthorsUseCase
+from app.usecases.author import UpdateAuthorUseCase
 
 
 @pytest.mark.unit
@@ -14,6 +19,19 @@ def test_find_all(
     assert authors == [grimm_jacob, grimm_wilhelm]
 
 
+@pytest.mark.unit
+def test_find_all_after_rename(
+    find_authors: FindAuthorsUseCase,
+    grimm_jacob: Author,
+    grimm_wilhelm: Author,
+    update_author: UpdateAuthorUseCase,
+) -> None:
+    jacob = update_author(grimm_jacob.author_id, name="Zacharias Grimm")
+
+    authors = find_authors()
+    assert authors == [grimm_wilhelm, jacob]
+
+
 @pytest.mark.unit
 def test_find_by_name(
     find_authors: FindAuthorsUseCase,
@@ -36,8 +54,44 @@ def test_find_by_pk(
         assert found == [author]
 
 
+@pytest.mark.unit
+def test_find_by_pks(
+    find_authors: FindAuthorsUseCase,
+    grimm_jacob: Author,
+    grimm_wilhelm: Author,
+) -> None:
+    ids = [
+        grimm_wilhelm.author_id,
+        grimm_jacob.author_id,
+        grimm_wilhelm.author_id,
+    ]
+    found = find_authors(author_ids=ids)
+    assert found == [grimm_wilhelm, grimm_jacob, grimm_wilhelm]
+
+    assert find_authors(author_ids=[]) == []
+
+
+@pytest.mark.unit
+def test_find_by_pks_reports_missing(
+    author_repo: AuthorRepo,
+    find_authors: FindAuthorsUseCase,
+    grimm_jacob: Author,
+) -> None:
+    missing = uuid4()
+    ids = [missing, grimm_jacob.author_id]
+
+    with pytest.raises(LostAuthorsError) as exc_info:
+        find_authors(author_ids=ids)
+    assert list(exc_info.value.author_ids) == [missing]
+
+    assert author_repo.get_many_by_ids(ids) == [None, grimm_jacob]
+
+
 __all__ = (
     "test_find_all",
+    "test_find_all_after_rename",
     "test_find_by_name",
     "test_find_by_pk",
+    "test_find_by_pks",
+    "test_find_by_pks_reports_missing",
 )
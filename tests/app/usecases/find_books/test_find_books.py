@@ -1,5 +1,9 @@
+from uuid import uuid4
+
 import pytest
 
+from app.entities.errors import LostBooksError
+from app.entities.interfaces import BookRepo
 from app.entities.models import Book
 from app.usecases.book import FindBooksUseCase
 
@@ -36,8 +40,39 @@ def test_find_by_title(
         assert found == [book]
 
 
+@pytest.mark.unit
+def test_find_by_pks(
+    find_books: FindBooksUseCase,
+    finnegans_wake: Book,
+    ulysses: Book,
+) -> None:
+    ids = [ulysses.book_id, finnegans_wake.book_id, ulysses.book_id]
+    found = find_books(book_ids=ids)
+    assert found == [ulysses, finnegans_wake, ulysses]
+
+    assert find_books(book_ids=[]) == []
+
+
+@pytest.mark.unit
+def test_find_by_pks_reports_missing(
+    book_repo: BookRepo,
+    find_books: FindBooksUseCase,
+    finnegans_wake: Book,
+) -> None:
+    missing = uuid4()
+    ids = [missing, finnegans_wake.book_id]
+
+    with pytest.raises(LostBooksError) as exc_info:
+        find_books(book_ids=ids)
+    assert list(exc_info.value.book_ids) == [missing]
+
+    assert book_repo.get_many_by_ids(ids) == [None, finnegans_wake]
+
+
 __all__ = (
     "test_find_all",
     "test_find_by_pk",
+    "test_find_by_pks",
+    "test_find_by_pks_reports_missing",
     "test_find_by_title",
 )
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import cast
+
+import pytest
+
+from app.entities.interfaces import AsyncAuthorRepo
+from app.entities.interfaces import AsyncBookRepo
+from app.entities.interfaces import AuthorRepo
+from app.entities.interfaces import BookRepo
+from app.usecases.async_author import AsyncCreateAuthorUseCase
+from app.usecases.async_author import AsyncDeleteAuthorUseCase
+from app.usecases.async_author import AsyncFindAuthorsUseCase
+from app.usecases.async_author import AsyncUpdateAuthorUseCase
+from app.usecases.async_book import AsyncCreateBookUseCase
+from app.usecases.async_book import AsyncFindBooksUseCase
+
+
+class Awaiting:
+    """
+    Turns a sync repo into an async one which waits before every call,
+    as a repo waits for its database.
+    """
+
+    def __init__(self, repo: Any, /, *, delay: float = 0) -> None:
+        self.delay = delay
+        self.repo = repo
+
+    def __getattr__(self, name: str) -> Callable[..., Awaitable[Any]]:
+        method = getattr(self.repo, name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            await asyncio.sleep(self.delay)
+            return method(*args, **kwargs)
+
+        return call
+
+
+@pytest.mark.unit
+def test_async_use_cases(author_repo: AuthorRepo, book_repo: BookRepo) -> None:
+    authors = cast(AsyncAuthorRepo, Awaiting(author_repo))
+    books = cast(AsyncBookRepo, Awaiting(book_repo))
+
+    async def scenario() -> None:
+        book = await AsyncCreateBookUseCase(repo=books)(title="Tales")
+        assert await AsyncFindBooksUseCase(repo=books)() == [book]
+
+        author = await AsyncCreateAuthorUseCase(repo=authors)(
+            book_ids=[book.book_id],
+            name="Grimm",
+        )
+        find_authors = AsyncFindAuthorsUseCase(repo=authors)
+        assert await find_authors(name="Grimm") == [author]
+
+        renamed = await AsyncUpdateAuthorUseCase(repo=authors)(
+            author.author_id,
+            name="Jacob Grimm",
+        )
+        assert renamed.name == "Jacob Grimm"
+        assert await find_authors(author_id=author.author_id) == [renamed]
+
+        await AsyncDeleteAuthorUseCase(repo=authors)(author.author_id)
+        assert await find_authors() == []
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.unit
+def test_async_use_cases_overlap_waits(book_repo: BookRepo) -> None:
+    delay = 0.05
+    nr_calls = 20
+    books = cast(AsyncBookRepo, Awaiting(book_repo, delay=delay))
+    find_books = AsyncFindBooksUseCase(repo=books)
+
+    async def scenario() -> float:
+        started = time.monotonic()
+        await asyncio.gather(*(find_books() for _ in range(nr_calls)))
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(scenario())
+    assert elapsed < delay * nr_calls / 4
+
+
+__all__ = (
+    "Awaiting",
+    "test_async_use_cases",
+    "test_async_use_cases_overlap_waits",
+)
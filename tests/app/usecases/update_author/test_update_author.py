@@ -8,7 +8,9 @@ from app.entities.errors import DuplicateAuthorNameError
 from app.entities.errors import LostAuthorsError
 from app.entities.models import Author
 from app.entities.models import Book
+from app.usecases.author import FindAuthorsUseCase
 from app.usecases.author import UpdateAuthorUseCase
+from app.usecases.book import FindBooksUseCase
 
 
 @pytest.mark.unit
@@ -29,6 +31,22 @@ def test_correct_update_books(
     assert author.name == plato.name
 
 
+@pytest.mark.unit
+def test_correct_update_books_references(
+    find_books: FindBooksUseCase,
+    laws: Book,
+    plato: Author,
+    republic: Book,
+    update_author: UpdateAuthorUseCase,
+) -> None:
+    update_author(plato.author_id, book_ids=[republic.book_id])
+
+    assert find_books(book_id=laws.book_id)[0].author_ids == []
+    assert find_books(book_id=republic.book_id)[0].author_ids == [
+        plato.author_id
+    ]
+
+
 @pytest.mark.unit
 def test_correct_update_name(
     plato: Author,
@@ -43,6 +61,19 @@ def test_correct_update_name(
     assert author.name == name
 
 
+@pytest.mark.unit
+def test_correct_update_name_lookup(
+    find_authors: FindAuthorsUseCase,
+    plato: Author,
+    update_author: UpdateAuthorUseCase,
+) -> None:
+    name = "Aristocles"
+    author = update_author(plato.author_id, name=name)
+
+    assert find_authors(name=name) == [author]
+    assert find_authors(name=plato.name) == []
+
+
 @pytest.mark.unit
 def test_deny_degenerate_author(
     plato: Author,
@@ -103,7 +134,9 @@ def test_require_unique_name(
 
 __all__ = (
     "test_correct_update_books",
+    "test_correct_update_books_references",
     "test_correct_update_name",
+    "test_correct_update_name_lookup",
     "test_deny_degenerate_author",
     "test_deny_lost",
     "test_noop_update",
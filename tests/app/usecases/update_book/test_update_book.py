@@ -8,6 +8,9 @@ from app.entities.errors import DuplicateBookTitleError
 from app.entities.errors import LostBooksError
 from app.entities.models import Author
 from app.entities.models import Book
+from app.usecases.author import FindAuthorsUseCase
+from app.usecases.author import UpdateAuthorUseCase
+from app.usecases.book import FindBooksUseCase
 from app.usecases.book import UpdateBookUseCase
 
 
@@ -43,6 +46,37 @@ def test_correct_update_title(
     assert book.title == title
 
 
+@pytest.mark.unit
+def test_correct_update_title_lookup(
+    find_books: FindBooksUseCase,
+    laws: Book,
+    update_book: UpdateBookUseCase,
+) -> None:
+    title = "Νόμοι"
+    book = update_book(laws.book_id, title=title)
+
+    assert find_books(title=title) == [book]
+    assert find_books(title=laws.title) == []
+
+
+@pytest.mark.unit
+def test_correct_update_title_order(
+    find_authors: FindAuthorsUseCase,
+    laws: Book,
+    plato: Author,
+    republic: Book,
+    update_author: UpdateAuthorUseCase,
+    update_book: UpdateBookUseCase,
+) -> None:
+    book_ids = [laws.book_id, republic.book_id]
+    update_author(plato.author_id, book_ids=book_ids)
+
+    book = update_book(laws.book_id, title="Νόμοι")
+
+    author = find_authors(author_id=plato.author_id)[0]
+    assert author.book_ids == [republic.book_id, book.book_id]
+
+
 @pytest.mark.unit
 def test_deny_degenerate_author(
     laws: Book,
@@ -100,6 +134,8 @@ def test_require_unique_name(
 __all__ = (
     "test_correct_update_authors",
     "test_correct_update_title",
+    "test_correct_update_title_lookup",
+    "test_correct_update_title_order",
     "test_deny_lost",
     "test_noop_update",
     "test_require_unique_name",
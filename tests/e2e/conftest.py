@@ -6,10 +6,10 @@ import sqlalchemy as sa
 from sqlalchemy import Connection
 from sqlalchemy import Engine
 from sqlalchemy import Table
-from sqlalchemy import create_engine
 from sqlalchemy import inspect
 
 from app.entities.config import Config
+from app.repos.sqlalchemy.engine import build_engine
 from app.repos.sqlalchemy.tables import table_authors
 from app.repos.sqlalchemy.tables import table_books
 from app.repos.sqlalchemy.tables import table_books_authors
@@ -17,7 +17,7 @@ from app.repos.sqlalchemy.tables import table_books_authors
 
 @pytest.fixture(scope="session")
 def primary_database_engine(*, config: Config) -> Engine:
-    engine = create_engine(config.PRIMARY_DATABASE_URL, echo=config.MODE_DEBUG)
+    engine = build_engine(config.PRIMARY_DATABASE_URL, config=config)
 
     return engine
 
@@ -0,0 +1,65 @@
+from uuid import uuid4
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+
+from app.repos.sqlalchemy.statements import author_reads
+from app.repos.sqlalchemy.statements import book_reads
+from app.repos.sqlalchemy.tables import table_books_authors
+
+
+def explain(conn: Connection, sql: sa.Select, /, **params: object) -> str:
+    compiled = sql.compile(dialect=conn.dialect)
+    cursor = conn.exec_driver_sql(
+        f"EXPLAIN {compiled.string}",
+        compiled.construct_params(params),
+    )
+    plan = "\n".join(row[0] for row in cursor)
+    return plan
+
+
+@pytest.mark.e2e
+@pytest.mark.parametrize(
+    ("sql", "params"),
+    [
+        (author_reads.by_id, {"author_id": uuid4()}),
+        (author_reads.by_name, {"name": "Jacob Grimm"}),
+        (book_reads.by_id, {"book_id": uuid4()}),
+        (book_reads.by_title, {"title": "Tales"}),
+        (
+            sa.select(sa.func.count()).where(
+                table_books_authors.c.author_id == sa.bindparam("author_id"),
+            ),
+            {"author_id": uuid4()},
+        ),
+        (
+            sa.select(table_books_authors.c.author_id).where(
+                table_books_authors.c.book_id == sa.bindparam("book_id"),
+            ),
+            {"book_id": uuid4()},
+        ),
+    ],
+)
+def test_hot_queries_use_indexes(
+    *,
+    params: dict[str, object],
+    primary_database_engine: Engine,
+    sql: sa.Select,
+) -> None:
+    conn: Connection
+    with primary_database_engine.begin() as conn:
+        # tiny test tables make seq scans cheaper than any index:
+        # forbid them to see whether an index can serve the query at all
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = explain(conn, sql, **params)
+
+    assert "Seq Scan" not in plan, plan
+    assert "Index" in plan, plan
+
+
+__all__ = (
+    "explain",
+    "test_hot_queries_use_indexes",
+)
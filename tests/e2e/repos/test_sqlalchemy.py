@@ -0,0 +1,474 @@
+import threading
+import time
+from typing import Any
+from typing import Final
+from uuid import uuid4
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+from sqlalchemy import event
+
+from app.entities.errors import DegenerateAuthorsError
+from app.entities.errors import DuplicateAuthorNameError
+from app.entities.errors import DuplicateBookTitleError
+from app.entities.errors import LostAuthorsError
+from app.entities.errors import LostBooksError
+from app.entities.models import ID
+from app.entities.models import AuthorPatch
+from app.entities.models import BookPatch
+from app.entities.models import NewAuthor
+from app.entities.models import NewBook
+from app.repos.sqlalchemy.author import AuthorRepo
+from app.repos.sqlalchemy.book import BookRepo
+from app.repos.sqlalchemy.tables import table_books_authors
+
+SQL_WAITING_FOR_LOCKS: Final = """
+SELECT count(*)
+FROM pg_stat_activity
+WHERE datname = current_database() AND wait_event_type = 'Lock'
+"""
+
+
+@pytest.mark.e2e
+def test_bulk_create_and_update(*, primary_database_engine: Engine) -> None:
+    author_repo = AuthorRepo(engine=primary_database_engine)
+    book_repo = BookRepo(engine=primary_database_engine)
+
+    books = book_repo.create_many(
+        [NewBook(title=f"Bulk Book {i:03}") for i in range(100)]
+    )
+    authors = author_repo.create_many(
+        [
+            NewAuthor(book_ids=[book.book_id], name=f"Bulk Author {i:03}")
+            for i, book in enumerate(books)
+        ]
+    )
+
+    try:
+        assert [i.title for i in books] == [
+            f"Bulk Book {i:03}" for i in range(100)
+        ]
+        assert [i.book_ids for i in authors] == [[i.book_id] for i in books]
+
+        with pytest.raises(DuplicateAuthorNameError):
+            author_repo.create_many(
+                [
+                    NewAuthor(
+                        book_ids=[books[0].book_id], name="Bulk Author 000"
+                    )
+                ]
+            )
+
+        updated = author_repo.update_many(
+            [
+                AuthorPatch(
+                    author_id=author.author_id,
+                    book_ids=[books[0].book_id, books[-1].book_id],
+                    name=f"Bulk Writer {i:03}",
+                )
+                for i, author in enumerate(authors[:10])
+            ]
+        )
+        assert [i.name for i in updated] == [
+            f"Bulk Writer {i:03}" for i in range(10)
+        ]
+        book_ids = [books[0].book_id, books[-1].book_id]
+        assert [i.book_ids for i in updated] == [book_ids] * len(updated)
+    finally:
+        for author in authors:
+            author_repo.delete(author.author_id)
+        for book in books:
+            book_repo.delete(book.book_id)
+
+
+@pytest.mark.e2e
+def test_concurrent_relinks_keep_denormalized_ids(
+    *,
+    primary_database_engine: Engine,
+) -> None:
+    """
+    The second relink waits for the first one to commit
+    and then refreshes the ids with the links of both.
+    """
+
+    author_repo = AuthorRepo(engine=primary_database_engine)
+    book_repo = BookRepo(engine=primary_database_engine)
+    denormalized_author_repo = AuthorRepo(
+        denormalized=True,
+        engine=primary_database_engine,
+    )
+
+    b1, b2, b3 = book_repo.create_many(
+        [NewBook(title=f"Racing Book {i}") for i in range(3)]
+    )
+    author = author_repo.create(book_ids=[b1.book_id], name="Racing Author")
+
+    def link(conn: Connection, book_id: ID) -> None:
+        conn.execute(
+            sa.insert(table_books_authors).values(
+                author_id=author.author_id,
+                book_id=book_id,
+            )
+        )
+
+    def count_waiting() -> int:
+        conn: Connection
+        with primary_database_engine.connect() as conn:
+            waiting = conn.scalar(sa.text(SQL_WAITING_FOR_LOCKS))
+
+        return int(waiting or 0)
+
+    def link_and_commit(conn: Connection) -> None:
+        link(conn, b3.book_id)
+        conn.commit()
+
+    try:
+        first: Connection
+        second: Connection
+        engine = primary_database_engine
+        with engine.connect() as first, engine.connect() as second:
+            link(first, b2.book_id)
+            racer = threading.Thread(target=link_and_commit, args=[second])
+            racer.start()
+
+            deadline = time.monotonic() + 5
+            while not count_waiting():
+                assert time.monotonic() < deadline, "no relink waits"
+                time.sleep(0.01)
+
+            first.commit()
+            racer.join()
+
+        expected = author_repo.get_by_id(author.author_id)
+        assert expected is not None
+        assert len(expected.book_ids) == 3
+        assert denormalized_author_repo.get_by_id(author.author_id) == expected
+    finally:
+        author_repo.delete(author.author_id)
+        for book in (b1, b2, b3):
+            book_repo.delete(book.book_id)
+
+
+@pytest.mark.e2e
+def test_denormalized_reads_match_aggregated(
+    *,
+    primary_database_engine: Engine,
+) -> None:
+    author_repo = AuthorRepo(engine=primary_database_engine)
+    book_repo = BookRepo(engine=primary_database_engine)
+    denormalized_author_repo = AuthorRepo(
+        denormalized=True,
+        engine=primary_database_engine,
+    )
+    denormalized_book_repo = BookRepo(
+        denormalized=True,
+        engine=primary_database_engine,
+    )
+
+    def assert_same() -> None:
+        assert denormalized_author_repo.get_all() == author_repo.get_all()
+        assert denormalized_book_repo.get_all() == book_repo.get_all()
+
+    b1, b2 = book_repo.create_many(
+        [NewBook(title=f"Denormalized Book {i}") for i in range(2)]
+    )
+    a1 = author_repo.create(
+        book_ids=[b1.book_id, b2.book_id],
+        name="Denormalized Author 1",
+    )
+    a2 = author_repo.create(book_ids=[b2.book_id], name="Denormalized 0")
+
+    try:
+        assert_same()
+
+        book_repo.update(b1.book_id, title="Denormalized Book 9")
+        author_repo.update(a2.author_id, name="Denormalized Author 9")
+        assert_same()
+
+        author_repo.update(a2.author_id, book_ids=[b1.book_id])
+        book_repo.update(b2.book_id, author_ids=[a1.author_id])
+        assert_same()
+
+        author = denormalized_author_repo.get_by_id(a1.author_id)
+        assert author is not None
+        assert author.book_ids == [b2.book_id, b1.book_id]
+    finally:
+        for author in (a1, a2):
+            author_repo.delete(author.author_id)
+        for book in (b1, b2):
+            book_repo.delete(book.book_id)
+
+
+@pytest.mark.e2e
+def test_get_many_by_ids_in_request_order(
+    *,
+    primary_database_engine: Engine,
+) -> None:
+    book_repo = BookRepo(engine=primary_database_engine)
+
+    b1, b2 = book_repo.create_many(
+        [NewBook(title=f"Many Book {i}") for i in range(2)]
+    )
+    missing = uuid4()
+
+    try:
+        ids = [b2.book_id, missing, b1.book_id, b2.book_id]
+        assert book_repo.get_many_by_ids(ids) == [b2, None, b1, b2]
+        assert book_repo.get_many_by_ids([]) == []
+    finally:
+        for book in (b1, b2):
+            book_repo.delete(book.book_id)
+
+
+@pytest.mark.e2e
+def test_iter_all_and_page(*, primary_database_engine: Engine) -> None:
+    book_repo = BookRepo(engine=primary_database_engine)
+
+    books = book_repo.create_many(
+        [NewBook(title=f"Paged Book {i:02}") for i in reversed(range(25))]
+    )
+
+    try:
+        expected = book_repo.get_all()
+        assert list(book_repo.iter_all(batch_size=7)) == expected
+
+        pages = [book_repo.page(limit=10)]
+        while pages[-1]:
+            pages.append(book_repo.page(after=pages[-1][-1], limit=10))
+
+        assert all(len(i) == 10 for i in pages[:-2])
+        assert [book for page in pages for book in page] == expected
+    finally:
+        for book in books:
+            book_repo.delete(book.book_id)
+
+
+@pytest.mark.e2e
+def test_relink_touches_only_changed_links(
+    *,
+    primary_database_engine: Engine,
+) -> None:
+    author_repo = AuthorRepo(engine=primary_database_engine)
+    book_repo = BookRepo(engine=primary_database_engine)
+
+    def get_links() -> dict[tuple[ID, ID], int]:
+        m2m = table_books_authors
+        sql = sa.select(m2m.c.author_id, m2m.c.book_id, m2m.c.id)
+        with primary_database_engine.begin() as conn:
+            rows = conn.execute(sql).all()
+
+        return {(row.author_id, row.book_id): row.id for row in rows}
+
+    b1, b2, b3 = book_repo.create_many(
+        [NewBook(title=f"Relinked Book {i}") for i in range(3)]
+    )
+    a1, a2 = author_repo.create_many(
+        [
+            NewAuthor(book_ids=[b1.book_id, b2.book_id], name=f"Relinker {i}")
+            for i in range(2)
+        ]
+    )
+
+    try:
+        before = get_links()
+        author_repo.update_many(
+            [
+                AuthorPatch(
+                    author_id=a1.author_id, book_ids=[b2.book_id, b3.book_id]
+                )
+            ]
+        )
+        book_repo.update_many(
+            [BookPatch(author_ids=[a1.author_id], book_id=b2.book_id)]
+        )
+        after = get_links()
+
+        assert (a1.author_id, b1.book_id) not in after
+        assert (a2.author_id, b2.book_id) not in after
+        assert (
+            after[(a1.author_id, b2.book_id)]
+            == before[(a1.author_id, b2.book_id)]
+        )
+        assert (
+            after[(a2.author_id, b1.book_id)]
+            == before[(a2.author_id, b1.book_id)]
+        )
+        assert (a1.author_id, b3.book_id) in after
+    finally:
+        for author in (a1, a2):
+            author_repo.delete(author.author_id)
+        for book in (b1, b2, b3):
+            book_repo.delete(book.book_id)
+
+
+@pytest.mark.e2e
+def test_book_delete_and_noop_update_in_one_statement(
+    *,
+    primary_database_engine: Engine,
+) -> None:
+    author_repo = AuthorRepo(engine=primary_database_engine)
+    book_repo = BookRepo(engine=primary_database_engine)
+
+    b1, b2 = book_repo.create_many(
+        [NewBook(title=f"Deleted Book {i}") for i in range(2)]
+    )
+    a1 = author_repo.create(book_ids=[b1.book_id], name="Deleted Author 1")
+    a2 = author_repo.create(
+        book_ids=[b1.book_id, b2.book_id],
+        name="Deleted Author 2",
+    )
+
+    statements: list[str] = []
+
+    def track(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(primary_database_engine, "before_cursor_execute", track)
+    try:
+        with pytest.raises(DegenerateAuthorsError) as exc_info:
+            book_repo.delete(b1.book_id)
+        assert exc_info.value.authors == {a1.name: a1.author_id}
+        assert len(statements) == 1
+        assert book_repo.get_by_id(b1.book_id) == b1
+
+        statements.clear()
+        author = author_repo.update(
+            a2.author_id,
+            book_ids=a2.book_ids,
+            name=a2.name,
+        )
+        assert author == a2
+        assert len(statements) == 1
+
+        statements.clear()
+        book_repo.delete(b2.book_id)
+        book_repo.delete(uuid4())
+        assert len(statements) == 2
+        assert book_repo.get_by_id(b2.book_id) is None
+        assert author_repo.get_many_by_ids([a2.author_id]) == [
+            a2.model_copy(update={"book_ids": [b1.book_id]})
+        ]
+    finally:
+        event.remove(primary_database_engine, "before_cursor_execute", track)
+        for author in (a1, a2):
+            author_repo.delete(author.author_id)
+        for book in (b1, b2):
+            book_repo.delete(book.book_id)
+
+
+@pytest.mark.e2e
+def test_book_update_checks_in_one_statement(
+    *,
+    primary_database_engine: Engine,
+) -> None:
+    author_repo = AuthorRepo(engine=primary_database_engine)
+    book_repo = BookRepo(engine=primary_database_engine)
+
+    b1, b2 = book_repo.create_many(
+        [NewBook(title=f"Checked Book {i}") for i in range(2)]
+    )
+    a1 = author_repo.create(book_ids=[b1.book_id], name="Checked Author 1")
+    a2 = author_repo.create(
+        book_ids=[b1.book_id, b2.book_id],
+        name="Checked Author 2",
+    )
+
+    try:
+        before = book_repo.get_by_id(b1.book_id)
+
+        with pytest.raises(LostBooksError):
+            book_repo.update(uuid4(), title="Checked Book X")
+
+        with pytest.raises(DuplicateBookTitleError):
+            book_repo.update(b1.book_id, title=b2.title)
+
+        with pytest.raises(LostAuthorsError):
+            book_repo.update(b1.book_id, author_ids=[a1.author_id, uuid4()])
+
+        with pytest.raises(DegenerateAuthorsError) as exc_info:
+            book_repo.update(b1.book_id, author_ids=[], title="Checked")
+        assert exc_info.value.authors == {a1.name: a1.author_id}
+
+        assert book_repo.get_by_id(b1.book_id) == before
+        assert book_repo.get_by_title("Checked") is None
+
+        book = book_repo.update(
+            b1.book_id,
+            author_ids=[a1.author_id],
+            title="Checked Book 0 renamed",
+        )
+        assert book.author_ids == [a1.author_id]
+        assert book.title == "Checked Book 0 renamed"
+        assert book_repo.get_by_id(b1.book_id) == book
+
+        assert book_repo.update(b2.book_id) == book_repo.get_by_id(b2.book_id)
+    finally:
+        for author in (a1, a2):
+            author_repo.delete(author.author_id)
+        for book in (b1, b2):
+            book_repo.delete(book.book_id)
+
+
+@pytest.mark.e2e
+def test_update_many_swaps_unique_texts(
+    *,
+    primary_database_engine: Engine,
+) -> None:
+    author_repo = AuthorRepo(engine=primary_database_engine)
+    book_repo = BookRepo(engine=primary_database_engine)
+
+    b1, b2 = book_repo.create_many(
+        [NewBook(title=f"Swapped Book {i}") for i in range(2)]
+    )
+    a1, a2 = author_repo.create_many(
+        [
+            NewAuthor(book_ids=[b1.book_id], name=f"Swapped Author {i}")
+            for i in range(2)
+        ]
+    )
+
+    try:
+        books = book_repo.update_many(
+            [
+                BookPatch(book_id=b1.book_id, title=b2.title),
+                BookPatch(book_id=b2.book_id, title=b1.title),
+            ]
+        )
+        assert [i.title for i in books] == [b2.title, b1.title]
+
+        authors = author_repo.update_many(
+            [
+                AuthorPatch(author_id=a1.author_id, name=a2.name),
+                AuthorPatch(author_id=a2.author_id, name="Swapped Author 9"),
+            ]
+        )
+        assert [i.name for i in authors] == [a2.name, "Swapped Author 9"]
+
+        with pytest.raises(DuplicateAuthorNameError):
+            author_repo.update_many(
+                [
+                    AuthorPatch(author_id=a1.author_id, name="Swapped 0"),
+                    AuthorPatch(author_id=a2.author_id, name="Swapped 0"),
+                ]
+            )
+        assert author_repo.get_many_by_ids([a1.author_id]) == [authors[0]]
+    finally:
+        for author in (a1, a2):
+            author_repo.delete(author.author_id)
+        for book in (b1, b2):
+            book_repo.delete(book.book_id)
+
+
+__all__ = (
+    "test_book_delete_and_noop_update_in_one_statement",
+    "test_book_update_checks_in_one_statement",
+    "test_concurrent_relinks_keep_denormalized_ids",
+    "test_denormalized_reads_match_aggregated",
+    "test_get_many_by_ids_in_request_order",
+    "test_bulk_create_and_update",
+    "test_iter_all_and_page",
+    "test_relink_touches_only_changed_links",
+    "test_update_many_swaps_unique_texts",
+)
@@ -0,0 +1,177 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any
+from typing import AsyncIterator
+from typing import Final
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.entities.config import Config
+from app.entities.errors import DuplicateAuthorNameError
+from app.entities.models import Author
+from app.entities.models import NewBook
+from app.repos.replicas import Replica
+from app.repos.replicas import ReplicaSet
+from app.repos.replicas import request_scope
+from app.repos.sqlalchemy_async.author import AuthorRepo
+from app.repos.sqlalchemy_async.book import BookRepo
+from app.repos.sqlalchemy_async.engine import build_async_engine
+
+SQL_WAITING_FOR_LOCKS: Final = """
+SELECT count(*)
+FROM pg_stat_activity
+WHERE datname = current_database() AND wait_event_type = 'Lock'
+"""
+
+
+@asynccontextmanager
+async def async_engine(config: Config, /) -> AsyncIterator[AsyncEngine]:
+    """
+    The engine lives in the event loop of a test and is disposed with it.
+    """
+
+    engine = build_async_engine(config.PRIMARY_DATABASE_URL, config=config)
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.e2e
+def test_async_repos(*, config: Config) -> None:
+    async def scenario() -> None:
+        async with async_engine(config) as engine:
+            author_repo = AuthorRepo(engine=engine)
+            book_repo = BookRepo(engine=engine)
+
+            b1, b2 = await book_repo.create_many(
+                [NewBook(title=f"Async Book {i}") for i in range(2)]
+            )
+            author = await author_repo.create(
+                book_ids=[b1.book_id],
+                name="Async Author",
+            )
+
+            try:
+                assert await author_repo.get_by_name(author.name) == author
+                assert await book_repo.get_many_by_ids([b2.book_id]) == [b2]
+
+                with pytest.raises(DuplicateAuthorNameError):
+                    await author_repo.create(
+                        book_ids=[b2.book_id],
+                        name=author.name,
+                    )
+
+                author = await author_repo.update(
+                    author.author_id,
+                    book_ids=[b1.book_id, b2.book_id],
+                )
+                assert author.book_ids == [b1.book_id, b2.book_id]
+
+                streamed = [i async for i in book_repo.iter_all(batch_size=1)]
+                assert streamed == await book_repo.get_all()
+            finally:
+                await author_repo.delete(author.author_id)
+                for book in (b1, b2):
+                    await book_repo.delete(book.book_id)
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.e2e
+def test_concurrent_reads_overlap_their_waits(*, config: Config) -> None:
+    """
+    The reads wait for the lock on the table together:
+    were they run one after another, only one of them would wait.
+    """
+
+    nr_reads = 4
+
+    async def count_waiting(engine: AsyncEngine) -> int:
+        conn: AsyncConnection
+        async with engine.connect() as conn:
+            waiting = await conn.scalar(sa.text(SQL_WAITING_FOR_LOCKS))
+
+        return int(waiting or 0)
+
+    async def scenario() -> None:
+        async with async_engine(config) as engine:
+            author_repo = AuthorRepo(engine=engine)
+            expected = await author_repo.get_all()
+
+            locker: AsyncConnection
+            async with engine.connect() as locker:
+                await locker.execute(
+                    sa.text("LOCK TABLE authors IN ACCESS EXCLUSIVE MODE")
+                )
+                reads = [
+                    asyncio.create_task(author_repo.get_all())
+                    for _ in range(nr_reads)
+                ]
+
+                deadline = time.monotonic() + 5
+                while await count_waiting(engine) < nr_reads:
+                    assert time.monotonic() < deadline, "reads do not overlap"
+                    await asyncio.sleep(0.01)
+
+                await locker.rollback()
+
+            results: list[list[Author]] = await asyncio.gather(*reads)
+            assert results == [expected] * nr_reads
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.e2e
+def test_reads_go_to_replicas_until_written(*, config: Config) -> None:
+    async def scenario() -> None:
+        async with async_engine(config) as primary, async_engine(
+            config
+        ) as replica:
+            statements: list[str] = []
+
+            def track(*args: Any) -> None:
+                statements.append(args[2])
+
+            event.listen(replica.sync_engine, "before_cursor_execute", track)
+
+            replicas = ReplicaSet(
+                max_staleness=5,
+                replicas=[
+                    Replica(probe=lambda: 0.0, target=replica.sync_engine)
+                ],
+            )
+            book_repo = BookRepo(engine=primary, replicas=replicas)
+
+            with request_scope():
+                books = await book_repo.get_all()
+                assert [i async for i in book_repo.iter_all()] == books
+                nr_replica_reads = len(statements)
+                assert nr_replica_reads >= 2
+
+                book = await book_repo.create(title="Async Replicated Book")
+                try:
+                    assert await book_repo.get_by_id(book.book_id) == book
+                    assert book in [i async for i in book_repo.iter_all()]
+                    assert len(statements) == nr_replica_reads
+                finally:
+                    await book_repo.delete(book.book_id)
+
+            # the write scope ended: reads go to the replica again
+            await book_repo.get_all()
+            assert len(statements) > nr_replica_reads
+
+    asyncio.run(scenario())
+
+
+__all__ = (
+    "async_engine",
+    "test_async_repos",
+    "test_concurrent_reads_overlap_their_waits",
+    "test_reads_go_to_replicas_until_written",
+)